@@ -15,7 +15,7 @@ import logging
 import os
 import sys
 from pathlib import Path
-from typing import Any, Callable, ChainMap, Dict, List, Optional, TextIO, Tuple
+from typing import Any, Callable, ChainMap, Dict, List, Optional, Set, TextIO, Tuple
 
 import click
 import pandas as pd
@@ -32,34 +32,36 @@ from sssom.constants import (
 from sssom.context import get_default_metadata
 
 from . import __version__
-from .cliques import split_into_cliques, summarize_cliques
+from .cliques import CliqueIndex, split_into_clique_dataframes, summarize_cliques
 from .io import (
     annotate_file,
     convert_file,
     filter_file,
+    invert_file,
+    merge_sorted_files,
     parse_file,
+    remove_file,
     run_sql_query,
     split_file,
     validate_file,
 )
-from .parsers import parse_sssom_table
-from .rdf_util import rewire_graph
+from .parsers import parse_sssom_table, parse_sssom_tables
+from .rdf_util import NTRIPLES_FORMATS, rewire_graph, rewire_ntriples
 from .sparql_util import EndpointConfig, query_mappings
 from .util import (
     SSSOM_EXPORT_FORMATS,
     SSSOM_READ_FORMATS,
     MappingSetDataFrame,
     compare_dataframes,
-    dataframe_to_ptable,
     filter_redundant_rows,
+    get_ptable_dataframe,
     invert_mappings,
     merge_msdf,
     reconcile_prefix_and_data,
     remove_unmatched,
     sort_df_rows_columns,
-    to_mapping_set_dataframe,
 )
-from .writers import write_table
+from .writers import write_table, write_table_archive, write_tables
 
 SSSOM_SV_OBJECT = (
     SSSOMSchemaView.instance if hasattr(SSSOMSchemaView, "instance") else SSSOMSchemaView()
@@ -110,6 +112,15 @@ fields_option = click.option(
     help="Fields.",
 )
 
+jobs_option = click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of parallel workers used to process the inputs and write the output files.",
+)
+
 predicate_filter_option = click.option(
     "-F",
     "--mapping-predicate-filter",
@@ -234,24 +245,26 @@ def parse(
     multiple=True,
     default=DEFAULT_VALIDATION_TYPES,
 )
-def validate(input: str, validation_types: tuple):
+@jobs_option
+def validate(input: str, validation_types: tuple, jobs: int):
     """Produce an error report for an SSSOM file."""
     validation_type_list = [t for t in validation_types]
-    validate_file(input_path=input, validation_types=validation_type_list)
+    validate_file(input_path=input, validation_types=validation_type_list, jobs=jobs)
 
 
 @main.command()
 @input_argument
 @output_directory_option
-def split(input: str, output_directory: str):
+@jobs_option
+def split(input: str, output_directory: str, jobs: int):
     """Split input file into multiple output broken down by prefixes."""
-    split_file(input_path=input, output_directory=output_directory)
+    split_file(input_path=input, output_directory=output_directory, jobs=jobs)
 
 
 @main.command()
 @input_argument
 @output_option
-@click.option("-W", "--inverse-factor", help="Inverse factor.")
+@click.option("-W", "--inverse-factor", type=float, help="Inverse factor.")
 @click.option(
     "--default-confidence",
     type=click.FloatRange(0, 1),
@@ -261,11 +274,10 @@ def ptable(input, output: TextIO, inverse_factor: float, default_confidence: flo
     """Convert an SSSOM file to a ptable for kboom/`boomer <https://github.com/INCATools/boomer>`_."""
     # TODO should maybe move to boomer (but for now it can live here, so cjm can tweak
     msdf = parse_sssom_table(input)
-    rows = dataframe_to_ptable(
+    ptable = get_ptable_dataframe(
         msdf.df, inverse_factor=inverse_factor, default_confidence=default_confidence
     )
-    for row in rows:
-        print(*row, sep="\t", file=output)
+    ptable.to_csv(output, sep="\t", header=False, index=False, na_rep="nan")
 
 
 @main.command()
@@ -284,8 +296,9 @@ def dedupe(input: str, output: TextIO):
 @main.command()
 @click.option("-Q", "--query", help='SQL query. Use "df" as table name.')
 @click.argument("inputs", nargs=-1)
+@jobs_option
 @output_option
-def dosql(query: str, inputs: List[str], output: TextIO):
+def dosql(query: str, inputs: List[str], output: TextIO, jobs: int):
     """Run a SQL query over one or more SSSOM files.
 
     Each of the N inputs is assigned a table name df1, df2, ..., dfN
@@ -301,7 +314,7 @@ def dosql(query: str, inputs: List[str], output: TextIO):
         FROM file1 INNER JOIN file2 WHERE file1.object_id = file2.subject_id" FROM file1.sssom.tsv file2.sssom.tsv`
     """  # noqa: DAR101
     # should start with from_tsv and MOST should return write_sssom
-    run_sql_query(query=query, inputs=inputs, output=output)
+    run_sql_query(query=query, inputs=inputs, output=output, jobs=jobs)
     # n = 1
     # new_msdf = MappingSetDataFrame()
     # while len(inputs) >= n:
@@ -331,6 +344,11 @@ def dosql(query: str, inputs: List[str], output: TextIO):
     help="if set, includes object labels",
 )
 @click.option("-l", "--limit", type=int)
+@click.option(
+    "--page-size",
+    type=click.IntRange(min=1),
+    help="if set, fetches the mappings in pages of this many results",
+)
 @click.option("-P", "--prefix", type=click.Tuple([str, str]), multiple=True)
 @output_option
 def sparql(
@@ -338,13 +356,16 @@ def sparql(
     config,
     graph: str,
     limit: int,
+    page_size: Optional[int],
     object_labels: bool,
     prefix: List[Dict[str, str]],
     output: TextIO,
 ):
     """Run a SPARQL query."""
     # FIXME this usage needs _serious_ refactoring
-    endpoint = EndpointConfig()  # type: ignore
+    endpoint = EndpointConfig(
+        url=None, graph=None, predmap={}, predicates=None, limit=None, prefix_map=None  # type: ignore
+    )
     if config is not None:
         for k, v in yaml.safe_load(config).items():
             setattr(endpoint, k, v)
@@ -354,6 +375,8 @@ def sparql(
         endpoint.graph = graph
     if limit is not None:
         endpoint.limit = limit
+    if page_size is not None:
+        endpoint.page_size = page_size
     if object_labels is not None:
         endpoint.include_object_labels = object_labels
     if prefix is not None:
@@ -403,22 +426,68 @@ def diff(inputs: Tuple[str, str], output: TextIO):
 @main.command()
 @output_directory_option
 @click.argument("inputs", nargs=-1)
-def partition(inputs: List[str], output_directory: str):
-    """Partition an SSSOM into one file for each strongly connected component."""
-    docs = [parse_sssom_table(input) for input in inputs]
-    doc = docs.pop()
-    """for d2 in docs:
-        doc.mapping_set.mappings += d2.mapping_set.mappings"""
-    cliquedocs = split_into_cliques(doc)
-    for n, cdoc in enumerate(cliquedocs, start=1):
-        ofn = f"{output_directory}/clique_{n}.sssom.tsv"
-        # logging.info(f'Writing to {ofn}. Size={len(cdoc.mapping_set.mappings)}')
-        # logging.info(f'Example: {cdoc.mapping_set.mappings[0].subject_id}')
-        # logging.info(f'Writing to {ofn}. Size={len(cdoc)}')
-        msdf = to_mapping_set_dataframe(cdoc)
-        with open(ofn, "w") as file:
-            write_table(msdf, file)
-        # write_tsv(msdf, ofn)
+@click.option(
+    "--index",
+    "index_directory",
+    type=click.Path(file_okay=False),
+    help="Directory of a clique index. If it exists, the inputs are added to it and only the "
+    "cliques they change are written, and the files of merged cliques are deleted. "
+    "Otherwise it is created from the inputs. Files are named after the clique ids of the index.",
+)
+@click.option(
+    "-s", "--summary", type=click.File("w"), help="Write a summary of the written cliques."
+)
+@click.option(
+    "--archive",
+    type=click.Path(dir_okay=False),
+    help="Pack all cliques into a single ZIP archive at this path instead of one file each.",
+)
+@jobs_option
+def partition(
+    inputs: List[str],
+    output_directory: str,
+    jobs: int,
+    index_directory: Optional[str] = None,
+    summary: Optional[TextIO] = None,
+    archive: Optional[str] = None,
+):
+    """Partition an SSSOM into one file for each strongly connected component.
+
+    The inputs are parsed and the clique files are written by ``--jobs`` workers.
+    """  # noqa: DAR101
+    if archive and index_directory:
+        raise click.UsageError("--archive cannot be combined with --index.")
+    docs = parse_sssom_tables(inputs, jobs=jobs)
+    if index_directory is None:
+        doc = docs.pop()
+        """for d2 in docs:
+            doc.mapping_set.mappings += d2.mapping_set.mappings"""
+        cliques = dict(enumerate(split_into_clique_dataframes(doc), start=1))
+        summary_df = summarize_cliques(doc) if summary else None
+    else:
+        if os.path.exists(os.path.join(index_directory, CliqueIndex.NODES_FILE)):
+            index = CliqueIndex.load(index_directory)
+            changed: Set[int] = set()
+            for doc in docs:
+                update = index.add(doc)
+                changed = changed.difference(update.removed).union(update.changed)
+                for clique_id in update.removed:
+                    ofn = f"{output_directory}/clique_{clique_id}.sssom.tsv"
+                    if os.path.exists(ofn):
+                        os.remove(ofn)
+        else:
+            index = CliqueIndex.from_msdf(merge_msdf(*docs) if len(docs) > 1 else docs[0])
+            changed = set(index.nodes)
+        index.save(index_directory)
+        cliques = index.get_cliques(changed)
+        summary_df = index.summarize(changed) if summary else None
+    tables = {f"clique_{n}": msdf for n, msdf in cliques.items()}
+    if archive:
+        write_table_archive(tables, archive)
+    else:
+        write_tables(tables, output_directory, jobs=jobs)
+    if summary_df is not None:
+        summary_df.to_csv(summary, sep="\t")
 
 
 @main.command()
@@ -510,8 +579,16 @@ def correlations(input: str, output: TextIO, transpose: bool, fields: Tuple):
     default=False,
     help="Boolean indicating the need for reconciliation of the SSSOM tsv file.",
 )
+@click.option(
+    "--streaming",
+    is_flag=True,
+    help="Merge SSSOM TSVs sorted by subject_id row by row, without loading them in memory.",
+)
+@jobs_option
 @output_option
-def merge(inputs: str, output: TextIO, reconcile: bool = False):
+def merge(
+    inputs: str, output: TextIO, reconcile: bool = False, streaming: bool = False, jobs: int = 1
+):
     """Merge multiple MappingSetDataFrames into one .
 
     if reconcile=True, then dedupe(remove redundant lower confidence mappings) and
@@ -519,7 +596,12 @@ def merge(inputs: str, output: TextIO, reconcile: bool = False):
     then remove lower confidence positive one. If confidence is the same,
     prefer HumanCurated. If both HumanCurated, prefer negative mapping).
     """  # noqa: DAR101
-    msdfs = [parse_sssom_table(i) for i in inputs]
+    if streaming:
+        if reconcile:
+            raise click.UsageError("--streaming cannot be combined with --reconcile.")
+        merge_sorted_files(inputs, output)
+        return
+    msdfs = parse_sssom_tables(inputs, jobs=jobs)
     merged_msdf = merge_msdf(*msdfs, reconcile=reconcile)
     write_table(merged_msdf, output)
 
@@ -534,6 +616,11 @@ def merge(inputs: str, output: TextIO, reconcile: bool = False):
     multiple=True,
     help="List of prefixes in order of precedence.",
 )
+@click.option(
+    "--streaming",
+    is_flag=True,
+    help="Rewrite an N-Triples ontology line by line, without loading it into memory.",
+)
 @output_option
 def rewire(
     input,
@@ -542,15 +629,24 @@ def rewire(
     output: TextIO,
     input_format,
     output_format,
+    streaming: bool,
 ):
     """Rewire an ontology using equivalent classes/properties from a mapping file.
 
     Example:
         sssom rewire -I xml  -i tests/data/cob.owl -m tests/data/cob-to-external.tsv --precedence PR
 
+    With --streaming, the ontology must be in N-Triples and is written out in N-Triples.
+
     # noqa: DAR101
     """
     msdf = parse_sssom_table(mapping_file)
+    if streaming:
+        if input_format not in NTRIPLES_FORMATS or output_format not in NTRIPLES_FORMATS:
+            raise click.UsageError("--streaming requires N-Triples input and output formats.")
+        with open(input) as lines:
+            rewire_ntriples(lines, output, msdf, precedence=precedence)
+        return
     g = Graph()
     g.parse(input, format=input_format)
     rewire_graph(g, msdf, precedence=precedence)
@@ -594,7 +690,7 @@ def reconcile_prefixes(input: str, reconcile_prefix_file: Path, output: TextIO):
     "-r",
     "--by-rows",
     default=True,
-    help="Sort rows by DataFrame column #1 (ascending).",
+    help="Sort rows by subject, predicate, object and predicate modifier, then by the other columns.",
 )
 def sort(input: str, output: TextIO, by_columns: bool, by_rows: bool):
     """
@@ -602,10 +698,10 @@ def sort(input: str, output: TextIO, by_columns: bool, by_rows: bool):
 
     :param input: SSSOM TSV file.
     :param by_columns: Boolean flag to sort columns canonically.
-    :param by_rows: Boolean flag to sort rows by column #1 (ascending order).
+    :param by_rows: Boolean flag to sort rows canonically.
     :param output: SSSOM TSV file with columns sorted.
     """
-    msdf = parse_sssom_table(input)
+    msdf = parse_sssom_table(input, sort=False)
     msdf.df = sort_df_rows_columns(msdf.df, by_columns, by_rows)
     write_table(msdf, output)
 
@@ -708,13 +804,22 @@ def annotate(input: str, output: TextIO, replace_multivalued: bool, **kwargs):
     help="Mapping file path that needs to be removed from input.",
 )
 @output_option
-def remove(input: str, output: TextIO, remove_map: str):
+@click.option(
+    "--streaming",
+    is_flag=True,
+    help="Remove the mappings chunk by chunk, without loading the whole input mapping set.",
+)
+def remove(input: str, output: TextIO, remove_map: str, streaming: bool):
     """Remove mappings from an input mapping.
 
     :param input: Input SSSOM tsv file.
     :param output: Output path.
     :param remove_map: Mapping to be removed.
+    :param streaming: If True, remove the mappings chunk by chunk.
     """
+    if streaming:
+        remove_file(input, remove_map, output)
+        return
     input_msdf = parse_sssom_table(input)
     remove_msdf = parse_sssom_table(remove_map)
     input_msdf.remove_mappings(remove_msdf)
@@ -737,12 +842,18 @@ def remove(input: str, output: TextIO, remove_map: str):
     help="If True (default), add inverted mappings to the input mapping set, else, just return inverted mappings as a separate mapping set.",
 )
 @click.option("--inverse-map", help="Path to file that contains the inverse predicate dictionary.")
+@click.option(
+    "--streaming",
+    is_flag=True,
+    help="Invert the mappings chunk by chunk, without loading the whole mapping set.",
+)
 def invert(
     input: str,
     output: TextIO,
     subject_prefix: Optional[str],
     merge_inverted: bool,
     inverse_map: TextIO,
+    streaming: bool,
 ):
     """
     Invert subject and object IDs such that all subjects have the prefix provided.
@@ -753,16 +864,21 @@ def invert(
                           just return inverted data.
     :param inverse_map: YAML file providing the inverse mapping for predicates.
     :param output: SSSOM TSV file with columns sorted.
+    :param streaming: If True, invert the mappings chunk by chunk.
     """
-    msdf = parse_sssom_table(input)
+    inverse_dictionary = None
     if inverse_map:
         with open(inverse_map, "r") as im:  # type: ignore
-            inverse_dictionary = yaml.safe_load(im)
+            inverse_dictionary = yaml.safe_load(im)["inverse_predicate_map"]
+    if streaming:
+        invert_file(input, output, subject_prefix, merge_inverted, inverse_dictionary)
+        return
+    msdf = parse_sssom_table(input)
     msdf.df = invert_mappings(
-        msdf.df,
+        msdf,
         subject_prefix,
         merge_inverted,
-        inverse_dictionary["inverse_predicate_map"],
+        inverse_dictionary,
     )
     write_table(msdf, output)
 
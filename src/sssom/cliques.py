@@ -1,106 +1,250 @@
 """Utilities for identifying and working with cliques/SCCs in mappings graphs."""
 
 import hashlib
-import statistics
-from collections import defaultdict
-from typing import DefaultDict, Dict, List, Optional, Set
+from collections import ChainMap, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar, DefaultDict, Dict, Iterable, List, Optional, Tuple, Union
 
 import networkx as nx
+import numpy as np
 import pandas as pd
-
-# from .sssom_datamodel import Mapping
-from sssom_schema import Mapping
+from pandas.core.groupby import DataFrameGroupBy
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import breadth_first_order, connected_components
 
 from sssom.constants import (
-    OWL_DIFFERENT_FROM,
+    CONFIDENCE,
+    OBJECT_ID,
+    OBJECT_LABEL,
+    OBJECT_SOURCE,
     OWL_EQUIVALENT_CLASS,
+    PREDICATE_ID,
     RDFS_SUBCLASS_OF,
     SKOS_BROAD_MATCH,
     SKOS_CLOSE_MATCH,
     SKOS_EXACT_MATCH,
     SKOS_NARROW_MATCH,
     SSSOM_SUPERCLASS_OF,
+    SUBJECT_ID,
+    SUBJECT_LABEL,
+    SUBJECT_SOURCE,
 )
 
-from .parsers import to_mapping_set_document
+from .parsers import parse_sssom_table, to_mapping_set_document
 from .sssom_document import MappingSetDocument
-from .util import MappingSetDataFrame
+from .util import MappingSetDataFrame, drop_duplicate_rows
+from .writers import write_table
+
+#: The column holding the id of the clique of each mapping
+CLIQUE_ID = "clique_id"
+
+#: The edges contributed to the mappings graph by each predicate, as a pair of flags
+#: (subject to object, object to subject). Other predicates contribute no edge.
+PREDICATE_EDGES: Dict[str, Tuple[bool, bool]] = {
+    OWL_EQUIVALENT_CLASS: (True, True),
+    SKOS_EXACT_MATCH: (True, True),
+    # TODO: consider distributing
+    SKOS_CLOSE_MATCH: (True, True),
+    RDFS_SUBCLASS_OF: (False, True),
+    SKOS_BROAD_MATCH: (False, True),
+    SSSOM_SUPERCLASS_OF: (True, False),
+    SKOS_NARROW_MATCH: (True, False),
+}
+
+
+def _encode_nodes(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, pd.Index]:
+    """Encode the subjects and objects of a mappings table as integer node ids.
+
+    :param df: A mappings table
+    :return: The node ids of the subjects and of the objects, and the CURIE of each node id
+    """
+    codes, nodes = pd.factorize(
+        pd.concat([df[SUBJECT_ID], df[OBJECT_ID]], ignore_index=True), use_na_sentinel=False
+    )
+    return codes[: len(df)], codes[len(df) :], pd.Index(nodes)
+
+
+def _get_edges(
+    df: pd.DataFrame, subjects: np.ndarray, objects: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the directed edges of the mappings graph between integer node ids.
+
+    :param df: A mappings table
+    :param subjects: The node ids of the subjects
+    :param objects: The node ids of the objects
+    :return: The source and target node ids of each edge
+    """
+    predicates = df[PREDICATE_ID]
+    forward = predicates.isin([p for p, (f, _) in PREDICATE_EDGES.items() if f]).to_numpy()
+    backward = predicates.isin([p for p, (_, b) in PREDICATE_EDGES.items() if b]).to_numpy()
+    sources = np.concatenate([subjects[forward], objects[backward]])
+    targets = np.concatenate([objects[forward], subjects[backward]])
+    return sources, targets
+
+
+def _get_components(
+    sources: np.ndarray, targets: np.ndarray, n: int, symmetric: bool = False
+) -> np.ndarray:
+    """Get the strongly connected component of each node of a graph.
+
+    :param sources: The source node ids of the edges
+    :param targets: The target node ids of the edges
+    :param n: The number of nodes
+    :param symmetric: Whether every edge has its reverse in the graph, in which case the
+        components are found with a union-find instead of a strongly connected components search
+    :return: The component id of each node, numbered from the largest component down
+    """
+    if n == 0:
+        return np.zeros(0, dtype=int)
+    if symmetric:
+        return _order_by_size(_union_find(sources, targets, n))
+    graph = coo_matrix((np.ones(len(sources), dtype=bool), (sources, targets)), shape=(n, n))
+    _, labels = connected_components(graph.tocsr(), directed=True, connection="strong")
+    return _order_by_size(labels)
+
+
+def _union_find(sources: np.ndarray, targets: np.ndarray, n: int) -> np.ndarray:
+    """Get the connected components of an undirected graph with an array-backed union-find.
+
+    All edges are processed at once in each round: the root of the higher id of every
+    pair of roots still to be joined is hooked under the lower one, then paths are
+    compressed by pointer jumping until every node points at its root. Edges whose ends
+    already share a root are dropped from the next round.
+
+    :param sources: One end of each edge
+    :param targets: The other end of each edge
+    :param n: The number of nodes
+    :return: The root of the component of each node
+    """
+    parent = np.arange(n)
+    while True:
+        source_roots = parent[sources]
+        target_roots = parent[targets]
+        pending = source_roots != target_roots
+        if not pending.any():
+            return parent
+        sources, targets = sources[pending], targets[pending]
+        source_roots, target_roots = source_roots[pending], target_roots[pending]
+        np.minimum.at(
+            parent,
+            np.maximum(source_roots, target_roots),
+            np.minimum(source_roots, target_roots),
+        )
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+
+def _order_by_size(labels: np.ndarray) -> np.ndarray:
+    """Renumber component labels by decreasing component size.
+
+    :param labels: The component label of each node
+    :return: The renumbered labels, 0 being the largest component
+    """
+    order = np.argsort(-np.bincount(labels), kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return rank[labels]
+
+
+def _is_symmetric(df: pd.DataFrame) -> bool:
+    """Check whether every predicate of a mappings table contributes edges in both directions."""
+    one_way = [p for p, (forward, backward) in PREDICATE_EDGES.items() if forward != backward]
+    return not df[PREDICATE_ID].isin(one_way).any()
+
+
+def _get_node_components(
+    df: pd.DataFrame, subjects: np.ndarray, objects: np.ndarray, n: int
+) -> np.ndarray:
+    """Get the clique of each node of the graph of a mappings table.
+
+    :param df: A mappings table
+    :param subjects: The node ids of the subjects
+    :param objects: The node ids of the objects
+    :param n: The number of nodes
+    :return: The component id of each node, numbered from the largest component down
+    """
+    if _is_symmetric(df):
+        two_way = df[PREDICATE_ID].isin(list(PREDICATE_EDGES)).to_numpy()
+        return _get_components(subjects[two_way], objects[two_way], n, symmetric=True)
+    sources, targets = _get_edges(df, subjects, objects)
+    return _get_components(sources, targets, n)
+
+
+def _get_clique_labels(df: pd.DataFrame) -> Tuple[np.ndarray, int]:
+    """Get the clique of the subject of each mapping.
+
+    :param df: A mappings table
+    :return: The clique id of each row and the total number of cliques
+    """
+    subjects, objects, nodes = _encode_nodes(df)
+    components = _get_node_components(df, subjects, objects, len(nodes))
+    return components[subjects], int(components.max(initial=-1)) + 1
 
 
 def to_digraph(msdf: MappingSetDataFrame) -> nx.DiGraph:
     """Convert to a graph where the nodes are entities' CURIEs and edges are their mappings."""
-    doc = to_mapping_set_document(msdf)
+    subjects, objects, nodes = _encode_nodes(msdf.df)
+    sources, targets = _get_edges(msdf.df, subjects, objects)
     g = nx.DiGraph()
-    if doc.mapping_set.mappings is not None:
-        for mapping in doc.mapping_set.mappings:
-            if not isinstance(mapping, Mapping):
-                raise TypeError
-            s = mapping.subject_id
-            o = mapping.object_id
-            p = mapping.predicate_id
-            # TODO: this is copypastad from export_ptable
-
-            pi = None
-
-            if p == OWL_EQUIVALENT_CLASS:
-                pi = 2
-            elif p == SKOS_EXACT_MATCH:
-                pi = 2
-            elif p == SKOS_CLOSE_MATCH:
-                # TODO: consider distributing
-                pi = 2
-            elif p == RDFS_SUBCLASS_OF:
-                pi = 0
-            elif p == SKOS_BROAD_MATCH:
-                pi = 0
-            elif p == SSSOM_SUPERCLASS_OF:
-                pi = 1
-            elif p == SKOS_NARROW_MATCH:
-                pi = 1
-            elif p == OWL_DIFFERENT_FROM:
-                pi = 3
-
-            if pi == 0:
-                g.add_edge(o, s)
-            elif pi == 1:
-                g.add_edge(s, o)
-            elif pi == 2:
-                g.add_edge(s, o)
-                g.add_edge(o, s)
+    g.add_edges_from(zip(nodes[sources], nodes[targets]))
     return g
 
 
+def get_clique_ids(msdf: MappingSetDataFrame) -> pd.Series:
+    """Get the strongly connected component of the associated graph each mapping belongs to.
+
+    :param msdf: MappingSetDataFrame object
+    :return: The clique id of each mapping, aligned with the rows of ``msdf.df``. Cliques
+        are numbered from 0 by decreasing size.
+    """
+    labels, _ = _get_clique_labels(msdf.df)
+    return pd.Series(labels, index=msdf.df.index, name=CLIQUE_ID)
+
+
+def group_by_clique(msdf: MappingSetDataFrame) -> DataFrameGroupBy:
+    """Group the mappings of a MappingSetDataFrame by clique.
+
+    :param msdf: MappingSetDataFrame object
+    :return: A groupby view of ``msdf.df`` keyed by clique id
+    """
+    return msdf.df.groupby(get_clique_ids(msdf), sort=True)
+
+
+def split_into_clique_dataframes(msdf: MappingSetDataFrame) -> List[MappingSetDataFrame]:
+    """Split a MappingSetDataFrame into one per strongly connected component of the associated graph.
+
+    :param msdf: MappingSetDataFrame object
+    :return: List of MappingSetDataFrame objects, from the largest clique down
+    """
+    return [
+        MappingSetDataFrame(
+            df=df.reset_index(drop=True),
+            prefix_map=dict(msdf.prefix_map),
+            metadata=dict(msdf.metadata or {}),
+        )
+        for _, df in group_by_clique(msdf)
+    ]
+
+
 def split_into_cliques(msdf: MappingSetDataFrame) -> List[MappingSetDocument]:
     """Split a MappingSetDataFrames documents corresponding to a strongly connected components of the associated graph.
 
     :param msdf: MappingSetDataFrame object
     :raises TypeError: If Mappings is not of type List
-    :raises TypeError: If each mapping is not of type Mapping
-    :raises TypeError: If Mappings is not of type List
     :return: List of MappingSetDocument objects
     """
     doc = to_mapping_set_document(msdf)
-    graph = to_digraph(msdf)
-    components_it = nx.algorithms.components.strongly_connected_components(graph)
-    components = sorted(components_it, key=len, reverse=True)
-
-    curie_to_component = {}
-    for i, component in enumerate(components):
-        for curie in component:
-            curie_to_component[curie] = i
-    documents = [
-        MappingSetDocument.empty(prefix_map=doc.prefix_map) for _ in range(len(components))
-    ]
+    labels, n = _get_clique_labels(msdf.df)
+    documents = [MappingSetDocument.empty(prefix_map=doc.prefix_map) for _ in range(n)]
 
     if not isinstance(doc.mapping_set.mappings, list):
         raise TypeError
-    for mapping in doc.mapping_set.mappings:
-        if not isinstance(mapping, Mapping):
-            raise TypeError
-        subject_document = documents[curie_to_component[mapping.subject_id]]
-        if not isinstance(subject_document.mapping_set.mappings, list):
-            raise TypeError
-        subject_document.mapping_set.mappings.append(mapping)
+    for mapping, label in zip(doc.mapping_set.mappings, labels):
+        documents[label].mapping_set.mappings.append(mapping)
     return documents
 
 
@@ -125,76 +269,315 @@ def get_src(src: Optional[str], curie: str):
         return src
 
 
-def summarize_cliques(doc: MappingSetDataFrame):
-    """Summarize stats on a clique doc."""
-    cliquedocs = split_into_cliques(doc)
-    items = []
-    for cdoc in cliquedocs:
-        mappings = cdoc.mapping_set.mappings
-        if mappings is None:
-            continue
-        members: Set[str] = set()
-        members_names: Set[str] = set()
-        confs: List[float] = []
-        id2src: Dict[str, str] = {}
-        for mapping in mappings:
-            if not isinstance(mapping, Mapping):
-                raise TypeError
-            sub = str(mapping.subject_id)
-            obj = str(mapping.object_id)
-            id2src[sub] = get_src(mapping.subject_source, sub)
-            id2src[obj] = get_src(mapping.object_source, obj)
-            members.add(sub)
-            members.add(obj)
-            members_names.add(str(mapping.subject_label))
-            members_names.add(str(mapping.object_label))
-            if mapping.confidence is not None:
-                confs.append(mapping.confidence)
-        src2ids = group_values(id2src)
-        mstr = "|".join(members)
-        md5 = hashlib.md5(mstr.encode("utf-8")).hexdigest()  # noqa:S303
-        item = {
-            "id": md5,
-            "num_mappings": len(mappings),
-            "num_members": len(members),
-            "members": mstr,
-            "members_labels": "|".join(members_names),
-            "max_confidence": max(confs),
-            "min_confidence": min(confs),
-            "avg_confidence": statistics.mean(confs),
-            "sources": "|".join(src2ids.keys()),
-            "num_sources": len(src2ids.keys()),
+def _get_member_table(df: pd.DataFrame, clique_ids: pd.Series) -> pd.DataFrame:
+    """Get the members of each clique together with their source.
+
+    The source of a member is the ``subject_source``/``object_source`` of the last mapping
+    it appears in, falling back to the prefix of its CURIE.
+
+    :param df: A mappings table
+    :param clique_ids: The clique id of each mapping
+    :return: A table of clique ids, members and sources with one row per clique member
+    """
+    sides = []
+    for offset, (id_column, source_column) in enumerate(
+        [(SUBJECT_ID, SUBJECT_SOURCE), (OBJECT_ID, OBJECT_SOURCE)]
+    ):
+        members = df[id_column].astype(str)
+        sources = members.str.split(":", n=1).str[0]
+        if source_column in df.columns:
+            sources = df[source_column].astype(object).replace("", np.nan).fillna(sources)
+        sides.append(
+            pd.DataFrame(
+                {
+                    CLIQUE_ID: clique_ids.to_numpy(),
+                    "member": members.to_numpy(),
+                    "source": sources.astype(str).to_numpy(),
+                    "order": 2 * np.arange(len(df)) + offset,
+                }
+            )
+        )
+    table = pd.concat(sides, ignore_index=True).sort_values("order", kind="stable")
+    return table.drop_duplicates([CLIQUE_ID, "member"], keep="last").drop(columns="order")
+
+
+def _join_sorted(values: pd.Series) -> str:
+    return "|".join(sorted(set(values)))
+
+
+def summarize_cliques(doc: MappingSetDataFrame, clique_ids: Optional[pd.Series] = None):
+    """Summarize stats on a clique doc.
+
+    :param doc: MappingSetDataFrame object
+    :param clique_ids: The clique id of each mapping, computed with :func:`get_clique_ids`
+        if not given. If given, the ids are added to the summary as a ``clique_id`` column.
+    :return: A table with one row per clique, with the slots of
+        :class:`sssom.cliquesummary.Clique` plus the members, count and conflation of each source
+    """
+    df = doc.df
+    keep_ids = clique_ids is not None
+    if clique_ids is None:
+        clique_ids = get_clique_ids(doc)
+    mappings = df.groupby(clique_ids, sort=True)
+    summary = pd.DataFrame({"num_mappings": mappings.size()})
+
+    members = _get_member_table(df, clique_ids)
+    by_clique = members.groupby(CLIQUE_ID, sort=True)
+    summary["num_members"] = by_clique["member"].nunique()
+    summary["members"] = by_clique["member"].agg(_join_sorted)
+    summary.insert(
+        0,
+        "id",
+        summary["members"].map(
+            lambda m: hashlib.md5(m.encode("utf-8")).hexdigest()  # noqa:S303,S324
+        ),
+    )
+
+    labels = pd.concat(
+        [
+            df[column].replace("", np.nan) if column in df.columns else pd.Series(np.nan, df.index)
+            for column in (SUBJECT_LABEL, OBJECT_LABEL)
+        ]
+    )
+    summary["members_labels"] = (
+        labels.fillna("None")
+        .astype(str)
+        .groupby(pd.concat([clique_ids, clique_ids]))
+        .agg(_join_sorted)
+    )
+
+    if CONFIDENCE in df.columns:
+        confidence = pd.to_numeric(df[CONFIDENCE], errors="coerce").groupby(clique_ids)
+        summary["max_confidence"] = confidence.max()
+        summary["min_confidence"] = confidence.min()
+        summary["avg_confidence"] = confidence.mean()
+    else:
+        summary["max_confidence"] = summary["min_confidence"] = summary["avg_confidence"] = np.nan
+
+    summary["sources"] = by_clique["source"].agg(_join_sorted)
+    summary["num_sources"] = by_clique["source"].nunique()
+
+    by_source = members.groupby([CLIQUE_ID, "source"], sort=True)["member"]
+    counts = by_source.size()
+    conflated = (counts > 1).groupby(level=CLIQUE_ID)
+    counts_by_clique = counts.groupby(level=CLIQUE_ID)
+    summary["is_conflated"] = conflated.any()
+    summary["is_all_conflated"] = conflated.all()
+    summary["total_conflated"] = conflated.sum()
+    summary["proportion_conflated"] = summary["total_conflated"] / summary["num_sources"]
+    harmonic_mean = counts_by_clique.size() / (1 / counts).groupby(level=CLIQUE_ID).sum()
+    summary["conflation_score"] = (counts_by_clique.min() - 1) * summary["num_sources"] + (
+        harmonic_mean - 1
+    )
+    summary["members_count"] = counts_by_clique.sum()
+    summary["min_count_by_source"] = counts_by_clique.min()
+    summary["max_count_by_source"] = counts_by_clique.max()
+    summary["avg_count_by_source"] = counts_by_clique.mean()
+    summary["harmonic_mean_count_by_source"] = harmonic_mean
+
+    source_members = by_source.agg(_join_sorted).unstack()
+    source_counts = counts.unstack()
+    for source in source_members.columns:
+        summary[source] = source_members[source]
+        summary[f"{source}_count"] = source_counts[source]
+        summary[f"{source}_conflated"] = (source_counts[source] > 1).where(
+            source_counts[source].notna()
+        )
+    if keep_ids:
+        return summary.rename_axis(CLIQUE_ID).reset_index()
+    return summary.reset_index(drop=True)
+
+
+@dataclass
+class CliqueUpdate:
+    """The cliques of a :class:`CliqueIndex` affected by adding mappings."""
+
+    changed: List[int]
+    """Ids of the cliques that are new or whose mappings changed"""
+
+    removed: List[int]
+    """Ids of the cliques that were merged into another one and no longer exist"""
+
+
+@dataclass
+class CliqueIndex:
+    """A mapping set together with the clique of every entity it mentions.
+
+    The index can be saved to and loaded from a directory, and mappings can be added
+    to it incrementally: only the cliques that the new mappings may join are recomputed.
+    Clique ids are stable across updates; when cliques are merged, the merged clique
+    takes the smallest of their ids.
+    """
+
+    msdf: MappingSetDataFrame
+    """The indexed mappings"""
+
+    nodes: pd.Series
+    """The clique id of each entity, indexed by CURIE"""
+
+    MAPPINGS_FILE: ClassVar[str] = "mappings.sssom.tsv"
+    NODES_FILE: ClassVar[str] = "cliques.tsv"
+
+    @classmethod
+    def from_msdf(cls, msdf: MappingSetDataFrame) -> "CliqueIndex":
+        """Index the cliques of a mapping set.
+
+        :param msdf: MappingSetDataFrame object
+        :return: A clique index
+        """
+        df = drop_duplicate_rows(msdf.df)
+        subjects, objects, nodes = _encode_nodes(df)
+        components = _get_node_components(df, subjects, objects, len(nodes))
+        return cls(
+            msdf=MappingSetDataFrame(
+                df=df, prefix_map=dict(msdf.prefix_map), metadata=dict(msdf.metadata or {})
+            ),
+            nodes=pd.Series(components, index=nodes, name=CLIQUE_ID),
+        )
+
+    @classmethod
+    def load(cls, directory: Union[str, Path]) -> "CliqueIndex":
+        """Load a clique index saved with :meth:`save`.
+
+        :param directory: The directory of the index
+        :return: A clique index
+        """
+        directory = Path(directory)
+        nodes = pd.read_csv(
+            directory / cls.NODES_FILE, sep="\t", index_col=0, keep_default_na=False
+        )[CLIQUE_ID]
+        return cls(msdf=parse_sssom_table(directory / cls.MAPPINGS_FILE), nodes=nodes)
+
+    def save(self, directory: Union[str, Path]) -> None:
+        """Save the index to a directory, which is created if needed.
+
+        :param directory: The directory of the index
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / self.MAPPINGS_FILE, "w") as file:
+            write_table(self.msdf, file)
+        self.nodes.rename_axis("member").to_csv(directory / self.NODES_FILE, sep="\t")
+
+    def get_clique_ids(self) -> pd.Series:
+        """Get the clique id of each indexed mapping.
+
+        :return: The clique id of each mapping, aligned with the rows of ``msdf.df``
+        """
+        return self.msdf.df[SUBJECT_ID].map(self.nodes).rename(CLIQUE_ID)
+
+    def get_cliques(self, clique_ids: Iterable[int]) -> Dict[int, MappingSetDataFrame]:
+        """Get the mappings of some cliques.
+
+        :param clique_ids: Ids of cliques
+        :return: A MappingSetDataFrame for each of the cliques that has mappings
+        """
+        df = self.msdf.df[self.get_clique_ids().isin(set(clique_ids))]
+        return {
+            int(clique_id): MappingSetDataFrame(
+                df=group.reset_index(drop=True),
+                prefix_map=dict(self.msdf.prefix_map),
+                metadata=dict(self.msdf.metadata or {}),
+            )
+            for clique_id, group in df.groupby(self.get_clique_ids()[df.index], sort=True)
         }
-        for s, ids in src2ids.items():
-            item[s] = "|".join(ids)
-        conflated = False
-        total_conflated = 0
-        all_conflated = True
-        src_counts = []
-        for s, ids in src2ids.items():
-            n = len(ids)
-            item[f"{s}_count"] = n
-            item[f"{s}_conflated"] = n > 1
-            if n > 1:
-                conflated = True
-                total_conflated += 1
+
+    def summarize(self, clique_ids: Iterable[int]) -> pd.DataFrame:
+        """Summarize some cliques, as :func:`summarize_cliques` does.
+
+        :param clique_ids: Ids of cliques
+        :return: A table with one row per clique that has mappings, with a ``clique_id`` column
+        """
+        all_ids = self.get_clique_ids()
+        rows = all_ids.isin(set(clique_ids))
+        msdf = MappingSetDataFrame(df=self.msdf.df[rows], prefix_map=self.msdf.prefix_map)
+        return summarize_cliques(msdf, clique_ids=all_ids[rows].astype(int))
+
+    def add(self, msdf: MappingSetDataFrame) -> CliqueUpdate:
+        """Add mappings to the index, recomputing only the cliques they affect.
+
+        :param msdf: MappingSetDataFrame object with the mappings to add
+        :return: The cliques that changed or disappeared
+        """
+        n_old = len(self.msdf.df.index)
+        df = drop_duplicate_rows(pd.concat([self.msdf.df, msdf.df], ignore_index=True))
+        new_rows = df.iloc[n_old:]
+        self.msdf.df = df
+        self.msdf.prefix_map = dict(ChainMap(self.msdf.prefix_map, msdf.prefix_map))
+        if new_rows.empty:
+            return CliqueUpdate(changed=[], removed=[])
+
+        touched = pd.Index(pd.concat([new_rows[SUBJECT_ID], new_rows[OBJECT_ID]]).unique())
+        if _is_symmetric(df):
+            affected_nodes = touched
+        else:
+            affected_nodes = touched.union(self._get_nodes_on_new_cycles(df, new_rows))
+        affected = set(self.nodes.reindex(affected_nodes).dropna().astype(int))
+        nodes = touched.union(self.nodes.index[self.nodes.isin(affected)])
+
+        rows = df[df[SUBJECT_ID].isin(nodes) & df[OBJECT_ID].isin(nodes)]
+        subjects, objects, subgraph_nodes = _encode_nodes(rows)
+        extra_nodes = nodes.difference(subgraph_nodes)
+        subgraph_nodes = subgraph_nodes.append(extra_nodes)
+        components = _get_node_components(rows, subjects, objects, len(subgraph_nodes))
+
+        old_ids = self.nodes.reindex(subgraph_nodes).to_numpy()
+        next_id = int(self.nodes.max()) + 1 if len(self.nodes) else 0
+        new_ids = np.empty(int(components.max()) + 1, dtype=int)
+        for component in range(len(new_ids)):
+            previous = old_ids[components == component]
+            previous = previous[~pd.isna(previous)]
+            if len(previous):
+                new_ids[component] = int(previous.min())
             else:
-                all_conflated = False
-            src_counts.append(n)
-
-        item["is_conflated"] = conflated
-        item["is_all_conflated"] = all_conflated
-        item["total_conflated"] = total_conflated
-        item["proportion_conflated"] = total_conflated / len(src2ids.items())
-        item["conflation_score"] = (min(src_counts) - 1) * len(src2ids.items()) + (
-            statistics.harmonic_mean(src_counts) - 1
-        )
-        item["members_count"] = sum(src_counts)
-        item["min_count_by_source"] = min(src_counts)
-        item["max_count_by_source"] = max(src_counts)
-        item["avg_count_by_source"] = statistics.mean(src_counts)
-        item["harmonic_mean_count_by_source"] = statistics.harmonic_mean(src_counts)
-        # item['geometric_mean_conflated'] = statistics.geometric_mean(conflateds) py3.8
-        items.append(item)
-    df = pd.DataFrame(items)
-    return df
+                new_ids[component] = next_id
+                next_id += 1
+        updated = pd.Series(new_ids[components], index=subgraph_nodes, name=CLIQUE_ID)
+        self.nodes = pd.concat([self.nodes.drop(updated.index, errors="ignore"), updated])
+        changed = sorted(set(updated))
+        return CliqueUpdate(changed=changed, removed=sorted(affected.difference(changed)))
+
+    def _get_nodes_on_new_cycles(self, df: pd.DataFrame, new_rows: pd.DataFrame) -> pd.Index:
+        """Get the entities that are on a cycle through a new mapping.
+
+        These are the entities reachable from the end of a new edge that can also
+        reach its start, so that their strongly connected component may change.
+
+        :param df: All mappings, including the new ones
+        :param new_rows: The new mappings
+        :return: The CURIEs of the entities
+        """
+        subjects, objects, nodes = _encode_nodes(df)
+        sources, targets = _get_edges(df, subjects, objects)
+        node_ids = pd.Series(np.arange(len(nodes)), index=nodes)
+        new_subjects = node_ids[new_rows[SUBJECT_ID]].to_numpy()
+        new_objects = node_ids[new_rows[OBJECT_ID]].to_numpy()
+        new_sources, new_targets = _get_edges(new_rows, new_subjects, new_objects)
+        forward = _get_reachable(sources, targets, len(nodes), new_targets)
+        backward = _get_reachable(targets, sources, len(nodes), new_sources)
+        return nodes[forward & backward]
+
+
+def _get_reachable(
+    sources: np.ndarray, targets: np.ndarray, n: int, starts: np.ndarray
+) -> np.ndarray:
+    """Get the nodes reachable from any of a set of start nodes.
+
+    :param sources: The source node ids of the edges
+    :param targets: The target node ids of the edges
+    :param n: The number of nodes
+    :param starts: The start node ids
+    :return: A boolean mask of the reachable nodes
+    """
+    # A virtual root node linked to every start node allows a single breadth-first search
+    root = np.full(len(starts), n)
+    graph = coo_matrix(
+        (
+            np.ones(len(sources) + len(starts), dtype=bool),
+            (np.concatenate([sources, root]), np.concatenate([targets, starts])),
+        ),
+        shape=(n + 1, n + 1),
+    )
+    reachable = np.zeros(n + 1, dtype=bool)
+    reachable[breadth_first_order(graph.tocsr(), n, return_predecessors=False)] = True
+    return reachable[:n]
@@ -1,8 +1,11 @@
 """Constants."""
 
+import json
+import logging
 import pathlib
 from enum import Enum
-from typing import List
+from importlib.metadata import version
+from typing import Any, Dict, List, Optional, Union
 
 import pkg_resources
 import yaml
@@ -15,6 +18,8 @@ HERE = pathlib.Path(__file__).parent.resolve()
 
 SCHEMA_YAML = pkg_resources.resource_filename("sssom_schema", "schema/sssom_schema.yaml")
 EXTERNAL_CONTEXT = HERE / "sssom.external.context.jsonld"
+SCHEMA_SNAPSHOT = HERE / "sssom_schema.snapshot.json"
+SSSOM_SCHEMA_VERSION = version("sssom_schema")
 
 # SCHEMA_VIEW = package_schemaview("sssom_schema")
 
@@ -212,16 +217,22 @@ class SSSOMSchemaView(object):
 
     Reason for this: https://github.com/mapping-commons/sssom-py/issues/322
     Implemented via PR: https://github.com/mapping-commons/sssom-py/pull/323
+
+    The slot lists and the schema dictionary are read from the snapshot shipped
+    with the package (see :func:`write_schema_snapshot`) so that they are available
+    without building a :class:`SchemaView`. The view itself is only built, once, by
+    callers that need it.
     """
 
     _view = None
     _dict = None
+    _snapshot = None
 
     def __new__(cls):
         """Create a instance of the SSSOM schema view if non-existent."""
         if not hasattr(cls, "instance"):
             cls.instance = super(SSSOMSchemaView, cls).__new__(cls)
-            return cls.instance
+        return cls.instance
 
     @property
     def view(self) -> SchemaView:
@@ -230,29 +241,135 @@ class SSSOMSchemaView(object):
             self._view = SchemaView(SCHEMA_YAML)
         return self._view
 
+    @property
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the schema snapshot, computing it if the shipped one is missing or stale."""
+        if self._snapshot is None:
+            self._snapshot = load_schema_snapshot()
+            if self._snapshot is None:
+                self._snapshot = _build_schema_snapshot(self.view)
+        return self._snapshot
+
     @property
     def dict(self) -> dict:
         """Return SchemaView as a dictionary."""
         if self._dict is None:
-            self._dict = schema_as_dict(self.view.schema)
+            self._dict = self.snapshot["dict"]
         return self._dict
 
     @property
     def mapping_slots(self) -> List[str]:
         """Return list of mapping slots."""
-        return self.view.get_class("mapping").slots
+        return self.snapshot["mapping_slots"]
 
     @property
     def mapping_set_slots(self) -> List[str]:
         """Return list of mapping set slots."""
-        return self.view.get_class("mapping set").slots
+        return self.snapshot["mapping_set_slots"]
 
     @property
     def multivalued_slots(self) -> List[str]:
         """Return list of multivalued slots."""
-        return [c for c in self.view.all_slots() if self.view.get_slot(c).multivalued]
+        return self.snapshot["multivalued_slots"]
 
     @property
     def entity_reference_slots(self) -> List[str]:
         """Return list of entity reference slots."""
-        return [c for c in self.view.all_slots() if self.view.get_slot(c).range == ENTITY_REFERENCE]
+        return self.snapshot["entity_reference_slots"]
+
+    @property
+    def mapping_slot_rules(self) -> Dict[str, Dict[str, Any]]:
+        """Return the constraints on the values of each mapping slot."""
+        return self.snapshot["mapping_slot_rules"]
+
+    @property
+    def mapping_set_slot_rules(self) -> Dict[str, Dict[str, Any]]:
+        """Return the constraints on the values of each mapping set slot."""
+        return self.snapshot["mapping_set_slot_rules"]
+
+
+# Creating the instance is cheap, as the schema is only read when it is first used, so
+# it is created on import to make SSSOMSchemaView.instance available
+SSSOMSchemaView()
+
+
+def _build_schema_snapshot(view: SchemaView) -> Dict[str, Any]:
+    return {
+        "sssom_schema_version": SSSOM_SCHEMA_VERSION,
+        "dict": schema_as_dict(view.schema),
+        "mapping_slots": list(view.get_class("mapping").slots),
+        "mapping_set_slots": list(view.get_class("mapping set").slots),
+        "multivalued_slots": [c for c in view.all_slots() if view.get_slot(c).multivalued],
+        "entity_reference_slots": [
+            c for c in view.all_slots() if view.get_slot(c).range == ENTITY_REFERENCE
+        ],
+        "mapping_slot_rules": _get_slot_rules(view, "mapping"),
+        "mapping_set_slot_rules": _get_slot_rules(view, "mapping set"),
+    }
+
+
+def _get_slot_rules(view: SchemaView, class_name: str) -> Dict[str, Dict[str, Any]]:
+    """Get the constraints on the values of the slots of a class.
+
+    :param view: The schema view
+    :param class_name: The name of the class
+    :return: A dictionary from the name of each slot of the class, except those holding
+        objects of another class, to its range, whether it is required and multivalued, its
+        pattern and bounds, and the permissible values of its enum range
+    """
+    enums = view.all_enums()
+    classes = view.all_classes()
+    return {
+        slot.name: {
+            "range": slot.range,
+            "required": bool(slot.required),
+            "multivalued": bool(slot.multivalued),
+            "pattern": slot.pattern,
+            "minimum_value": slot.minimum_value,
+            "maximum_value": slot.maximum_value,
+            "permissible_values": (
+                list(enums[slot.range].permissible_values) if slot.range in enums else None
+            ),
+        }
+        for slot in view.class_induced_slots(class_name)
+        if slot.range not in classes
+    }
+
+
+def load_schema_snapshot(
+    path: Union[str, pathlib.Path] = SCHEMA_SNAPSHOT
+) -> Optional[Dict[str, Any]]:
+    """Load the schema snapshot if it matches the installed version of sssom-schema.
+
+    :param path: Path to the snapshot, defaults to the one shipped with the package
+    :return: The snapshot, or None if it is missing, unreadable or was built from another
+        version
+    """
+    try:
+        with open(path) as file:
+            snapshot = json.load(file)
+    except FileNotFoundError:
+        logging.debug(f"No schema snapshot at {path}")
+        return None
+    except ValueError as e:
+        logging.warning(f"Could not read the schema snapshot at {path}: {e}")
+        return None
+    if snapshot.get("sssom_schema_version") != SSSOM_SCHEMA_VERSION:
+        logging.debug(
+            f"Schema snapshot at {path} was built for sssom-schema "
+            f"{snapshot.get('sssom_schema_version')}, not {SSSOM_SCHEMA_VERSION}"
+        )
+        return None
+    return snapshot
+
+
+def write_schema_snapshot(path: Union[str, pathlib.Path] = SCHEMA_SNAPSHOT) -> None:
+    """Build the schema snapshot from the installed sssom-schema and write it.
+
+    This is run at build time (``make schema_snapshot``) whenever sssom-schema is upgraded.
+
+    :param path: Path to the snapshot, defaults to the one shipped with the package
+    """
+    with open(path, "w") as file:
+        json.dump(_build_schema_snapshot(SchemaView(SCHEMA_YAML)), file, indent=2)
+        file.write("\n")
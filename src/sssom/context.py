@@ -3,7 +3,9 @@
 import json
 import logging
 import uuid
-from typing import Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 
 import pkg_resources
 
@@ -24,6 +26,41 @@ SSSOM_CONTEXT = pkg_resources.resource_filename(
 )
 
 
+@lru_cache(maxsize=None)
+def _load_jsonld(path: str) -> Mapping[str, Any]:
+    """Load a JSON-LD document once per process.
+
+    The result is shared by every caller, so it is wrapped in read-only views and must
+    only be handed out through :func:`_copy_on_write`.
+
+    :param path: Path to the JSON-LD file
+    :return: A read-only view of the parsed document
+    """
+    with open(path, "r") as file:
+        data = json.load(file, strict=False)
+    return MappingProxyType(
+        {
+            key: MappingProxyType(value) if isinstance(value, dict) else value
+            for key, value in data.items()
+        }
+    )
+
+
+def _copy_on_write(document: Mapping[str, Any]) -> Dict[str, Any]:
+    """Get a mutable copy of the top two levels of a cached JSON-LD document.
+
+    Callers may add, replace or delete entries of the document and of its ``@context``
+    without affecting the cache. Nested term definitions are shared and must not be mutated
+    in place.
+
+    :param document: A document returned by :func:`_load_jsonld`
+    :return: A mutable JSON-LD document
+    """
+    return {
+        key: dict(value) if isinstance(value, Mapping) else value for key, value in document.items()
+    }
+
+
 def get_jsonld_context():
     """Get JSON-LD form of sssom_context variable from auto-generated 'internal_context.py' file.
 
@@ -31,10 +68,7 @@ def get_jsonld_context():
 
     :return: JSON-LD context
     """
-    with open(SSSOM_CONTEXT, "r") as c:
-        context = json.load(c, strict=False)
-
-    return context
+    return _copy_on_write(_load_jsonld(SSSOM_CONTEXT))
 
 
 def get_external_jsonld_context():
@@ -42,9 +76,19 @@ def get_external_jsonld_context():
 
     :return: JSON-LD context
     """
-    with open(str(EXTERNAL_CONTEXT), "r") as f:
-        data = json.load(f, strict=False)
-    return data
+    return _copy_on_write(_load_jsonld(str(EXTERNAL_CONTEXT)))
+
+
+@lru_cache(maxsize=None)
+def _get_built_in_prefix_map() -> Mapping[str, str]:
+    contxt = _load_jsonld(SSSOM_CONTEXT)
+    prefix_map = {}
+    for key in contxt["@context"]:
+        if key in list(SSSOM_BUILT_IN_PREFIXES):
+            v = contxt["@context"][key]
+            if isinstance(v, str):
+                prefix_map[key] = v
+    return MappingProxyType(prefix_map)
 
 
 def get_built_in_prefix_map() -> PrefixMap:
@@ -54,14 +98,7 @@ def get_built_in_prefix_map() -> PrefixMap:
 
     :return: Prefix map
     """
-    contxt = get_jsonld_context()
-    prefix_map = {}
-    for key in contxt["@context"]:
-        if key in list(SSSOM_BUILT_IN_PREFIXES):
-            v = contxt["@context"][key]
-            if isinstance(v, str):
-                prefix_map[key] = v
-    return prefix_map
+    return dict(_get_built_in_prefix_map())
 
 
 def add_built_in_prefixes_to_prefix_map(
@@ -89,17 +126,11 @@ def add_built_in_prefixes_to_prefix_map(
     return prefix_map
 
 
-def get_default_metadata() -> Metadata:
-    """Get @context property value from the sssom_context variable in the auto-generated 'internal_context.py' file.
-
-    [Auto generated from sssom.yaml by jsonldcontextgen.py]
-
-    :return: Metadata
-    """
-    contxt = get_jsonld_context()
-    contxt_external = get_external_jsonld_context()
+@lru_cache(maxsize=None)
+def _get_default_prefix_map() -> Mapping[str, str]:
+    contxt = _load_jsonld(SSSOM_CONTEXT)
+    contxt_external = _load_jsonld(str(EXTERNAL_CONTEXT))
     prefix_map = {}
-    metadata_dict: MetadataType = {}
     for key in contxt["@context"]:
         v = contxt["@context"][key]
         if isinstance(v, str):
@@ -118,8 +149,18 @@ def get_default_metadata() -> Metadata:
                     logging.warning(
                         f"{key} is already in prefix map ({prefix_map[key]}, but with a different value than {v}"
                     )
+    return MappingProxyType(prefix_map)
+
+
+def get_default_metadata() -> Metadata:
+    """Get @context property value from the sssom_context variable in the auto-generated 'internal_context.py' file.
 
-    metadata = Metadata(prefix_map=prefix_map, metadata=metadata_dict)
+    [Auto generated from sssom.yaml by jsonldcontextgen.py]
+
+    :return: Metadata
+    """
+    metadata_dict: MetadataType = {}
+    metadata = Metadata(prefix_map=dict(_get_default_prefix_map()), metadata=metadata_dict)
     metadata.metadata["mapping_set_id"] = DEFAULT_MAPPING_SET_ID
     metadata.metadata["license"] = DEFAULT_LICENSE
     return metadata
@@ -1,11 +1,16 @@
 """I/O utilities for SSSOM."""
 
+import csv
+import heapq
 import logging
 import os
 import re
+from collections import ChainMap
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional, TextIO, Union
+from typing import Iterator, List, Optional, Sequence, Set, TextIO, Tuple, Union
 
+import numpy as np
 import pandas as pd
 from bioregistry import get_iri
 from pansql import sqldf
@@ -16,6 +21,7 @@ from .constants import (
     PREFIX_MAP_MODE_MERGED,
     PREFIX_MAP_MODE_METADATA_ONLY,
     PREFIX_MAP_MODE_SSSOM_DEFAULT_ONLY,
+    SUBJECT_ID,
     SchemaValidationType,
 )
 from .context import (
@@ -24,19 +30,34 @@ from .context import (
     set_default_license,
     set_default_mapping_set_id,
 )
-from .parsers import get_parsing_function, parse_sssom_table, split_dataframe
+from .parsers import (
+    _open_input,
+    _read_metadata_from_table,
+    _separate_metadata_and_table_from_stream,
+    get_parsing_function,
+    parse_sssom_table,
+    parse_sssom_tables,
+    split_dataframe,
+)
 from .typehints import Metadata
 from .util import (
+    KEY_FEATURES,
+    PREFIX_MAP_KEY,
     MappingSetDataFrame,
+    _anti_join,
+    _get_sssom_schema_object,
+    _hash_rows,
     are_params_slots,
     augment_metadata,
+    get_metadata_columns,
+    invert_mappings,
     is_curie,
     is_iri,
     raise_for_bad_path,
     raise_for_bad_prefix_map_mode,
     read_metadata,
 )
-from .writers import get_writer_function, write_table, write_tables
+from .writers import get_metadata_header_lines, get_writer_function, write_table, write_tables
 
 
 def convert_file(
@@ -113,29 +134,33 @@ def parse_file(
     write_table(doc, output, embedded_mode)
 
 
-def validate_file(input_path: str, validation_types: List[SchemaValidationType]) -> None:
+def validate_file(
+    input_path: str, validation_types: List[SchemaValidationType], jobs: int = 1
+) -> None:
     """Validate the incoming SSSOM TSV according to the SSSOM specification.
 
     :param input_path: The path to the input file in one of the legal formats, eg obographs, aligmentapi-xml
     :param validation_types: A list of validation types to run.
+    :param jobs: The number of processes validating the mappings against the JSON schema
     """
     # Two things to check:
     # 1. All prefixes in the DataFrame are define in prefix_map
     # 2. All columns in the DataFrame abide by sssom-schema.
     msdf = parse_sssom_table(file_path=input_path)
-    validate(msdf=msdf, validation_types=validation_types)
+    validate(msdf=msdf, validation_types=validation_types, jobs=jobs)
 
 
-def split_file(input_path: str, output_directory: Union[str, Path]) -> None:
+def split_file(input_path: str, output_directory: Union[str, Path], jobs: int = 1) -> None:
     """Split an SSSOM TSV by prefixes and relations.
 
     :param  input_path: The path to the input file in one of the legal formats, eg obographs, aligmentapi-xml
     :param output_directory: The directory to which the split file should be exported.
+    :param jobs: The number of threads writing the split files concurrently
     """
     raise_for_bad_path(input_path)
     msdf = parse_sssom_table(input_path)
     splitted = split_dataframe(msdf)
-    write_tables(splitted, output_directory)
+    write_tables(splitted, output_directory, jobs=jobs)
 
 
 def _get_prefix_map(metadata: Metadata, prefix_map_mode: str = None):
@@ -280,7 +305,9 @@ def extract_iri(input, prefix_map) -> list:
 #     return new_msdf
 
 
-def run_sql_query(query: str, inputs: List[str], output: TextIO) -> MappingSetDataFrame:
+def run_sql_query(
+    query: str, inputs: List[str], output: TextIO, jobs: int = 1
+) -> MappingSetDataFrame:
     """Run a SQL query over one or more SSSOM files.
 
     Each of the N inputs is assigned a table name df1, df2, ..., dfN
@@ -298,13 +325,15 @@ def run_sql_query(query: str, inputs: List[str], output: TextIO) -> MappingSetDa
     :param query: Query to be executed over a pandas DataFrame (msdf.df).
     :param inputs: Input files that form the source tables for query.
     :param output: Output.
+    :param jobs: Number of processes used to parse the inputs in parallel.
     :return: Filtered MappingSetDataFrame object.
     """
     n = 1
     new_msdf = MappingSetDataFrame()
+    msdfs = parse_sssom_tables(inputs, jobs=jobs)
     while len(inputs) >= n:
         fn = inputs[n - 1]
-        msdf = parse_sssom_table(fn)
+        msdf = msdfs[n - 1]
         df = msdf.df
         # df = parse(fn)
         globals()[f"df{n}"] = df
@@ -320,6 +349,221 @@ def run_sql_query(query: str, inputs: List[str], output: TextIO) -> MappingSetDa
     return new_msdf
 
 
+def merge_sorted_files(
+    inputs: List[str], output: TextIO, key: Sequence[str] = (SUBJECT_ID,)
+) -> None:
+    """Merge SSSOM TSVs that are each sorted by ``key`` in a single streaming pass.
+
+    This is the streaming counterpart of :func:`sssom.util.merge_msdf` for mapping sets
+    too large to be held in memory. The inputs are read row by row and merged k-way, so
+    only the rows sharing the current key are held in memory for deduplication. Files
+    written by sssom-py are sorted by ``subject_id``, the default key.
+
+    :param inputs: Paths of the SSSOM TSVs to merge
+    :param output: Output location.
+    :param key: The columns by which every input is sorted.
+    """
+    tables = [_SortedTable(path, key) for path in inputs]
+    try:
+        slots = list(_get_sssom_schema_object().dict["slots"])
+        all_columns = {column for table in tables for column in table.columns}
+        columns = [slot for slot in slots if slot in all_columns] + sorted(
+            all_columns.difference(slots)
+        )
+        prefix_map = add_built_in_prefixes_to_prefix_map(
+            dict(ChainMap(*(table.prefix_map for table in tables)))
+        )
+        for line in get_metadata_header_lines({PREFIX_MAP_KEY: prefix_map}):
+            print(line, file=output)
+        writer = csv.writer(output, delimiter="\t", lineterminator="\n")
+        writer.writerow(columns)
+
+        current_key = None
+        seen: Set[Tuple[str, ...]] = set()
+        for row_key, row in heapq.merge(*(table.rows(columns) for table in tables)):
+            if row_key != current_key:
+                current_key = row_key
+                seen.clear()
+            if row not in seen:
+                seen.add(row)
+                writer.writerow(row)
+    finally:
+        for table in tables:
+            table.close()
+
+
+class _SortedTable:
+    """An SSSOM TSV whose rows are read lazily, in the order of a sort key."""
+
+    def __init__(self, path: str, key: Sequence[str]):
+        raise_for_bad_path(path)
+        self.path = path
+        self.key = list(key)
+        self._stream = _open_input(path)
+        table_stream, metadata_stream = _separate_metadata_and_table_from_stream(self._stream)
+        metadata = _read_metadata_from_table(metadata_stream)
+        self.prefix_map = metadata.pop(PREFIX_MAP_KEY, {})
+        self._reader = csv.reader(table_stream, delimiter="\t")
+        header = next(self._reader, [])
+        missing = [column for column in self.key if column not in header]
+        if missing:
+            raise ValueError(f"{path} has no {missing} column(s) to merge on.")
+        self._metadata_columns = get_metadata_columns(metadata, header)
+        self._header = header
+        self.columns = header + list(self._metadata_columns)
+
+    def rows(self, columns: List[str]) -> Iterator[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+        """Yield the sort key and the values aligned to ``columns`` for each row.
+
+        :param columns: The columns of the merged table
+        :raises ValueError: If the rows are not sorted by the key
+        :yields: Pairs of key and row tuples
+        """
+        key_indexes = [self._header.index(column) for column in self.key]
+        positions = {column: i for i, column in enumerate(self._header)}
+        previous_key = None
+        for values in self._reader:
+            if not values:
+                continue
+            record = dict(self._metadata_columns)
+            record.update((column, values[i]) for column, i in positions.items() if i < len(values))
+            row_key = tuple(values[i] for i in key_indexes)
+            if previous_key is not None and row_key < previous_key:
+                raise ValueError(
+                    f"{self.path} is not sorted by {self.key}: {row_key} after {previous_key}"
+                )
+            previous_key = row_key
+            yield row_key, tuple(record.get(column, "") for column in columns)
+
+    def close(self) -> None:
+        """Close the underlying stream."""
+        self._stream.close()
+
+
+def invert_file(
+    input_path: str,
+    output: TextIO,
+    subject_prefix: Optional[str] = None,
+    merge_inverted: bool = True,
+    predicate_invert_dictionary: Optional[dict] = None,
+    chunk_size: int = 100_000,
+) -> None:
+    """Invert the mappings of an SSSOM TSV chunk by chunk, without holding it in memory.
+
+    This is the streaming counterpart of :func:`sssom.util.invert_mappings`. Only the
+    64-bit hash of each row written is kept, with the number of its chunk. A row whose
+    hash was written before is compared value by value with the rows of the earlier
+    chunk, read and inverted again, and skipped if it was written already. The output
+    has the same rows as the in-memory inversion, with the inverted mappings of each
+    chunk following it.
+
+    :param input_path: The path to the input SSSOM TSV
+    :param output: Output location.
+    :param subject_prefix: Prefix of subjects desired.
+    :param merge_inverted: If True (default), add inverted mappings to the input mappings,
+        else, just return inverted mappings.
+    :param predicate_invert_dictionary: The inverse of each predicate
+    :param chunk_size: The number of rows read at a time
+    """
+    columns: List[str] = []
+
+    def invert(chunk: pd.DataFrame) -> pd.DataFrame:
+        """Invert a chunk, with the columns of the first one."""
+        df = invert_mappings(chunk, subject_prefix, merge_inverted, predicate_invert_dictionary)
+        if not columns:
+            columns.extend(df.columns)
+        return df.fillna("").reindex(columns=columns, fill_value="")
+
+    # the sorted hashes of the rows written, and the number of the chunk of each
+    seen_hashes = np.empty(0, dtype=np.uint64)
+    seen_chunks = np.empty(0, dtype=np.int64)
+    for number, chunk in enumerate(_iter_table_chunks(input_path, output, chunk_size)):
+        df = invert(chunk)
+        hashes = _hash_rows(df)
+        left = np.searchsorted(seen_hashes, hashes, side="left")
+        right = np.searchsorted(seen_hashes, hashes, side="right")
+        new = left == right
+        if not new.all():
+            # rows are only skipped if they equal a row of an earlier chunk with their hash
+            candidates = {
+                i: set(seen_chunks[left[i] : right[i]].tolist()) for i in np.flatnonzero(~new)
+            }
+            needed = set().union(*candidates.values())
+            written = set()
+            earlier_chunks = _iter_table_chunks(input_path, None, chunk_size)
+            for earlier_number, earlier_chunk in enumerate(islice(earlier_chunks, max(needed) + 1)):
+                if earlier_number not in needed:
+                    continue
+                earlier = invert(earlier_chunk)
+                earlier = earlier[np.isin(_hash_rows(earlier), hashes[~new])]
+                written.update(earlier.itertuples(index=False, name=None))
+            rows = df.iloc[list(candidates)].itertuples(index=False, name=None)
+            new[list(candidates)] = [row not in written for row in rows]
+        new_hashes = np.sort(hashes[new])
+        positions = np.searchsorted(seen_hashes, new_hashes)
+        seen_hashes = np.insert(seen_hashes, positions, new_hashes)
+        seen_chunks = np.insert(seen_chunks, positions, number)
+        df[new].to_csv(output, sep="\t", index=False, header=number == 0)
+
+
+def remove_file(
+    input_path: str, remove_path: str, output: TextIO, chunk_size: int = 100_000
+) -> None:
+    """Remove the mappings of an SSSOM TSV from another one, chunk by chunk.
+
+    This is the streaming counterpart of
+    :meth:`sssom.util.MappingSetDataFrame.remove_mappings`: only the mappings to remove
+    are held in memory. Rows are compared as written in the files, without the
+    normalisation of ``sssom:superClassOf`` mappings done by the parser, and the prefix
+    map of the input is kept as is.
+
+    :param input_path: The path to the input SSSOM TSV
+    :param remove_path: The path to the SSSOM TSV of the mappings to remove
+    :param output: Output location.
+    :param chunk_size: The number of rows of the input read at a time
+    """
+    remove_df = pd.concat(list(_iter_table_chunks(remove_path, None, chunk_size)))
+    keys = key_hashes = None
+    header = True
+    for chunk in _iter_table_chunks(input_path, output, chunk_size):
+        if keys is None:
+            on = [column for column in KEY_FEATURES if column in chunk.columns]
+            keys = remove_df.reindex(columns=on, fill_value="").drop_duplicates()
+            key_hashes = _hash_rows(keys)
+        _anti_join(chunk, keys, key_hashes).to_csv(output, sep="\t", index=False, header=header)
+        header = False
+
+
+def _iter_table_chunks(
+    input_path: str, output: Optional[TextIO], chunk_size: int
+) -> Iterator[pd.DataFrame]:
+    """Read an SSSOM TSV chunk by chunk, copying its metadata to the output.
+
+    :param input_path: The path to the SSSOM TSV
+    :param output: The location to which the metadata is written, with the built-in
+        prefixes added to its prefix map, if any
+    :param chunk_size: The number of rows read at a time
+    :yields: Data frames of at most ``chunk_size`` rows, with empty strings for the
+        missing values
+    """
+    raise_for_bad_path(input_path)
+    stream = _open_input(input_path)
+    try:
+        table_stream, metadata_stream = _separate_metadata_and_table_from_stream(stream)
+        metadata = _read_metadata_from_table(metadata_stream)
+        if output is not None:
+            metadata[PREFIX_MAP_KEY] = add_built_in_prefixes_to_prefix_map(
+                metadata.get(PREFIX_MAP_KEY, {})
+            )
+            for line in get_metadata_header_lines(metadata):
+                print(line, file=output)
+        yield from pd.read_csv(
+            table_stream, sep="\t", dtype=str, keep_default_na=False, chunksize=chunk_size
+        )
+    finally:
+        stream.close()
+
+
 def filter_file(input: str, output: TextIO, **kwargs) -> MappingSetDataFrame:
     """Filter a dataframe by dynamically generating queries based on user input.
 
@@ -1,13 +1,31 @@
 """SSSOM parsers."""
 
+import bz2
+import gzip
 import io
 import json
 import logging
+import lzma
 import re
 import typing
+import zipfile
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple, Union, cast
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+    cast,
+)
 from xml.dom import Node, minidom
 from xml.dom.minidom import Document
 
@@ -65,10 +83,12 @@ from .util import (
     URI_SSSOM_MAPPINGS,
     MappingSetDataFrame,
     NoCURIEException,
+    categorize_columns,
     curie_from_uri,
     get_file_extension,
     is_multivalued_slot,
     raise_for_bad_path,
+    sort_df_rows_columns,
     to_mapping_set_dataframe,
 )
 
@@ -131,66 +151,206 @@ def read_sssom_json(
 # Parsers (from file)
 
 
-def _open_input(input: Union[str, Path, TextIO]) -> io.StringIO:
-    """Transform a URL, a filepath (from pathlib), or a string (with file contents) to a StringIO object.
+#: Leading bytes identifying the compression formats that can be read transparently
+COMPRESSION_MAGIC_NUMBERS = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
 
-    :param input: A string representing a URL, a filepath, or file contents,
-                              or a Path object representing a filepath.
-    :return: A StringIO object containing the input data.
+
+def _sniff_compression(stream: BinaryIO) -> Optional[str]:
+    """Guess the compression format of a binary stream from its magic bytes without consuming them.
+
+    :param stream: A binary stream supporting ``peek``
+    :return: One of the values of :data:`COMPRESSION_MAGIC_NUMBERS`, or None if uncompressed
     """
-    # If the import already is a StrinIO, return it
-    if isinstance(input, io.StringIO):
-        return input
-    elif isinstance(input, Path):
-        input = str(input)
+    head = stream.peek(6)[:6]  # type: ignore
+    for magic, compression in COMPRESSION_MAGIC_NUMBERS.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+class _SharedBufferedReader(io.BufferedReader):
+    """A buffered reader over a stream of the caller, which it leaves open when closed."""
+
+    def close(self) -> None:  # noqa:D102
+        if self.raw is not None:
+            self.detach()
 
+
+def _decompress_stream(stream: BinaryIO, closefd: bool = True) -> BinaryIO:
+    """Wrap a binary stream in a streaming decompressor if it is gzip, bz2, xz or zstd compressed.
+
+    :param stream: A binary stream
+    :param closefd: If False, closing the returned stream leaves the given stream open
+    :raises ImportError: If the stream is zstd-compressed but :mod:`zstandard` is not installed
+    :return: A binary stream yielding the decompressed data
+    """
+    if not hasattr(stream, "peek"):
+        reader = io.BufferedReader if closefd else _SharedBufferedReader
+        stream = reader(stream)  # type: ignore
+    compression = _sniff_compression(stream)
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=stream)  # type: ignore
+    elif compression == "bz2":
+        return bz2.BZ2File(stream)  # type: ignore
+    elif compression == "xz":
+        return lzma.LZMAFile(stream)  # type: ignore
+    elif compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "Reading zstd-compressed input requires the zstandard package: pip install zstandard"
+            ) from e
+        return zstandard.ZstdDecompressor().stream_reader(stream, closefd=closefd)  # type: ignore
+    return stream
+
+
+_COMPRESSION_OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+
+def _open_binary_input(input: Union[str, Path, BinaryIO]) -> BinaryIO:
+    """Open a URL, a filepath or a binary stream as a (possibly decompressed) binary stream.
+
+    :param input: A string representing a URL or a filepath, a Path object, or a binary stream.
+    :return: A binary stream over the decompressed input data.
+    """
+    if isinstance(input, Path):
+        input = str(input)
     if isinstance(input, str):
         if input.startswith("http://") or input.startswith("https://"):
-            # It's a URL
-            data = requests.get(input, timeout=30).content
-            return io.StringIO(data.decode("utf-8"))
-        elif "\n" in input or "\r" in input:
-            # It's string data
-            return io.StringIO(input)
+            response = requests.get(input, timeout=30, stream=True)
+            response.raise_for_status()
+            response.raw.decode_content = True
+            stream = response.raw
         else:
-            # It's a local file path
-            with open(input, "r") as file:
-                file_content = file.read()
-            return io.StringIO(file_content)
+            stream = open(input, "rb")
+            # opened by name, the decompressor owns the file and closes it
+            opener = _COMPRESSION_OPENERS.get(_sniff_compression(stream))
+            if opener is not None:
+                stream.close()
+                return opener(input, "rb")
+        return _decompress_stream(stream)
+    # the stream of the caller is left open, see _close_input
+    return _decompress_stream(input, closefd=False)
+
+
+def _open_input(input: Union[str, Path, TextIO, BinaryIO]) -> TextIO:
+    """Transform a URL, a filepath (from pathlib), or a string (with file contents) to a text stream.
+
+    Files and URLs are read lazily, and gzip, bz2, xz and zstd compressed content is
+    detected by its magic bytes and decompressed on the fly.
+
+    :param input: A string representing a URL, a filepath, or file contents,
+                              or a Path object representing a filepath, or an open stream.
+    :return: A text stream over the input data.
+    """
+    # If the import already is a text stream, return it
+    if isinstance(input, io.TextIOBase):
+        return input  # type: ignore
+    elif isinstance(input, str) and ("\n" in input or "\r" in input):
+        # It's string data
+        return io.StringIO(input)
+    elif isinstance(input, (str, Path, io.IOBase)):
+        # It's a URL, a local file path or a binary stream
+        return io.TextIOWrapper(_open_binary_input(input), encoding="utf-8")  # type: ignore
 
     raise IOError(f"Could not determine the type of input {input}")
 
 
-def _separate_metadata_and_table_from_stream(s: io.StringIO):
-    s.seek(0)
+def _close_input(stream: TextIO, input: Union[str, Path, TextIO, BinaryIO]) -> None:
+    """Close a text stream given by :func:`_open_input`, unless the caller owns it.
 
-    # Create a new StringIO object for filtered data
-    table_component = io.StringIO()
-    metadata_component = io.StringIO()
+    A text stream of the caller is left as is, and a binary stream of the caller is left
+    open by detaching the text wrapper around it instead of closing it.
 
-    header_section = True
+    :param stream: The text stream returned by :func:`_open_input`
+    :param input: The input given to :func:`_open_input`
+    """
+    if stream is input:
+        return
+    if isinstance(input, io.IOBase) and isinstance(stream, io.TextIOWrapper):
+        stream.detach()
+    else:
+        stream.close()
 
-    # Filter out lines starting with '#'
-    for line in s:
-        if not line.startswith("#"):
-            table_component.write(line)
-            if header_section:
-                header_section = False
-        elif header_section:
-            metadata_component.write(line)
-        else:
+
+class _TableStream(io.TextIOBase):
+    """A read-only text stream over the table section of an SSSOM TSV.
+
+    Comment lines found after the header section are skipped, so that the table can be
+    handed straight to :func:`pandas.read_csv` without being copied in memory first.
+    """
+
+    def __init__(self, first_line: str, lines: TextIO):
+        self._buffer = first_line
+        self._lines = lines
+
+    def readable(self) -> bool:  # noqa:D102
+        return True
+
+    def _next_line(self) -> str:
+        while True:
+            line = self._lines.readline()
+            if not line.startswith("#"):
+                return line
             logging.info(
                 f"Line {line} is starting with hash symbol, but header section is already passed. "
                 f"This line is skipped"
             )
 
-    # Reset the cursor to the start of the new StringIO object
-    table_component.seek(0)
+    def readline(self, size: Optional[int] = -1) -> str:  # noqa:D102
+        if self._buffer:
+            line, self._buffer = self._buffer, ""
+            if "\n" not in line:
+                line += self._next_line()
+        else:
+            line = self._next_line()
+        if size is not None and 0 <= size < len(line):
+            line, self._buffer = line[:size], line[size:]
+        return line
+
+    def read(self, size: Optional[int] = -1) -> str:  # noqa:D102
+        parts = [self._buffer]
+        length = len(self._buffer)
+        while size is None or size < 0 or length < size:
+            line = self._next_line()
+            if not line:
+                break
+            parts.append(line)
+            length += len(line)
+        data = "".join(parts)
+        if size is None or size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _separate_metadata_and_table_from_stream(s: TextIO) -> Tuple[TextIO, io.StringIO]:
+    if s.seekable():
+        s.seek(0)
+
+    metadata_component = io.StringIO()
+    first_table_line = ""
+
+    # Collect the leading lines starting with '#'
+    for line in iter(s.readline, ""):
+        if not line.startswith("#"):
+            first_table_line = line
+            break
+        metadata_component.write(line)
+
+    # Reset the cursor to the start of the metadata StringIO object
     metadata_component.seek(0)
-    return table_component, metadata_component
+    return _TableStream(first_table_line, s), metadata_component
 
 
-def _read_pandas_and_metadata(input: io.StringIO, sep: str = None):
+def _read_pandas_and_metadata(input: TextIO, sep: str = None):
     """Read a tabular data file by wrapping func:`pd.read_csv` to handles comment lines correctly.
 
     :param input: The file to read. If no separator is given, this file should be named.
@@ -242,14 +402,31 @@ def parse_sssom_table(
     file_path: Union[str, Path, TextIO],
     prefix_map: Optional[PrefixMap] = None,
     meta: Optional[MetadataType] = None,
+    categorical: bool = False,
+    sort: bool = True,
     **kwargs,
 ) -> MappingSetDataFrame:
-    """Parse a TSV to a :class:`MappingSetDocument` to a :class:`MappingSetDataFrame`."""
+    """Parse a TSV to a :class:`MappingSetDocument` to a :class:`MappingSetDataFrame`.
+
+    :param file_path: The path, URL or stream of the SSSOM TSV
+    :param prefix_map: A prefix map, merged with the one in the metadata of the file
+    :param meta: Metadata, merged with the metadata of the file
+    :param categorical: If True, the entity references and the other repetitive columns
+        are stored as pandas categoricals, see :func:`sssom.util.categorize_columns`
+    :param sort: If True (default), the mappings are sorted canonically. Otherwise, they
+        keep the order of the file and can be sorted when written, see
+        :func:`sssom.writers.write_table`.
+    :param kwargs: Ignored keyword arguments
+    :return: A MappingSetDataFrame
+    """
     if isinstance(file_path, Path) or isinstance(file_path, str):
         raise_for_bad_path(file_path)
-    stream: io.StringIO = _open_input(file_path)
+    stream = _open_input(file_path)
     sep_new = _get_seperator_symbol_from_file_path(file_path)
-    df, sssom_metadata = _read_pandas_and_metadata(stream, sep_new)
+    try:
+        df, sssom_metadata = _read_pandas_and_metadata(stream, sep_new)
+    finally:
+        _close_input(stream, file_path)
     # if mapping_predicates:
     #     # Filter rows based on presence of predicate_id list provided.
     #     df = df[df["predicate_id"].isin(mapping_predicates)]
@@ -287,10 +464,61 @@ def parse_sssom_table(
             prefix_map = sssom_metadata[CURIE_MAP]
 
     meta_all = _get_prefix_map_and_metadata(prefix_map=prefix_map, meta=meta)
-    msdf = from_sssom_dataframe(df, prefix_map=meta_all.prefix_map, meta=meta_all.metadata)
+    msdf = from_sssom_dataframe(
+        df, prefix_map=meta_all.prefix_map, meta=meta_all.metadata, sort=False
+    )
+    if categorical:
+        msdf.df = categorize_columns(msdf.df)
+    if sort:
+        msdf.sort()
     return msdf
 
 
+def parse_sssom_tables(
+    file_paths: Iterable[Union[str, Path]],
+    jobs: int = 1,
+    **kwargs,
+) -> List[MappingSetDataFrame]:
+    """Parse several SSSOM TSVs, optionally concurrently in a pool of worker processes.
+
+    :param file_paths: The paths or URLs of the SSSOM TSVs
+    :param jobs: The number of worker processes. If 1 (default), the files are parsed
+        sequentially in the current process.
+    :param kwargs: Keyword arguments passed to :func:`parse_sssom_table`
+    :return: A list of MappingSetDataFrames, in the same order as ``file_paths``
+    """
+    file_paths = list(file_paths)
+    if jobs <= 1 or len(file_paths) <= 1:
+        return [parse_sssom_table(file_path, **kwargs) for file_path in file_paths]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(file_paths))) as executor:
+        return list(executor.map(partial(parse_sssom_table, **kwargs), file_paths))
+
+
+def parse_sssom_table_archive(
+    file_path: Union[str, Path],
+    names: Optional[Iterable[str]] = None,
+    **kwargs,
+) -> Dict[str, MappingSetDataFrame]:
+    """Parse the SSSOM TSVs packed in a ZIP archive, e.g. by ``sssom partition --archive``.
+
+    :param file_path: The path of the archive
+    :param names: The names of the members to parse, without the ``.sssom.tsv`` suffix.
+        If not given, all members are parsed.
+    :param kwargs: Keyword arguments passed to :func:`parse_sssom_table`
+    :return: A dictionary from member name to MappingSetDataFrame
+    """
+    raise_for_bad_path(file_path)
+    suffix = ".sssom.tsv"
+    rv = {}
+    with zipfile.ZipFile(file_path) as archive:
+        if names is None:
+            names = [name[: -len(suffix)] for name in archive.namelist() if name.endswith(suffix)]
+        for name in names:
+            with archive.open(f"{name}{suffix}") as member:
+                rv[name] = parse_sssom_table(io.TextIOWrapper(member, encoding="utf-8"), **kwargs)
+    return rv
+
+
 def parse_sssom_rdf(
     file_path: str,
     prefix_map: Dict[str, str] = None,
@@ -304,7 +532,8 @@ def parse_sssom_rdf(
     metadata = _get_prefix_map_and_metadata(prefix_map=prefix_map, meta=meta)
 
     g = Graph()
-    g.parse(file_path, format=serialisation)
+    with _open_binary_input(file_path) as stream:
+        g.parse(source=stream, format=serialisation)
     msdf = from_sssom_rdf(g, prefix_map=metadata.prefix_map, meta=metadata.metadata)
     # df: pd.DataFrame = msdf.df
     # if mapping_predicates and not df.empty():
@@ -323,8 +552,11 @@ def parse_sssom_json(
     raise_for_bad_path(file_path)
     metadata = _get_prefix_map_and_metadata(prefix_map=prefix_map, meta=meta)
 
-    with open(file_path) as json_file:
+    json_file = _open_input(file_path)
+    try:
         jsondoc = json.load(json_file)
+    finally:
+        _close_input(json_file, file_path)
     msdf = from_sssom_json(jsondoc=jsondoc, prefix_map=metadata.prefix_map, meta=metadata.metadata)
     # df: pd.DataFrame = msdf.df
     # if mapping_predicates and not df.empty():
@@ -353,8 +585,11 @@ def parse_obographs_json(
 
     _xmetadata = _get_prefix_map_and_metadata(prefix_map=prefix_map, meta=meta)
 
-    with open(file_path) as json_file:
+    json_file = _open_input(file_path)
+    try:
         jsondoc = json.load(json_file)
+    finally:
+        _close_input(json_file, file_path)
 
     return from_obographs(
         jsondoc,
@@ -443,7 +678,8 @@ def parse_alignment_xml(
 
     metadata = _get_prefix_map_and_metadata(prefix_map=prefix_map, meta=meta)
     logging.info("Loading from alignment API")
-    xmldoc = minidom.parse(file_path)
+    with _open_binary_input(file_path) as stream:
+        xmldoc = minidom.parse(stream)
     msdf = from_alignment_minidom(
         xmldoc,
         prefix_map=metadata.prefix_map,
@@ -460,12 +696,14 @@ def from_sssom_dataframe(
     df: pd.DataFrame,
     prefix_map: Optional[PrefixMap] = None,
     meta: Optional[MetadataType] = None,
+    sort: bool = True,
 ) -> MappingSetDataFrame:
     """Convert a dataframe to a MappingSetDataFrame.
 
     :param df: A mappings dataframe
     :param prefix_map: A prefix map
     :param meta: A metadata dictionary
+    :param sort: If True (default), the mappings are sorted canonically
     :return: MappingSetDataFrame
     """
     prefix_map = _ensure_prefix_map(prefix_map)
@@ -490,7 +728,7 @@ def from_sssom_dataframe(
     ms.mappings = mlist  # type:ignore
     _set_metadata_in_mapping_set(mapping_set=ms, metadata=meta)
     doc = MappingSetDocument(mapping_set=ms, prefix_map=prefix_map)
-    return to_mapping_set_dataframe(doc)
+    return to_mapping_set_dataframe(doc, sort=sort)
 
 
 def from_sssom_rdf(
@@ -951,55 +1189,66 @@ def split_dataframe(
     """
     if msdf.df is None:
         raise RuntimeError
-    subject_prefixes = set(msdf.df[SUBJECT_ID].str.split(":", n=1, expand=True)[0])
-    object_prefixes = set(msdf.df[OBJECT_ID].str.split(":", n=1, expand=True)[0])
-    relations = set(msdf.df[PREDICATE_ID])
-    return split_dataframe_by_prefix(
-        msdf=msdf,
-        subject_prefixes=subject_prefixes,
-        object_prefixes=object_prefixes,
-        relations=relations,
-    )
+    return split_dataframe_by_prefix(msdf=msdf)
 
 
 def split_dataframe_by_prefix(
-    msdf: MappingSetDataFrame, subject_prefixes, object_prefixes, relations
+    msdf: MappingSetDataFrame,
+    subject_prefixes: Optional[Iterable[str]] = None,
+    object_prefixes: Optional[Iterable[str]] = None,
+    relations: Optional[Iterable[str]] = None,
 ) -> Dict[str, MappingSetDataFrame]:
     """Split a mapping set dataframe by prefix.
 
+    The prefixes of the subjects and objects are taken from the prefix columns cached by
+    :meth:`MappingSetDataFrame.get_prefix_column`, and the mappings are grouped by
+    subject prefix, predicate and object prefix in a single pass.
+
     :param msdf: An SSSOM MappingSetDataFrame
-    :param subject_prefixes: a list of prefixes pertaining to the subject
-    :param object_prefixes: a list of prefixes pertaining to the object
-    :param relations: a list of relations of interest
+    :param subject_prefixes: a list of prefixes pertaining to the subject, defaults to all
+    :param object_prefixes: a list of prefixes pertaining to the object, defaults to all
+    :param relations: a list of relations of interest, defaults to all
     :return: a dict of SSSOM data frame names to MappingSetDataFrame
     """
     df = msdf.df
     prefix_map = msdf.prefix_map
-    meta = msdf.metadata
-    splitted = {}
-    for pre_subj in subject_prefixes:
-        for pre_obj in object_prefixes:
-            for rel in relations:
-                relpre = rel.split(":")[0]
-                relppost = rel.split(":")[1]
-                split_name = f"{pre_subj.lower()}_{relppost.lower()}_{pre_obj.lower()}"
-                if df is not None:
-                    dfs = df[
-                        (df[SUBJECT_ID].str.startswith(pre_subj + ":"))
-                        & (df[PREDICATE_ID] == rel)
-                        & (df[OBJECT_ID].str.startswith(pre_obj + ":"))
-                    ]
-                if pre_subj in prefix_map and pre_obj in prefix_map and len(dfs) > 0:
-                    cm = {
-                        pre_subj: prefix_map[pre_subj],
-                        pre_obj: prefix_map[pre_obj],
-                        relpre: prefix_map[relpre],
-                    }
-                    msdf = from_sssom_dataframe(dfs, prefix_map=cm, meta=meta)
-                    splitted[split_name] = msdf
-                else:
-                    logging.warning(
-                        f"Not adding {split_name} because there is a missing prefix ({pre_subj}, {pre_obj}), "
-                        f"or no matches ({len(dfs)} matches found)"
-                    )
+    meta = msdf.metadata or {}
+    splitted: Dict[str, MappingSetDataFrame] = {}
+    if df is None or df.empty:
+        return splitted
+
+    subjects = msdf.get_prefix_column(SUBJECT_ID)
+    objects = msdf.get_prefix_column(OBJECT_ID)
+    keep = subjects.notna() & objects.notna()
+    if subject_prefixes is not None:
+        keep &= subjects.isin(set(subject_prefixes))
+    if object_prefixes is not None:
+        keep &= objects.isin(set(object_prefixes))
+    if relations is not None:
+        keep &= df[PREDICATE_ID].isin(set(relations))
+
+    keys = [subjects[keep], df[PREDICATE_ID][keep], objects[keep]]
+    for (pre_subj, rel, pre_obj), dfs in df[keep].groupby(keys, sort=True, observed=True):
+        relpre, _, relppost = rel.rpartition(":")
+        split_name = f"{pre_subj.lower()}_{relppost.lower()}_{pre_obj.lower()}"
+        missing = [prefix for prefix in (pre_subj, pre_obj, relpre) if prefix not in prefix_map]
+        if missing:
+            logging.warning(
+                f"Not adding {split_name} because there is a missing prefix ({', '.join(missing)})"
+            )
+            continue
+        cm = _ensure_prefix_map(
+            {
+                pre_subj: prefix_map[pre_subj],
+                pre_obj: prefix_map[pre_obj],
+                relpre: prefix_map[relpre],
+            }
+        )
+        # Like a round trip through linkml objects, drop the columns left empty by the split
+        dfs = dfs.loc[:, ~dfs.replace("", np.nan).isna().all()]
+        splitted[split_name] = MappingSetDataFrame(
+            df=sort_df_rows_columns(dfs.reset_index(drop=True)),
+            prefix_map=cm,
+            metadata=dict(meta),
+        )
     return splitted
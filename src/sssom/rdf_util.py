@@ -1,92 +1,143 @@
 """Rewriting functionality for RDFlib graphs."""
 
 import logging
-from typing import Any, Dict, List, Optional
+import re
+from typing import Dict, Iterable, List, Optional, Set, TextIO, Tuple
 
-from linkml_runtime.utils.metamodelcore import URIorCURIE
 from rdflib import Graph, URIRef
 
-# from .sssom_datamodel import EntityReference, Mapping
-from sssom_schema import EntityReference, Mapping
-
-from .parsers import to_mapping_set_document
+from .constants import OBJECT_ID, PREDICATE_ID, SUBJECT_ID
 from .util import MappingSetDataFrame
 
 __all__ = [
+    "get_rewire_map",
     "rewire_graph",
+    "rewire_ntriples",
 ]
 
+#: rdflib format names of N-Triples, the only format rewired in streaming mode
+NTRIPLES_FORMATS = {"nt", "ntriples", "nt11"}
 
-def rewire_graph(
-    g: Graph,
+#: Predicates of the mappings used to rewire
+REWIRE_PREDICATES = {"owl:equivalentClass", "owl:equivalentProperty"}
+
+#: The subject, predicate and rest of an N-Triples statement
+NTRIPLES_STATEMENT = re.compile(r"^(\s*)(<[^>]*>|_:\S+)(\s+)(<[^>]*>)(\s+)(.*)$")
+#: An IRI at the start of the object of an N-Triples statement
+NTRIPLES_IRI = re.compile(r"^<([^>]*)>")
+
+
+def get_rewire_map(
     mset: MappingSetDataFrame,
     subject_to_object: bool = True,
     precedence: Optional[List[str]] = None,
-) -> int:
-    """Rewire an RDF Graph replacing using equivalence mappings."""
-    pm = mset.prefix_map
-    mdoc = to_mapping_set_document(mset)
-    rewire_map: Dict[URIorCURIE, URIorCURIE] = {}
+) -> Dict[str, str]:
+    """Get the IRIs to replace from the equivalence mappings of a mapping set.
 
-    def expand_curie(curie: str) -> URIRef:
-        """Expand CURIE into URIRef."""
-        pfx, local = curie.split(":")
-        return URIRef(f"{pm[pfx]}{local}")
+    :param mset: A mapping set
+    :param subject_to_object: Whether the subjects of the mappings are replaced by their objects,
+        or the other way round
+    :param precedence: Prefixes of the targets to prefer, in order, when an entity is
+        mapped to several ones
+    :raises ValueError: If an entity is mapped to several ones and no precedence decides
+    :return: A dictionary from the IRI of each entity to the IRI that replaces it
+    """
+    df = mset.df
+    df = df[df[PREDICATE_ID].isin(REWIRE_PREDICATES)]
+    src_column, tgt_column = (
+        (SUBJECT_ID, OBJECT_ID) if subject_to_object else (OBJECT_ID, SUBJECT_ID)
+    )
+    pairs = df[[src_column, tgt_column]].drop_duplicates()
+    ambiguous = pairs[src_column].duplicated(keep=False)
 
-    if mdoc.mapping_set.mappings is None:
-        raise TypeError
-    for m in mdoc.mapping_set.mappings:
-        if not isinstance(m, Mapping):
+    rewire_map: Dict[str, str] = dict(pairs[~ambiguous].itertuples(index=False, name=None))
+    for src, tgt in pairs[ambiguous].itertuples(index=False, name=None):
+        if src not in rewire_map:
+            rewire_map[src] = tgt
             continue
-        if m.predicate_id in {"owl:equivalentClass", "owl:equivalentProperty"}:
-            if subject_to_object:
-                src, tgt = m.subject_id, m.object_id
-            else:
-                src, tgt = m.object_id, m.subject_id
-            if not isinstance(src, EntityReference) or not isinstance(tgt, EntityReference):
-                raise TypeError
-            if src in rewire_map:
-                curr_tgt = rewire_map[src]
-                logging.info(f"Ambiguous: {src} -> {tgt} vs {curr_tgt}")
-                if precedence:
-                    curr_pfx, _ = curr_tgt.split(":")
-                    tgt_pfx, _ = tgt.split(":")
-                    if tgt_pfx in precedence:
-                        if curr_pfx not in precedence or precedence.index(
-                            tgt_pfx
-                        ) < precedence.index(curr_pfx):
-                            rewire_map[src] = tgt
-                            logging.info(f"{tgt} has precedence, due to {precedence}")
-                else:
-                    raise ValueError(f"Ambiguous: {src} -> {tgt} vs {curr_tgt}")
-            else:
+        curr_tgt = rewire_map[src]
+        logging.info(f"Ambiguous: {src} -> {tgt} vs {curr_tgt}")
+        if not precedence:
+            raise ValueError(f"Ambiguous: {src} -> {tgt} vs {curr_tgt}")
+        curr_pfx, _ = curr_tgt.split(":")
+        tgt_pfx, _ = tgt.split(":")
+        if tgt_pfx in precedence:
+            if curr_pfx not in precedence or precedence.index(tgt_pfx) < precedence.index(curr_pfx):
                 rewire_map[src] = tgt
+                logging.info(f"{tgt} has precedence, due to {precedence}")
 
-    uri_ref_rewire_map: Dict[URIRef, URIRef] = {
-        expand_curie(k): expand_curie(v) for k, v in rewire_map.items()
+    pm = mset.prefix_map
+
+    def expand_curie(curie: str) -> str:
+        """Expand CURIE into an IRI."""
+        pfx, local = curie.split(":")
+        return f"{pm[pfx]}{local}"
+
+    return {expand_curie(k): expand_curie(v) for k, v in rewire_map.items()}
+
+
+def rewire_graph(
+    g: Graph,
+    mset: MappingSetDataFrame,
+    subject_to_object: bool = True,
+    precedence: Optional[List[str]] = None,
+) -> int:
+    """Rewire an RDF Graph replacing using equivalence mappings.
+
+    Only the triples mentioning a rewired entity are looked up, through the indexes of
+    the graph, and replaced.
+    """
+    uri_ref_rewire_map = {
+        URIRef(k): URIRef(v) for k, v in get_rewire_map(mset, subject_to_object, precedence).items()
     }
 
-    def rewire_node(n: Any):
-        """Rewire node."""
-        if isinstance(n, URIRef):
-            if n in uri_ref_rewire_map:
-                return uri_ref_rewire_map[n]
-            else:
-                return n
-        else:
-            return n
-
-    triples = []
-    new_triples = []
-    num_changed = 0
-    for t in g.triples((None, None, None)):
-        t2 = [rewire_node(x) for x in t]
-        triples.append(t)
-        new_triples.append(tuple(t2))
-        if t2 != t:
-            num_changed += 1
+    triples: Set[Tuple] = set()
+    for node in uri_ref_rewire_map:
+        triples.update(g.triples((node, None, None)))
+        triples.update(g.triples((None, node, None)))
+        triples.update(g.triples((None, None, node)))
     for t in triples:
         g.remove(t)
-    for t in new_triples:
-        g.add(t)
+    for t in triples:
+        g.add(tuple(uri_ref_rewire_map.get(x, x) for x in t))
+    return len(triples)
+
+
+def rewire_ntriples(
+    lines: Iterable[str],
+    output: TextIO,
+    mset: MappingSetDataFrame,
+    subject_to_object: bool = True,
+    precedence: Optional[List[str]] = None,
+) -> int:
+    """Rewire an N-Triples document line by line, without loading it as a graph.
+
+    :param lines: The lines of the N-Triples document
+    :param output: The stream to write the rewired document to
+    :param mset: A mapping set
+    :param subject_to_object: Whether the subjects of the mappings are replaced by their objects,
+        or the other way round
+    :param precedence: Prefixes of the targets to prefer, in order, when an entity is
+        mapped to several ones
+    :return: The number of triples changed
+    """
+    rewire_map = {
+        f"<{k}>": f"<{v}>" for k, v in get_rewire_map(mset, subject_to_object, precedence).items()
+    }
+    num_changed = 0
+    for line in lines:
+        match = NTRIPLES_STATEMENT.match(line)
+        if match is not None:
+            indent, s, space1, p, space2, rest = match.groups()
+            o_match = NTRIPLES_IRI.match(rest)
+            o = o_match.group(0) if o_match else ""
+            new_s = rewire_map.get(s, s)
+            new_p = rewire_map.get(p, p)
+            new_o = rewire_map.get(o, o)
+            if (new_s, new_p, new_o) != (s, p, o):
+                num_changed += 1
+                line = f"{indent}{new_s}{space1}{new_p}{space2}{new_o}{rest[len(o):]}"
+                if not line.endswith("\n"):
+                    line += "\n"
+        output.write(line)
     return num_changed
@@ -1,25 +1,36 @@
 """Utilities for querying mappings with SPARQL."""
 
 import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Mapping, Optional
+from functools import lru_cache
+from itertools import count, islice
+from typing import Dict, Iterator, List, Mapping, Optional, Pattern, Tuple
 
 import pandas as pd
 from rdflib import URIRef
 from rdflib.namespace import RDFS, SKOS
 from SPARQLWrapper import JSON, SPARQLWrapper
+from SPARQLWrapper.SPARQLExceptions import SPARQLWrapperException
 
 from .util import MappingSetDataFrame
 
 __all__ = [
     "EndpointConfig",
+    "iter_mapping_pages",
     "query_mappings",
 ]
 
 
 @dataclass
 class EndpointConfig:
-    """A container for a SPARQL endpoint's configuration."""
+    """A container for a SPARQL endpoint's configuration.
+
+    When ``page_size`` is set, the mappings are fetched in pages of that many results,
+    ``jobs`` pages at a time, and each page is retried up to ``retries`` times.
+    """
 
     url: str
     graph: URIRef
@@ -28,11 +39,63 @@ class EndpointConfig:
     limit: Optional[int]
     prefix_map: Optional[Dict[str, str]]
     include_object_labels: bool = False
+    page_size: Optional[int] = None
+    jobs: int = 1
+    retries: int = 3
+    retry_delay: float = 1.0
 
 
 def query_mappings(config: EndpointConfig) -> MappingSetDataFrame:
     """Query a SPARQL endpoint to obtain a set of mappings."""
-    sparql = SPARQLWrapper(config.url)
+    if config.prefix_map is None:
+        raise TypeError
+    df = pd.concat(list(iter_mapping_pages(config)), ignore_index=True)
+    return MappingSetDataFrame(df=df, prefix_map=config.prefix_map)
+
+
+def iter_mapping_pages(config: EndpointConfig) -> Iterator[pd.DataFrame]:
+    """Query a SPARQL endpoint page by page, yielding a data frame of mappings per page.
+
+    Without a page size, the mappings are fetched with a single query.
+
+    :param config: Configuration
+    :yields: A data frame with the mappings of each page, in order, with their IRIs
+        contracted to CURIEs
+    """
+    query = _get_query(config)
+    if config.page_size is None:
+        limitstr = "" if config.limit is None else f"LIMIT {config.limit}"
+        yield _fetch_page(config, f"{query} {limitstr}")
+        return
+
+    # Paging with OFFSET requires a total order of the results, so every projected
+    # variable is ordered on, as a mapping can have several labels
+    orderstr = " ".join(f"?{c}" for c in _get_columns(config))
+    query = f"{query} ORDER BY {orderstr}"
+    offsets = count(0, config.page_size)
+    if config.limit is not None:
+        offsets = islice(offsets, -(-config.limit // config.page_size))
+
+    def fetch(offset: int) -> pd.DataFrame:
+        """Fetch the page of results starting at the offset."""
+        size = config.page_size
+        if config.limit is not None:
+            size = min(size, config.limit - offset)
+        return _fetch_page(config, f"{query} LIMIT {size} OFFSET {offset}")
+
+    with ThreadPoolExecutor(max_workers=config.jobs) as executor:
+        while True:
+            wave = list(islice(offsets, config.jobs))
+            if not wave:
+                return
+            for page in executor.map(fetch, wave):
+                yield page
+                if len(page) < config.page_size:
+                    return
+
+
+def _get_query(config: EndpointConfig) -> str:
+    """Get the SPARQL query for the mappings of an endpoint, without a limit."""
     if config.graph is None:
         g = "?g"
     elif isinstance(config.graph, str):
@@ -44,23 +107,10 @@ def query_mappings(config: EndpointConfig) -> MappingSetDataFrame:
     else:
         predicates = [expand_curie(predicate, config) for predicate in config.predicates]
     predstr = " ".join(URIRef(predicate).n3() for predicate in predicates)
-    if config.limit is not None:
-        limitstr = f"LIMIT {config.limit}"
-    else:
-        limitstr = ""
-    cols = [
-        "subject_id",
-        "subject_label",
-        "predicate_id",
-        "object_id",
-        "mapping_provider",
-    ]
-    if config.include_object_labels:
-        cols.insert(-1, "object_label")
-    colstr = " ".join([f"?{c}" for c in cols])
+    colstr = " ".join([f"?{c}" for c in _get_columns(config)])
     olq = "OPTIONAL { ?object_id rdfs:label ?object_label }" if config.include_object_labels else ""
-    q = f"""\
-    PREFIX rdfs: {RDFS.uri.n3()}
+    return f"""\
+    PREFIX rdfs: {URIRef(str(RDFS)).n3()}
     SELECT {colstr}
     WHERE {{
         GRAPH {g} {{
@@ -70,20 +120,84 @@ def query_mappings(config: EndpointConfig) -> MappingSetDataFrame:
         }} .
         {olq}
         BIND({g} as ?mapping_provider)
-    }} {limitstr}
+    }}"""
+
+
+def _get_columns(config: EndpointConfig) -> List[str]:
+    """Get the variables projected by the SPARQL query for the mappings of an endpoint."""
+    cols = [
+        "subject_id",
+        "subject_label",
+        "predicate_id",
+        "object_id",
+        "mapping_provider",
+    ]
+    if config.include_object_labels:
+        cols.insert(-1, "object_label")
+    return cols
+
+
+def _fetch_page(config: EndpointConfig, query: str) -> pd.DataFrame:
+    """Run a query against the endpoint, retrying on failure.
+
+    :param config: Configuration
+    :param query: The SPARQL query
+    :return: A data frame with a column per variable of the results, with their IRIs
+        contracted to CURIEs
+    :raises SPARQLWrapperException: If the query failed after all retries
+    :raises OSError: If the endpoint could not be reached after all retries
     """
-    logging.info(q)
-    sparql.setQuery(q)
+    logging.info(query)
+    sparql = SPARQLWrapper(config.url)
+    sparql.setQuery(query)
     sparql.setReturnFormat(JSON)
-    results = sparql.query().convert()
-    rows = []
-    for result in results["results"]["bindings"]:
-        row = {k: v["value"] for k, v in result.items()}
-        rows.append(curiefy_values(row, config))
-    df = pd.DataFrame(rows)
+    for attempt in range(config.retries + 1):
+        try:
+            results = sparql.query().convert()
+            break
+        except (OSError, SPARQLWrapperException) as e:
+            if attempt == config.retries:
+                raise
+            logging.warning(f"Query to {config.url} failed ({e}), retrying")
+            time.sleep(config.retry_delay * 2**attempt)
+
+    bindings = results["results"]["bindings"]
+    columns = [v for v in results["head"]["vars"] if any(v in binding for binding in bindings)]
+    df = pd.DataFrame(
+        {c: [binding.get(c, {}).get("value") for binding in bindings] for c in columns},
+        columns=columns,
+    )
     if config.prefix_map is None:
-        raise TypeError
-    return MappingSetDataFrame(df=df, prefix_map=config.prefix_map)
+        return df
+    pattern, prefixes = _get_prefix_index(tuple(config.prefix_map.items()))
+    for c in columns:
+        values = df[c].dropna().unique()
+        curies = {v: _contract(v, pattern, prefixes) for v in values}
+        df[c] = df[c].map(curies)
+    return df
+
+
+@lru_cache(maxsize=16)
+def _get_prefix_index(prefix_map: Tuple[Tuple[str, str], ...]) -> Tuple[Pattern, Dict[str, str]]:
+    """Compile a prefix map into a pattern matching the URI prefixes.
+
+    :param prefix_map: The items of a prefix map
+    :return: A pattern matching the longest URI prefix at the start of a URI, and a
+        dictionary from each URI prefix to its CURIE prefix
+    """
+    prefixes: Dict[str, str] = {}
+    for k, v in prefix_map:
+        prefixes.setdefault(v, k)
+    alternatives = sorted(prefixes, key=len, reverse=True)
+    return re.compile("|".join(re.escape(v) for v in alternatives)), prefixes
+
+
+def _contract(uri: str, pattern: Pattern, prefixes: Mapping[str, str]) -> str:
+    """Contract a URI with a compiled prefix index."""
+    match = pattern.match(uri) if prefixes else None
+    if match is None:
+        return uri
+    return f"{prefixes[match.group(0)]}:{uri[match.end():]}"
 
 
 def curiefy_values(row: Mapping[str, str], config: EndpointConfig) -> Dict[str, str]:
@@ -99,16 +213,15 @@ def curiefy_values(row: Mapping[str, str], config: EndpointConfig) -> Dict[str,
 def contract_uri(uri: str, config: EndpointConfig) -> str:
     """Replace the URI with a CURIE based on the prefix map in the given configuration.
 
+    The longest matching URI prefix is used.
+
     :param uri: A uniform resource identifier
     :param config: Configuration
     :return: A CURIE if it's able to contract, otherwise return the original URI
     """
     if config.prefix_map is None:
         return uri
-    for k, v in config.prefix_map.items():
-        if uri.startswith(v):
-            return uri.replace(v, f"{k}:")
-    return uri
+    return _contract(uri, *_get_prefix_index(tuple(config.prefix_map.items())))
 
 
 def expand_curie(curie: str, config: EndpointConfig) -> URIRef:
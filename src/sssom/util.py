@@ -6,18 +6,21 @@ import os
 import re
 from collections import defaultdict
 from dataclasses import dataclass, field
-from functools import reduce
+from functools import lru_cache
 from io import StringIO
 from pathlib import Path
 from string import punctuation
 from typing import (
     Any,
+    Callable,
     ChainMap,
     DefaultDict,
     Dict,
+    Iterable,
     List,
     Mapping,
     Optional,
+    Sequence,
     Set,
     TextIO,
     Tuple,
@@ -60,7 +63,6 @@ from .constants import (
     PREDICATE_MODIFIER_NOT,
     PREFIX_MAP_MODES,
     RDFS_SUBCLASS_OF,
-    SCHEMA_YAML,
     SEMAPV,
     SKOS_BROAD_MATCH,
     SKOS_CLOSE_MATCH,
@@ -99,6 +101,9 @@ SSSOM_EXPORT_FORMATS = ["tsv", "rdf", "owl", "json", "fhir", "ontoportal_json"]
 
 SSSOM_DEFAULT_RDF_SERIALISATION = "turtle"
 
+#: File extensions of compressed inputs, which are decompressed transparently on read
+COMPRESSION_EXTENSIONS = {"gz", "bz2", "xz", "zst"}
+
 URI_SSSOM_MAPPINGS = f"{SSSOM_URI_PREFIX}mappings"
 
 #: The 4 columns whose combination would be used as primary keys while merging/grouping
@@ -114,6 +119,78 @@ class MappingSetDataFrame:
     # maps CURIE prefixes to URI bases
     prefix_map: PrefixMap = field(default_factory=dict)
     metadata: Optional[MetadataType] = None  # header metadata excluding prefixes
+    # the columns of df and their prefix columns, keyed by column name, see
+    # get_prefix_column
+    _prefix_columns: Dict[str, Tuple[pd.Series, pd.Series]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    # the signature of df when it was sorted by sort_df_rows_columns, see sort
+    _canonical: Optional[Tuple[Any, ...]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: Any) -> None:  # noqa:D105
+        if name == "df":
+            self.__dict__["_prefix_columns"] = {}
+            self.__dict__["_canonical"] = None
+        super().__setattr__(name, value)
+
+    def _get_signature(self) -> Tuple[Any, ...]:
+        """Get the data frame, its length, its columns and the objects of its columns.
+
+        Pandas drops its cached column objects whenever the data frame is edited in place,
+        e.g., with ``loc``, ``iloc``, ``at``, by setting a column or by dropping rows, so
+        the signature changes with any such edit.
+        """
+        df = self.df
+        return df, len(df.index), tuple(df.columns), tuple(df[c] for c in df.columns)
+
+    def _is_canonical(self) -> bool:
+        """Check whether the data frame is unchanged since it was sorted, see :meth:`sort`."""
+        if self._canonical is None or self.df is None:
+            return False
+        old, new = self._canonical, self._get_signature()
+        return (
+            old[0] is new[0]
+            and old[1:3] == new[1:3]
+            and all(a is b for a, b in zip(old[3], new[3]))
+        )
+
+    def sort(self) -> None:
+        """Sort the columns and rows of the mappings table canonically.
+
+        Whether the table is sorted is recorded until :attr:`df` is reassigned or edited
+        in place, so sorting it again in the meantime is a no-op.
+        """
+        if self.df is not None and not self._is_canonical():
+            self.df = sort_df_rows_columns(self.df)
+            self._canonical = self._get_signature()
+
+    def get_prefix_column(self, column: str) -> pd.Series:
+        """Get the prefix of the CURIE in each row of a column of the mappings table.
+
+        The prefixes are derived once and cached, so that operations on prefixes compare
+        the integer codes of a categorical instead of splitting strings. They are cached
+        with the column object they were derived from, and derived again when :attr:`df`
+        gives another one: pandas drops its cached column objects whenever the data frame
+        is edited in place, e.g., with ``loc``, ``iloc``, ``at``, by setting a column or by
+        dropping rows, and :attr:`df` being reassigned drops the cache.
+
+        :param column: The name of an entity reference column, e.g., ``subject_id``
+        :return: The result of :func:`get_prefix_column` on the column
+        """
+        values = self.df[column]
+        cached = self._prefix_columns.get(column)
+        if cached is not None and cached[0] is values:
+            return cached[1]
+        prefixes = get_prefix_column(values)
+        self._prefix_columns[column] = values, prefixes
+        return prefixes
+
+    def invalidate_prefix_columns(self) -> None:
+        """Drop the prefix columns cached by :meth:`get_prefix_column`, freeing their memory."""
+        self._prefix_columns.clear()
 
     def merge(self, *msdfs: "MappingSetDataFrame", inplace: bool = True) -> "MappingSetDataFrame":
         """Merge two MappingSetDataframes.
@@ -197,22 +274,11 @@ class MappingSetDataFrame:
         merge_on = KEY_FEATURES.copy()
         if self.df is not None and PREDICATE_MODIFIER not in self.df.columns:
             merge_on.remove(PREDICATE_MODIFIER)
+        other = msdf.df
+        if PREDICATE_MODIFIER in merge_on and PREDICATE_MODIFIER not in other.columns:
+            other = other.assign(**{PREDICATE_MODIFIER: ""})
 
-        self.df = (
-            pd.merge(
-                self.df,
-                msdf.df,
-                on=merge_on,
-                how="outer",
-                suffixes=("", "_2"),
-                indicator=True,
-            )
-            .query("_merge == 'left_only'")
-            .drop("_merge", axis=1)
-            .reset_index(drop=True)
-        )
-
-        self.df = self.df[self.df.columns.drop(list(self.df.filter(regex=r"_2")))]
+        self.df = anti_join(self.df, other, merge_on).reset_index(drop=True)
         self.clean_prefix_map()
 
 
@@ -266,7 +332,11 @@ def parse(filename: str) -> pd.DataFrame:
 
 def collapse(df: pd.DataFrame) -> pd.DataFrame:
     """Collapse rows with same S/P/O and combines confidence."""
-    df2 = df.groupby([SUBJECT_ID, PREDICATE_ID, OBJECT_ID])[CONFIDENCE].apply(max).reset_index()
+    df2 = (
+        df.groupby([SUBJECT_ID, PREDICATE_ID, OBJECT_ID], observed=True)[CONFIDENCE]
+        .apply(max)
+        .reset_index()
+    )
     return df2
 
 
@@ -298,7 +368,7 @@ def filter_redundant_rows(df: pd.DataFrame, ignore_predicate: bool = False) -> p
     else:
         key = [SUBJECT_ID, OBJECT_ID, PREDICATE_ID]
     dfmax: pd.DataFrame
-    dfmax = df.groupby(key, as_index=False)[CONFIDENCE].apply(max).drop_duplicates()
+    dfmax = df.groupby(key, as_index=False, observed=True)[CONFIDENCE].apply(max).drop_duplicates()
     max_conf: Dict[Tuple[str, ...], float] = {}
     for _, row in dfmax.iterrows():
         if ignore_predicate:
@@ -337,7 +407,9 @@ def filter_redundant_rows(df: pd.DataFrame, ignore_predicate: bool = False) -> p
         )
     else:
         tmp_df = confidence_reconciled_df[[SUBJECT_ID, OBJECT_ID, PREDICATE_ID, CONFIDENCE]]
-    tmp_df_grp = tmp_df.groupby([SUBJECT_ID, OBJECT_ID, CONFIDENCE], as_index=False).count()
+    tmp_df_grp = tmp_df.groupby(
+        [SUBJECT_ID, OBJECT_ID, CONFIDENCE], as_index=False, observed=True
+    ).count()
     tmp_df_grp = tmp_df_grp[tmp_df_grp[PREDICATE_ID] > 1].drop(PREDICATE_ID, axis=1)
     non_predicate_reconciled_df = (
         confidence_reconciled_df.merge(
@@ -533,10 +605,30 @@ def dataframe_to_ptable(
     :param df: Pandas DataFrame
     :param inverse_factor: Multiplier to (1 - confidence), defaults to 0.5
     :param default_confidence: Default confidence to be assigned if absent.
-    :raises ValueError: Predicate value error
-    :raises ValueError: Predicate type value error
     :return: List of rows
     """
+    ptable = get_ptable_dataframe(
+        df, inverse_factor=inverse_factor, default_confidence=default_confidence
+    )
+    return ptable.astype(str).values.tolist()
+
+
+def get_ptable_dataframe(
+    df: pd.DataFrame, *, inverse_factor: float = None, default_confidence: float = None
+) -> pd.DataFrame:
+    """Get a KBOOM table as a data frame.
+
+    The predicate of each mapping is looked up in :data:`PTABLE_PREDICATE_TYPES`, and its
+    four probabilities are picked from the confidence, the confidence of the inverse and
+    the residual confidence according to :data:`PTABLE_PROBABILITY_LAYOUTS`.
+
+    :param df: Pandas DataFrame
+    :param inverse_factor: Multiplier to (1 - confidence), defaults to 0.5
+    :param default_confidence: Default confidence to be assigned if absent.
+    :raises ValueError: If any predicate is not handled, listing all of them
+    :return: A data frame with the subject, the object and the four probabilities of
+        each collapsed mapping
+    """
     if not inverse_factor:
         inverse_factor = 0.5
 
@@ -544,92 +636,24 @@ def dataframe_to_ptable(
         df = add_default_confidence(df, default_confidence)
 
     df = collapse(df)
-    rows = []
-    for _, row in df.iterrows():
-        subject_id = row[SUBJECT_ID]
-        object_id = row[OBJECT_ID]
-        confidence = row[CONFIDENCE]
-        # confidence of inverse
-        # e.g. if Pr(super) = 0.2, then Pr(sub) = (1-0.2) * IF
-        inverse_confidence = (1.0 - confidence) * inverse_factor
-        residual_confidence = (1 - (confidence + inverse_confidence)) / 2.0
-
-        predicate = row[PREDICATE_ID]
-        if predicate == OWL_EQUIVALENT_CLASS:
-            predicate_type = PREDICATE_EQUIVALENT
-        elif predicate == SKOS_EXACT_MATCH:
-            predicate_type = PREDICATE_EQUIVALENT
-        elif predicate == SKOS_CLOSE_MATCH:
-            # TODO: consider distributing
-            predicate_type = PREDICATE_EQUIVALENT
-        elif predicate == RDFS_SUBCLASS_OF:
-            predicate_type = PREDICATE_SUBCLASS
-        elif predicate == SKOS_BROAD_MATCH:
-            predicate_type = PREDICATE_SUBCLASS
-        elif predicate == SSSOM_SUPERCLASS_OF:
-            predicate_type = PREDICATE_SUPERCLASS
-        elif predicate == SKOS_NARROW_MATCH:
-            predicate_type = PREDICATE_SUPERCLASS
-        elif predicate == OWL_DIFFERENT_FROM:
-            predicate_type = PREDICATE_SIBLING
-        # * Added by H2 ############################
-        elif predicate == OBO_HAS_DB_XREF:
-            predicate_type = PREDICATE_HAS_DBXREF
-        elif predicate == SKOS_RELATED_MATCH:
-            predicate_type = PREDICATE_RELATED_MATCH
-        # * ########################################
-        else:
-            raise ValueError(f"Unhandled predicate: {predicate}")
-
-        if predicate_type == PREDICATE_SUBCLASS:
-            ps = (
-                confidence,
-                inverse_confidence,
-                residual_confidence,
-                residual_confidence,
-            )
-        elif predicate_type == PREDICATE_SUPERCLASS:
-            ps = (
-                inverse_confidence,
-                confidence,
-                residual_confidence,
-                residual_confidence,
-            )
-        elif predicate_type == PREDICATE_EQUIVALENT:
-            ps = (
-                residual_confidence,
-                residual_confidence,
-                confidence,
-                inverse_confidence,
-            )
-        elif predicate_type == PREDICATE_SIBLING:
-            ps = (
-                residual_confidence,
-                residual_confidence,
-                inverse_confidence,
-                confidence,
-            )
-        # * Added by H2 ############################
-        elif predicate_type == PREDICATE_HAS_DBXREF:
-            ps = (
-                residual_confidence,
-                residual_confidence,
-                confidence,
-                inverse_confidence,
-            )
-        elif predicate_type == PREDICATE_RELATED_MATCH:
-            ps = (
-                residual_confidence,
-                residual_confidence,
-                confidence,
-                inverse_confidence,
-            )
-        # * #########################################
-        else:
-            raise ValueError(f"predicate: {predicate_type}")
-        row = [subject_id, object_id] + [str(p) for p in ps]
-        rows.append(row)
-    return rows
+    predicate_types = df[PREDICATE_ID].map(PTABLE_PREDICATE_TYPES)
+    unhandled = df.loc[predicate_types.isna(), PREDICATE_ID].astype(object).value_counts()
+    if len(unhandled):
+        raise ValueError(f"Unhandled predicates: {unhandled.to_dict()}")
+
+    confidence = df[CONFIDENCE].to_numpy(dtype=float)
+    # confidence of inverse
+    # e.g. if Pr(super) = 0.2, then Pr(sub) = (1-0.2) * IF
+    inverse_confidence = (1.0 - confidence) * float(inverse_factor)
+    residual_confidence = (1 - (confidence + inverse_confidence)) / 2.0
+    confidences = np.column_stack([confidence, inverse_confidence, residual_confidence])
+    layouts = PTABLE_PROBABILITY_LAYOUTS[predicate_types.to_numpy(dtype=int)]
+    probabilities = np.take_along_axis(confidences, layouts, axis=1)
+
+    ptable = pd.DataFrame(probabilities, columns=PTABLE_PROBABILITY_COLUMNS)
+    ptable.insert(0, OBJECT_ID, df[OBJECT_ID].to_numpy())
+    ptable.insert(0, SUBJECT_ID, df[SUBJECT_ID].to_numpy())
+    return ptable
 
 
 PREDICATE_SUBCLASS = 0
@@ -641,6 +665,39 @@ PREDICATE_HAS_DBXREF = 4
 PREDICATE_RELATED_MATCH = 5
 # * ########################################
 
+#: The predicate type of each predicate handled in KBOOM tables
+PTABLE_PREDICATE_TYPES = {
+    OWL_EQUIVALENT_CLASS: PREDICATE_EQUIVALENT,
+    SKOS_EXACT_MATCH: PREDICATE_EQUIVALENT,
+    # TODO: consider distributing
+    SKOS_CLOSE_MATCH: PREDICATE_EQUIVALENT,
+    RDFS_SUBCLASS_OF: PREDICATE_SUBCLASS,
+    SKOS_BROAD_MATCH: PREDICATE_SUBCLASS,
+    SSSOM_SUPERCLASS_OF: PREDICATE_SUPERCLASS,
+    SKOS_NARROW_MATCH: PREDICATE_SUPERCLASS,
+    OWL_DIFFERENT_FROM: PREDICATE_SIBLING,
+    # * Added by H2 ############################
+    OBO_HAS_DB_XREF: PREDICATE_HAS_DBXREF,
+    SKOS_RELATED_MATCH: PREDICATE_RELATED_MATCH,
+    # * ########################################
+}
+
+#: The probabilities of the subclass, superclass, equivalent and sibling relations
+PTABLE_PROBABILITY_COLUMNS = ["subclass", "superclass", "equivalent", "sibling"]
+
+#: For each predicate type, which of the confidence (0), the confidence of the inverse (1)
+#: and the residual confidence (2) gives each of the probabilities
+PTABLE_PROBABILITY_LAYOUTS = np.array(
+    [
+        [0, 1, 2, 2],  # PREDICATE_SUBCLASS
+        [1, 0, 2, 2],  # PREDICATE_SUPERCLASS
+        [2, 2, 0, 1],  # PREDICATE_EQUIVALENT
+        [2, 2, 1, 0],  # PREDICATE_SIBLING
+        [2, 2, 0, 1],  # PREDICATE_HAS_DBXREF
+        [2, 2, 0, 1],  # PREDICATE_RELATED_MATCH
+    ]
+)
+
 RDF_FORMATS = {"ttl", "turtle", "nt", "xml"}
 
 
@@ -675,19 +732,38 @@ def merge_msdf(
     """
     merged_msdf = MappingSetDataFrame()
 
-    # Inject metadata of msdf into df
-    msdf_with_meta = [inject_metadata_into_df(msdf) for msdf in msdfs]
+    # Inject metadata of msdf into df, as single-category columns of shallow copies so
+    # that the inputs are left untouched
+    msdf_with_meta = [
+        inject_metadata_into_df(
+            MappingSetDataFrame(
+                df=None if msdf.df is None else msdf.df.copy(deep=False),
+                prefix_map=msdf.prefix_map,
+                metadata=msdf.metadata,
+            ),
+            categorical=True,
+        )
+        for msdf in msdfs
+    ]
+    injected = {
+        column
+        for msdf in msdfs
+        if msdf.metadata is not None and msdf.df is not None
+        for column in get_metadata_columns(msdf.metadata, msdf.df.columns)
+    }
 
-    # merge df [# 'outer' join in pandas == FULL JOIN in SQL]
-    # df_merged = reduce(
-    #     lambda left, right: left.merge(right, how="outer", on=list(left.columns)),
-    #     [msdf.df for msdf in msdf_with_meta if msdf.df is not None],
-    # )
-    # Concat is an alternative to merge when columns are not the same.
-    df_merged = reduce(
-        lambda left, right: pd.concat([left, right], axis=0, ignore_index=True),
-        [msdf.df for msdf in msdf_with_meta if msdf.df is not None],
-    ).drop_duplicates(ignore_index=True)
+    # A single concat over the union of all columns, instead of folding the
+    # inputs pairwise which copies the accumulated frame once per input.
+    dfs = [msdf.df for msdf in msdf_with_meta if msdf.df is not None]
+    columns = list(dict.fromkeys(column for df in dfs for column in df.columns))
+    df_merged = drop_duplicate_rows(
+        pd.concat(
+            _unify_categories(dfs), axis=0, join="outer", ignore_index=True, copy=False
+        ).reindex(columns=columns)
+    )
+    # callers read the metadata columns as plain strings
+    for column in injected:
+        df_merged[column] = df_merged[column].astype(object)
 
     # merge the non DataFrame elements
     prefix_map_list = [msdf.prefix_map for msdf in msdf_with_meta]
@@ -706,6 +782,99 @@ def merge_msdf(
     return merged_msdf
 
 
+def _unify_categories(dfs: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    """Give the same categories to the categorical columns of data frames to be concatenated.
+
+    Otherwise, :func:`pandas.concat` turns columns with different categories into object
+    columns. A column is only unified if it is categorical in all the data frames that
+    have it, and it is added as missing values to the others.
+
+    :param dfs: Data frames to be concatenated
+    :return: Shallow copies of the data frames, with unified categorical columns
+    """
+    dtypes: Dict[str, List[pd.CategoricalDtype]] = defaultdict(list)
+    for df in dfs:
+        for column, dtype in df.dtypes.items():
+            dtypes[column].append(dtype)
+    dfs = [df.copy(deep=False) for df in dfs]
+    for column, column_dtypes in dtypes.items():
+        if not all(isinstance(dtype, pd.CategoricalDtype) for dtype in column_dtypes):
+            continue
+        if len(column_dtypes) == len(dfs) and all(d == column_dtypes[0] for d in column_dtypes):
+            continue
+        categories = pd.Index([]).append([dtype.categories for dtype in column_dtypes])
+        # sorted, so that the rows sort as they would with the values themselves
+        dtype = pd.CategoricalDtype(categories.unique().sort_values())
+        for df in dfs:
+            if column in df.columns:
+                df[column] = df[column].cat.set_categories(dtype.categories)
+            else:
+                df[column] = pd.Categorical.from_codes(np.full(len(df), -1), dtype=dtype)
+    return dfs
+
+
+def drop_duplicate_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Drop duplicate rows, keeping the first occurrence, using row hashes.
+
+    Every row is hashed once; only rows whose hash is shared with another row are
+    compared value by value, so the result is the same as
+    :meth:`pandas.DataFrame.drop_duplicates`.
+
+    :param df: A DataFrame
+    :return: The DataFrame without duplicate rows, with a fresh index
+    """
+    if len(df.index) < 2:
+        return df.reset_index(drop=True)
+    hashes = pd.util.hash_pandas_object(df, index=False)
+    candidates = hashes.duplicated(keep=False).to_numpy()
+    if not candidates.any():
+        return df.reset_index(drop=True)
+    keep = ~candidates
+    keep[candidates] = ~df[candidates].duplicated().to_numpy()
+    return df[keep].reset_index(drop=True)
+
+
+def anti_join(df: pd.DataFrame, other: pd.DataFrame, on: List[str]) -> pd.DataFrame:
+    """Get the rows of a data frame whose key does not appear in another data frame.
+
+    Only the key columns of the other data frame are used, so its other columns are never
+    copied.
+
+    :param df: A DataFrame
+    :param other: The DataFrame whose keys are removed
+    :param on: The key columns, present in both data frames
+    :return: The rows of ``df`` whose key is not a key of ``other``, in order
+    """
+    keys = other[on].drop_duplicates()
+    return _anti_join(df, keys, _hash_rows(keys))
+
+
+def _anti_join(df: pd.DataFrame, keys: pd.DataFrame, key_hashes: np.ndarray) -> pd.DataFrame:
+    """Get the rows of a data frame whose key is not one of the given unique keys.
+
+    The keys of the rows are hashed, and only the rows whose hash is the hash of a key
+    are compared value by value.
+
+    :param df: A DataFrame
+    :param keys: The unique keys to remove, one column per key column
+    :param key_hashes: The hashes of the keys, as given by :func:`_hash_rows`
+    :return: The rows of ``df`` whose key is not in ``keys``, in order
+    """
+    on = list(keys.columns)
+    candidates = np.isin(_hash_rows(df[on]), key_hashes)
+    if not candidates.any():
+        return df
+    matched = df.loc[candidates, on].merge(keys, on=on, how="left", indicator=True)["_merge"]
+    keep = ~candidates
+    keep[candidates] = (matched != "both").to_numpy()
+    return df[keep]
+
+
+def _hash_rows(df: pd.DataFrame) -> np.ndarray:
+    """Hash the rows of a data frame, regardless of its index."""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
 def deal_with_negation(df: pd.DataFrame) -> pd.DataFrame:
     """Combine negative and positive rows with matching [SUBJECT_ID, OBJECT_ID, CONFIDENCE] combination.
 
@@ -771,9 +940,9 @@ def deal_with_negation(df: pd.DataFrame) -> pd.DataFrame:
 
     # GroupBy and SELECT ONLY maximum confidence
     max_confidence_df: pd.DataFrame
-    max_confidence_df = combined_normalized_subset.groupby(TRIPLES_IDS, as_index=False)[
-        CONFIDENCE
-    ].max()
+    max_confidence_df = combined_normalized_subset.groupby(
+        TRIPLES_IDS, as_index=False, observed=True
+    )[CONFIDENCE].max()
 
     # If same confidence prefer "HumanCurated".
     reconciled_df_subset = pd.DataFrame(columns=combined_normalized_subset.columns)
@@ -856,28 +1025,90 @@ def deal_with_negation(df: pd.DataFrame) -> pd.DataFrame:
     return return_df
 
 
-def inject_metadata_into_df(msdf: MappingSetDataFrame) -> MappingSetDataFrame:
+#: Slots with a small set of values that are stored as categoricals
+CATEGORICAL_TYPE_SLOTS = [
+    "subject_category",
+    "object_category",
+    "predicate_type",
+    "predicate_modifier",
+    "mapping_cardinality",
+]
+
+
+def inject_metadata_into_df(
+    msdf: MappingSetDataFrame, categorical: bool = False
+) -> MappingSetDataFrame:
     """Inject metadata dictionary key-value pair into DataFrame columns in a MappingSetDataFrame.DataFrame.
 
     :param msdf: MappingSetDataFrame with metadata separate.
+    :param categorical: If True, each metadata column is a categorical with a single
+        category, holding one byte per mapping instead of a reference to the value
 
     :return: MappingSetDataFrame with metadata as columns
     """
-    # TODO Check if 'k' is a valid 'slot' for 'mapping' [sssom.yaml]
-    with open(SCHEMA_YAML) as file:
-        schema = yaml.safe_load(file)
-    slots = schema["classes"]["mapping"]["slots"]
     if msdf.metadata is not None and msdf.df is not None:
-        for k, v in msdf.metadata.items():
-            if k not in msdf.df.columns and k in slots:
-                if k == MAPPING_SET_ID:
-                    k = MAPPING_SET_SOURCE
-                if isinstance(v, list):
-                    v = "|".join(x for x in v)
-                msdf.df[k] = str(v)
+        codes = np.zeros(len(msdf.df), dtype=np.int8)
+        for k, v in get_metadata_columns(msdf.metadata, msdf.df.columns).items():
+            msdf.df[k] = pd.Categorical.from_codes(codes, categories=[v]) if categorical else v
+            # the new columns are appended, after the canonical ones
+            msdf._canonical = None
     return msdf
 
 
+def get_metadata_columns(metadata: MetadataType, columns: Iterable[str]) -> Dict[str, str]:
+    """Get the mapping set metadata that applies to every mapping, keyed by column name.
+
+    :param metadata: Mapping set metadata
+    :param columns: The columns already present in the mappings table
+    :return: A dictionary of column names to the serialised metadata value, for each
+        mapping slot in the metadata that is not already a column
+    """
+    # TODO Check if 'k' is a valid 'slot' for 'mapping' [sssom.yaml]
+    slots = set(_get_sssom_schema_object().mapping_slots)
+    columns = set(columns)
+    rv = {}
+    for k, v in metadata.items():
+        if k not in columns and k in slots:
+            if k == MAPPING_SET_ID:
+                k = MAPPING_SET_SOURCE
+            if isinstance(v, list):
+                v = "|".join(x for x in v)
+            rv[k] = str(v)
+    return rv
+
+
+def categorize_columns(df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Store the repetitive string columns of a mappings table as pandas categoricals.
+
+    Entity references such as ``subject_id`` or ``mapping_justification`` and the
+    metadata columns added by :func:`inject_metadata_into_df` take few distinct values,
+    so each one is stored once and rows only hold a small integer code.
+
+    :param df: A mappings data frame
+    :param columns: The columns to convert, defaults to :func:`get_categorical_columns`
+    :return: A data frame with the string columns among ``columns`` as categoricals
+    """
+    if columns is None:
+        columns = get_categorical_columns(df.columns)
+    return df.astype({column: "category" for column in columns if df[column].dtype == object})
+
+
+def get_categorical_columns(columns: Iterable[str]) -> List[str]:
+    """Get the columns of a mappings table that are stored as categoricals.
+
+    :param columns: The columns of a mappings table
+    :return: The entity reference columns, the mapping set slots that also apply to
+        each mapping and the enumerated type columns, in the order of ``columns``
+    """
+    schema = _get_sssom_schema_object()
+    categorical = {
+        *schema.entity_reference_slots,
+        *set(schema.mapping_set_slots).intersection(schema.mapping_slots),
+        *CATEGORICAL_TYPE_SLOTS,
+    }
+    return [column for column in columns if column in categorical]
+
+
 def get_file_extension(file: Union[str, Path, TextIO]) -> str:
     """Get file extension.
 
@@ -885,6 +1116,9 @@ def get_file_extension(file: Union[str, Path, TextIO]) -> str:
     :return: format of the file passed, default tsv
     """
     if isinstance(file, Path):
+        suffixes = [suffix.strip(punctuation) for suffix in file.suffixes]
+        if len(suffixes) > 1 and suffixes[-1] in COMPRESSION_EXTENSIONS:
+            return suffixes[-2]
         if file.suffix:
             return file.suffix.strip(punctuation)
         else:
@@ -894,6 +1128,9 @@ def get_file_extension(file: Union[str, Path, TextIO]) -> str:
     elif isinstance(file, str):
         filename = file
         parts = filename.split(".")
+        if len(parts) > 2 and parts[-1] in COMPRESSION_EXTENSIONS:
+            # e.g. my.sssom.tsv.gz
+            parts = parts[:-1]
         if len(parts) > 0:
             f_format = parts[-1]
             return f_format.strip(punctuation)
@@ -999,37 +1236,46 @@ def extract_global_metadata(msdoc: MappingSetDocument) -> Dict[str, PrefixMap]:
 
 
 # to_mapping_set_document is in parser.py in order to avoid circular import errors
-def to_mapping_set_dataframe(doc: MappingSetDocument) -> MappingSetDataFrame:
+def to_mapping_set_dataframe(doc: MappingSetDocument, sort: bool = True) -> MappingSetDataFrame:
     """Convert MappingSetDocument into MappingSetDataFrame.
 
     :param doc: MappingSetDocument object
+    :param sort: If True (default), the mappings table is sorted canonically
     :return: MappingSetDataFrame object
     """
-    data = []
-    slots_with_double_as_range = [
-        s
-        for s in _get_sssom_schema_object().dict["slots"].keys()
-        if _get_sssom_schema_object().dict["slots"][s]["range"] == "double"
-    ]
-    if doc.mapping_set.mappings is not None:
-        for mapping in doc.mapping_set.mappings:
-            m = get_dict_from_mapping(mapping)
-            data.append(m)
-    df = pd.DataFrame(data=data)
+    df = get_dataframe_from_mappings(doc.mapping_set.mappings or [])
     meta = extract_global_metadata(doc)
     meta.pop(PREFIX_MAP_KEY, None)
-    # The following 3 lines are to remove columns
-    # where all values are blank.
-    df.replace("", np.nan, inplace=True)
-    df.dropna(axis=1, how="all", inplace=True)  # remove columns with all row = 'None'-s.
-    non_double_cols = df.loc[:, ~df.columns.isin(slots_with_double_as_range)]
-    non_double_cols = non_double_cols.replace(np.nan, "")
-    df[non_double_cols.columns] = non_double_cols
     msdf = MappingSetDataFrame(df=df, prefix_map=doc.prefix_map, metadata=meta)
-    msdf.df = sort_df_rows_columns(msdf.df)
+    if sort:
+        msdf.sort()
     return msdf
 
 
+def get_dataframe_from_mappings(mappings: Sequence[SSSOM_Mapping]) -> pd.DataFrame:
+    """Get the mappings table of mapping objects, converting them column by column.
+
+    Each value is converted as in :func:`get_dict_from_mapping`, with the converter of its
+    slot looked up once per column. Columns without any value are left out.
+
+    :param mappings: Mapping objects
+    :return: A data frame with a column per slot used by the mappings
+    """
+    properties = dict.fromkeys(property for mapping in mappings for property in mapping)
+    converters = _get_slot_converters()
+    columns = {}
+    for property in properties:
+        convert, missing = converters.get(property, _DEFAULT_SLOT_CONVERTER)
+        values = [
+            missing if value is None else convert(value)
+            for value in (getattr(mapping, property, None) for mapping in mappings)
+        ]
+        # NaN is the only value not equal to itself
+        if any(value == value and value != "" for value in values):
+            columns[property] = values
+    return pd.DataFrame(columns)
+
+
 def get_dict_from_mapping(map_obj: Union[Any, Dict[Any, Any], SSSOM_Mapping]) -> dict:
     """
     Get information for linkml objects (MatchTypeEnum, PredicateModifierEnum) from the Mapping object and return the dictionary form of the object.
@@ -1038,55 +1284,52 @@ def get_dict_from_mapping(map_obj: Union[Any, Dict[Any, Any], SSSOM_Mapping]) ->
     :return: Dictionary
     """
     map_dict = {}
-    slots_with_double_as_range = [
-        s
-        for s in _get_sssom_schema_object().dict["slots"].keys()
-        if _get_sssom_schema_object().dict["slots"][s]["range"] == "double"
-    ]
+    converters = _get_slot_converters()
     for property in map_obj:
-        if map_obj[property] is not None:
-            if isinstance(map_obj[property], list):
-                # IF object is an enum
-                if (
-                    _get_sssom_schema_object().dict["slots"][property]["range"]
-                    in _get_sssom_schema_object().dict["enums"].keys()
-                ):
-                    # IF object is a multivalued enum
-                    if _get_sssom_schema_object().dict["slots"][property]["multivalued"]:
-                        map_dict[property] = "|".join(
-                            enum_value.code.text for enum_value in map_obj[property]
-                        )
-                    # If object is NOT multivalued BUT an enum.
-                    else:
-                        map_dict[property] = map_obj[property].code.text
-                # IF object is NOT an enum but a list
-                else:
-                    map_dict[property] = "|".join(enum_value for enum_value in map_obj[property])
-            # IF object NOT a list
-            else:
-                # IF object is an enum
-                if (
-                    _get_sssom_schema_object().dict["slots"][property]["range"]
-                    in _get_sssom_schema_object().dict["enums"].keys()
-                ):
-                    map_dict[property] = map_obj[property].code.text
-                else:
-                    map_dict[property] = map_obj[property]
-        else:
-            # IF map_obj[property] is None:
-            if property in slots_with_double_as_range:
-                map_dict[property] = np.nan
-            else:
-                map_dict[property] = ""
-
+        value = map_obj[property]
+        convert, missing = converters.get(property, _DEFAULT_SLOT_CONVERTER)
+        map_dict[property] = missing if value is None else convert(value)
     return map_dict
 
 
+def _convert_value(value: Any) -> Any:
+    """Join the elements of a multivalued slot with pipes."""
+    return "|".join(value) if isinstance(value, list) else value
+
+
+def _convert_enum_value(value: Any) -> str:
+    """Get the code of an enum value, joining multiple ones with pipes."""
+    if isinstance(value, list):
+        return "|".join(enum_value.code.text for enum_value in value)
+    return value.code.text
+
+
+#: How the value of a slot outside of the schema is converted, and its missing value
+_DEFAULT_SLOT_CONVERTER: Tuple[Callable[[Any], Any], Any] = (_convert_value, "")
+
+
+@lru_cache(maxsize=1)
+def _get_slot_converters() -> Dict[str, Tuple[Callable[[Any], Any], Any]]:
+    """Get how the value of each slot is converted to a table cell, and its missing value.
+
+    Enums are converted to their code, lists are joined with pipes, and missing values
+    are NaN for slots of range double and empty strings otherwise.
+    """
+    schema = _get_sssom_schema_object().dict
+    converters = {}
+    for slot, definition in schema["slots"].items():
+        convert = _convert_enum_value if definition["range"] in schema["enums"] else _convert_value
+        converters[slot] = convert, np.nan if definition["range"] == "double" else ""
+    return converters
+
+
 class NoCURIEException(ValueError):
     """An exception raised when a CURIE can not be parsed with a given prefix map."""
 
 
 CURIE_RE = re.compile(r"[A-Za-z0-9_.]+[:][A-Za-z0-9_]")
+#: Captures the prefix of the CURIEs matched by :data:`CURIE_RE`
+CURIE_PREFIX_PATTERN = r"^([A-Za-z0-9_.]+):[A-Za-z0-9_]"
 
 
 def is_curie(string: str) -> bool:
@@ -1143,6 +1386,23 @@ def curie_from_uri(uri: str, prefix_map: Mapping[str, str]) -> str:
     raise NoCURIEException(f"{uri} does not follow any known prefixes")
 
 
+def get_prefix_column(column: pd.Series) -> pd.Series:
+    """Get the prefix of the CURIE in each row of a column, splitting each distinct value once.
+
+    :param column: A column of entity references
+    :return: A categorical with the text before the first colon of each value, missing
+        for the missing values and those without a colon, and sorted categories
+    """
+    codes, uniques = pd.factorize(column)
+    if len(uniques) == 0:
+        prefixes = pd.Categorical.from_codes(codes, categories=pd.Index([], dtype=object))
+        return pd.Series(prefixes, index=column.index, name=column.name)
+    parts = pd.Series(np.asarray(uniques), dtype=object).astype(str).str.partition(":")
+    prefix_codes, categories = pd.factorize(parts[0].where(parts[1] == ":"), sort=True)
+    prefixes = pd.Categorical.from_codes(np.append(prefix_codes, -1)[codes], categories=categories)
+    return pd.Series(prefixes, index=column.index, name=column.name)
+
+
 def get_prefixes_used_in_table(df: pd.DataFrame) -> List[str]:
     """Get a list of prefixes used in CURIEs in key feature columns in a dataframe."""
     prefixes = list(SSSOM_BUILT_IN_PREFIXES)
@@ -1183,18 +1443,17 @@ def filter_out_prefixes(
     :param filter_prefixes: List of prefixes
     :param features: List of dataframe column names dataframe to consider
     :param require_all_prefixes: If True, all prefixes must be present in a row to be filtered out
-    :return: Pandas Dataframe
+    :return: The rows of the Pandas Dataframe that are kept, with its columns and dtypes
     """
     filter_prefix_set = set(filter_prefixes)
-    rows = []
-    selection = all if require_all_prefixes else any
-
-    for _, row in df.iterrows():
-        prefixes = {get_prefix_from_curie(curie) for curie in row[features]}
-        if not selection(prefix in prefixes for prefix in filter_prefix_set):
-            rows.append(row)
-
-    return pd.DataFrame(rows) if rows else pd.DataFrame(columns=features)
+    feature_prefixes = [_get_curie_prefixes(df[feature]) for feature in features]
+    if require_all_prefixes:
+        remove = np.ones(len(df), dtype=bool)
+        for prefix in filter_prefix_set:
+            remove &= _any_prefix_in(feature_prefixes, {prefix}, len(df))
+    else:
+        remove = _any_prefix_in(feature_prefixes, filter_prefix_set, len(df))
+    return df[~remove]
 
 
 def filter_prefixes(
@@ -1209,18 +1468,44 @@ def filter_prefixes(
     :param filter_prefixes: List of prefixes
     :param features: List of dataframe column names dataframe to consider
     :param require_all_prefixes: If True, all prefixes must be present in a row to be filtered out
-    :return: Pandas Dataframe
+    :return: The rows of the Pandas Dataframe that are kept, with its columns and dtypes
     """
     filter_prefix_set = set(filter_prefixes)
-    rows = []
-    selection = all if require_all_prefixes else any
+    feature_prefixes = [_get_curie_prefixes(df[feature]) for feature in features]
+    if not require_all_prefixes:
+        return df[_any_prefix_in(feature_prefixes, filter_prefix_set, len(df))]
+    keep = np.ones(len(df), dtype=bool)
+    for codes, prefixes in feature_prefixes:
+        # missing values have no prefix, so they do not prevent keeping the row
+        keep &= np.append(prefixes.isin(filter_prefix_set).to_numpy(), True)[codes]
+    return df[keep]
+
+
+def _get_curie_prefixes(column: pd.Series) -> Tuple[np.ndarray, pd.Series]:
+    """Get the prefixes of a column as given by :func:`get_prefix_from_curie`.
+
+    :param column: A column of entity references
+    :return: The code of the distinct value of each cell, -1 for missing values, and the
+        prefix of each distinct value, an empty string when it is not a CURIE
+    """
+    codes, prefixes = _factorize_prefixes(column)
+    return codes, pd.Series(prefixes, dtype=object).fillna("")
 
-    for _, row in df.iterrows():
-        prefixes = {get_prefix_from_curie(curie) for curie in row[features] if curie is not None}
-        if selection(prefix in filter_prefix_set for prefix in prefixes):
-            rows.append(row)
 
-    return pd.DataFrame(rows) if rows else pd.DataFrame(columns=features)
+def _any_prefix_in(
+    feature_prefixes: List[Tuple[np.ndarray, pd.Series]], prefixes: Set[str], size: int
+) -> np.ndarray:
+    """Get the rows with a value of any of the features having one of the given prefixes.
+
+    :param feature_prefixes: The result of :func:`_get_curie_prefixes` for each feature
+    :param prefixes: The prefixes to look for
+    :param size: The number of rows
+    :return: A boolean mask of the rows
+    """
+    rv = np.zeros(size, dtype=bool)
+    for codes, feature_prefix in feature_prefixes:
+        rv |= np.append(feature_prefix.isin(prefixes).to_numpy(), False)[codes]
+    return rv
 
 
 @deprecation.deprecated(details="This is no longer used and will be removed from the public API.")
@@ -1368,12 +1653,7 @@ def reconcile_prefix_and_data(
 
     # Data editing
     if len(data_switch_dict) > 0:
-        # Read schema file
-        slots = _get_sssom_schema_object().dict["slots"]
-        entity_reference_columns = [k for k, v in slots.items() if v["range"] == "EntityReference"]
-        update_columns = [c for c in df.columns if c in entity_reference_columns]
-        for k, v in data_switch_dict.items():
-            df[update_columns] = df[update_columns].replace(k + ":", v + ":", regex=True)
+        df = replace_prefixes(df, data_switch_dict)
 
     msdf.df = df
     msdf.prefix_map = prefix_map
@@ -1382,6 +1662,66 @@ def reconcile_prefix_and_data(
     return msdf
 
 
+def replace_prefixes(
+    df: pd.DataFrame, prefix_replacements: Dict[str, str], columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Replace the prefixes of the CURIEs of a data frame.
+
+    Each distinct value of a column is split once into its prefix and local identifier,
+    so the cost does not depend on the number of replacements. Only the prefix before
+    the first colon of a CURIE is replaced, and the values of multivalued columns are
+    split on ``|`` into their CURIEs first.
+
+    :param df: A mapping data frame
+    :param prefix_replacements: The new prefix of each prefix to replace
+    :param columns: The columns to update, defaults to the entity reference columns
+    :return: A data frame with the replaced prefixes
+    """
+    schema = _get_sssom_schema_object()
+    if columns is None:
+        columns = list(df.columns.intersection(schema.entity_reference_slots))
+    multivalued = set(schema.multivalued_slots)
+    df = df.copy(deep=False)
+    for column in columns:
+        codes, uniques = pd.factorize(df[column])
+        if len(uniques) == 0:
+            continue
+        values = pd.Series(np.asarray(uniques), dtype=object).astype(str)
+        if column in multivalued:
+            curies = values.str.split("|").explode()
+            replaced = _replace_curie_prefixes(curies, prefix_replacements)
+            if replaced is None:
+                continue
+            # the CURIEs of each value are joined again, in order
+            replaced = pd.Series(replaced, index=curies.index).groupby(level=0).agg("|".join)
+            replaced = replaced.to_numpy(dtype=object)
+        else:
+            replaced = _replace_curie_prefixes(values, prefix_replacements)
+            if replaced is None:
+                continue
+        df[column] = np.where(codes >= 0, replaced.take(codes), df[column].to_numpy(dtype=object))
+    return df
+
+
+def _replace_curie_prefixes(
+    curies: pd.Series, prefix_replacements: Dict[str, str]
+) -> Optional[np.ndarray]:
+    """Replace the prefixes of CURIEs.
+
+    :param curies: CURIEs, as strings
+    :param prefix_replacements: The new prefix of each prefix to replace
+    :return: The CURIEs with the replaced prefixes, or None if no prefix is replaced
+    """
+    parts = curies.str.partition(":")
+    new_prefixes = parts[0].map(prefix_replacements)
+    replace = ((parts[1] == ":") & new_prefixes.notna()).to_numpy()
+    if not replace.any():
+        return None
+    values = curies.to_numpy(dtype=object).copy()
+    values[replace] = (new_prefixes[replace] + ":" + parts[2][replace]).to_numpy()
+    return values
+
+
 def sort_df_rows_columns(
     df: pd.DataFrame, by_columns: bool = True, by_rows: bool = True
 ) -> pd.DataFrame:
@@ -1390,72 +1730,130 @@ def sort_df_rows_columns(
 
     :param df: Pandas DataFrame with random column sequence.
     :param by_columns: Boolean flag to sort columns canonically.
-    :param by_rows: Boolean flag to sort rows by column #1 (ascending order).
+    :param by_rows: Boolean flag to sort rows canonically, see
+        :func:`get_canonical_row_order`.
     :return: Pandas DataFrame columns sorted canonically.
     """
     if by_columns and len(df.columns) > 0:
-        column_sequence = [
-            col for col in _get_sssom_schema_object().dict["slots"].keys() if col in df.columns
-        ]
-        df = df.reindex(column_sequence, axis=1)
+        positions = _get_slot_positions()
+        df = df[[column for column in positions if column in df.columns]]
     if by_rows and len(df) > 0:
-        df = df.sort_values(by=column_sequence, ignore_index=True, na_position="last")
+        df = df.take(get_canonical_row_order(df)).reset_index(drop=True)
     return df
 
 
+def get_canonical_row_order(df: pd.DataFrame) -> np.ndarray:
+    """Get the canonical order of the rows of a mappings table.
+
+    Rows are sorted by the :data:`KEY_FEATURES`, and the rows with the same key by the
+    other columns, in the order of the schema. Missing values come last, and identical
+    rows keep their order. As keys are mostly unique, the other columns are only compared
+    for the few rows that share a key.
+
+    :param df: A mappings data frame
+    :return: The positions of the rows in canonical order
+    """
+    positions = _get_slot_positions()
+    key_columns = [column for column in KEY_FEATURES if column in df.columns]
+    other_columns = sorted(
+        (column for column in df.columns if column not in key_columns),
+        key=lambda column: positions.get(column, len(positions)),
+    )
+    if not key_columns:
+        key_columns, other_columns = other_columns, []
+    key_codes = [_get_sort_codes(df[column]) for column in key_columns]
+    order = np.lexsort(key_codes[::-1])
+    if not other_columns or len(order) < 2:
+        return order
+
+    sorted_codes = np.stack([codes[order] for codes in key_codes])
+    same_key = (sorted_codes[:, 1:] == sorted_codes[:, :-1]).all(axis=0)
+    if not same_key.any():
+        return order
+    tied = np.append(same_key, False) | np.append(False, same_key)
+    groups = np.cumsum(~np.append(False, same_key))[tied]
+    tied_rows = df.iloc[order[tied]]
+    other_codes = [_get_sort_codes(tied_rows[column]) for column in other_columns]
+    order[tied] = order[tied][np.lexsort([*other_codes[::-1], groups])]
+    return order
+
+
+def _get_sort_codes(column: pd.Series) -> np.ndarray:
+    """Get integer codes that sort like the values of a column, with missing values last.
+
+    :param column: A column of a data frame
+    :return: The code of each value
+    """
+    codes, uniques = pd.factorize(column, sort=True)
+    return np.where(codes < 0, len(uniques), codes)
+
+
+@lru_cache(maxsize=1)
+def _get_slot_positions() -> Dict[str, int]:
+    """Get the position of each slot of the schema in the canonical column order."""
+    slots = _get_sssom_schema_object().dict["slots"]
+    return {slot: position for position, slot in enumerate(slots)}
+
+
 def get_all_prefixes(msdf: MappingSetDataFrame) -> list:
     """Fetch all prefixes in the MappingSetDataFrame.
 
     :param msdf: MappingSetDataFrame
-    :raises ValidationError: If slot is wrong.
-    :raises ValidationError: If slot is wrong.
+    :raises ValidationError: If a multivalued metadata slot holds a value that is not a CURIE.
     :return:  List of all prefixes.
     """
-    prefix_list = []
+    prefixes = set()
     if msdf.metadata and not msdf.df.empty:  # type: ignore
-        metadata_keys = list(msdf.metadata.keys())
-        df_columns_list = msdf.df.columns.to_list()  # type: ignore
-        all_keys = metadata_keys + df_columns_list
-        ent_ref_slots = [
-            s for s in all_keys if s in _get_sssom_schema_object().entity_reference_slots
-        ]
-
-        for slot in ent_ref_slots:
-            if slot in metadata_keys:
-                if type(msdf.metadata[slot]) == list:
-                    for s in msdf.metadata[slot]:
-                        if get_prefix_from_curie(s) == "":
-                            # print(
-                            #     f"Slot '{slot}' has an incorrect value: {msdf.metadata[s]}"
-                            # )
-                            raise ValidationError(
-                                f"Slot '{slot}' has an incorrect value: {msdf.metadata[s]}"
-                            )
-                        prefix_list.append(get_prefix_from_curie(s))
-                else:
-                    if get_prefix_from_curie(msdf.metadata[slot]) == "":
-                        # print(
-                        #     f"Slot '{slot}' has an incorrect value: {msdf.metadata[slot]}"
-                        # )
-                        logging.warning(
-                            f"Slot '{slot}' has an incorrect value: {msdf.metadata[slot]}"
-                        )
-                    prefix_list.append(get_prefix_from_curie(msdf.metadata[slot]))
+        ent_ref_slots = set(_get_sssom_schema_object().entity_reference_slots)
+        for slot, value in msdf.metadata.items():
+            if slot not in ent_ref_slots:
+                continue
+            if isinstance(value, list):
+                for v in value:
+                    if not is_curie(v):
+                        raise ValidationError(f"Slot '{slot}' has an incorrect value: {v}")
+                    prefixes.add(get_prefix_from_curie(v))
             else:
-                column_prefixes = list(
-                    set(
-                        [
-                            get_prefix_from_curie(s)
-                            for s in list(set(msdf.df[slot].to_list()))  # type: ignore
-                            if get_prefix_from_curie(s) != ""
-                        ]
-                    )
-                )
-                prefix_list = prefix_list + column_prefixes
+                if not is_curie(value):
+                    logging.warning(f"Slot '{slot}' has an incorrect value: {value}")
+                prefixes.add(get_prefix_from_curie(value))
+        for column in msdf.df.columns.intersection(ent_ref_slots):  # type: ignore
+            _, column_prefixes = _factorize_prefixes(msdf.df[column])  # type: ignore
+            prefixes.update(column_prefixes[pd.notna(column_prefixes)])
+    return list(prefixes)
+
+
+def get_rows_with_missing_prefixes(df: pd.DataFrame, prefixes: Iterable[str]) -> pd.DataFrame:
+    """Get the rows whose entity references use a prefix outside of the given ones.
+
+    :param df: A mapping data frame
+    :param prefixes: The known prefixes, e.g., the keys of a prefix map
+    :return: The rows of the data frame in which a CURIE of an entity reference column has
+        an unknown prefix
+    """
+    known = set(prefixes)
+    missing = np.zeros(len(df), dtype=bool)
+    for column in df.columns.intersection(_get_sssom_schema_object().entity_reference_slots):
+        codes, column_prefixes = _factorize_prefixes(df[column])
+        unknown = np.array([pd.notna(p) and p not in known for p in column_prefixes] + [False])
+        missing |= unknown[codes]
+    return df[missing]
 
-        prefix_list = list(set(prefix_list))
 
-    return prefix_list
+def _factorize_prefixes(column: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the prefixes of the CURIEs in a column, splitting each distinct value once.
+
+    :param column: A column of entity references
+    :return: The code of the distinct value of each cell, -1 for missing values, and the
+        prefix of each distinct value, missing when it is not a CURIE
+    """
+    codes, uniques = pd.factorize(column)
+    prefixes = (
+        pd.Series(np.asarray(uniques), dtype=object)
+        .astype(str)
+        .str.extract(CURIE_PREFIX_PATTERN, expand=False)
+    )
+    return codes, prefixes.to_numpy()
 
 
 def augment_metadata(
@@ -1524,80 +1922,93 @@ def _get_sssom_schema_object() -> SSSOMSchemaView:
 
 
 def invert_mappings(
-    df: pd.DataFrame,
+    df: Union[pd.DataFrame, MappingSetDataFrame],
     subject_prefix: Optional[str] = None,
     merge_inverted: bool = True,
     predicate_invert_dictionary: dict = None,
 ) -> pd.DataFrame:
     """Switching subject and objects based on their prefixes and adjusting predicates accordingly.
 
-    :param df: Pandas dataframe.
+    :param df: Pandas dataframe, or a MappingSetDataFrame, whose cached prefix columns are
+        used, see :meth:`MappingSetDataFrame.get_prefix_column`.
     :param subject_prefix: Prefix of subjects desired.
     :param merge_inverted: If True (default), add inverted dataframe to input else,
                           just return inverted data.
     :param predicate_invert_dictionary: YAML file providing the inverse mapping for predicates.
     :return: Pandas dataframe with all subject IDs having the same prefix.
     """
+    if isinstance(df, MappingSetDataFrame):
+        get_prefixes = df.get_prefix_column
+        df = df.df
+    else:
+        get_prefixes = lambda column: get_prefix_column(df[column])  # noqa:E731
     if predicate_invert_dictionary:
         predicate_invert_map = predicate_invert_dictionary
     else:
         predicate_invert_map = PREDICATE_INVERT_DICTIONARY
-    columns_invert_map = COLUMN_INVERT_DICTIONARY
 
     if PREDICATE_MODIFIER in df.columns:
-        blank_predicate_modifier = df[PREDICATE_MODIFIER] == ""
-        predicate_modified_df = pd.DataFrame(df[~blank_predicate_modifier])
-        non_predicate_modified_df = pd.DataFrame(df[blank_predicate_modifier])
+        unmodified = (df[PREDICATE_MODIFIER] == "").to_numpy()
     else:
-        predicate_modified_df = pd.DataFrame(columns=df.columns)
-        non_predicate_modified_df = df
+        unmodified = np.ones(len(df), dtype=bool)
+    invertible = df[PREDICATE_ID].isin(predicate_invert_map).to_numpy()
 
     if subject_prefix:
-        subject_starts_with_prefix_condition = df[SUBJECT_ID].str.startswith(subject_prefix + ":")
-        object_starts_with_prefix_condition = df[OBJECT_ID].str.startswith(subject_prefix + ":")
-        prefixed_subjects_df = pd.DataFrame(
-            non_predicate_modified_df[
-                (subject_starts_with_prefix_condition & ~object_starts_with_prefix_condition)
-            ]
-        )
-        non_prefix_subjects_df = pd.DataFrame(
-            non_predicate_modified_df[
-                (~subject_starts_with_prefix_condition & object_starts_with_prefix_condition)
-            ]
-        )
-        df_to_invert = non_prefix_subjects_df.loc[
-            non_prefix_subjects_df[PREDICATE_ID].isin(list(predicate_invert_map.keys()))
-        ]
-        non_inverted_df_by_predicate = pd.DataFrame(columns=non_prefix_subjects_df.columns)
+        subject_has_prefix = (get_prefixes(SUBJECT_ID) == subject_prefix).to_numpy()
+        object_has_prefix = (get_prefixes(OBJECT_ID) == subject_prefix).to_numpy()
+        prefixed_subjects = unmodified & subject_has_prefix & ~object_has_prefix
+        to_invert = unmodified & ~subject_has_prefix & object_has_prefix & invertible
     else:
-        prefixed_subjects_df = pd.DataFrame()
-        df_to_invert = non_predicate_modified_df.loc[
-            non_predicate_modified_df[PREDICATE_ID].isin(list(predicate_invert_map.keys()))
-        ]
-        non_inverted_df_by_predicate = non_predicate_modified_df.loc[
-            ~non_predicate_modified_df[PREDICATE_ID].isin(list(predicate_invert_map.keys()))
-        ]
-    list_of_subject_object_columns = [
-        x for x in df_to_invert.columns if x.startswith(("subject", "object"))
-    ]
-    inverted_df = df_to_invert.rename(
-        columns=_invert_column_names(list_of_subject_object_columns, columns_invert_map)
-    )
-    inverted_df = inverted_df[df.columns]
+        to_invert = unmodified & invertible
+
+    inverted_df = _swap_subject_and_object(df[to_invert])
     inverted_df[PREDICATE_ID] = inverted_df[PREDICATE_ID].map(predicate_invert_map)
     inverted_df[MAPPING_JUSTIFICATION] = SEMAPV.MappingInversion.value
-    if not prefixed_subjects_df.empty:
-        return_df = pd.concat([prefixed_subjects_df, inverted_df]).drop_duplicates()
-    else:
-        return_df = pd.concat(
-            [inverted_df, predicate_modified_df, non_inverted_df_by_predicate]
-        ).drop_duplicates()
+
     if merge_inverted:
-        return pd.concat([df, return_df]).drop_duplicates()
-    else:
-        return return_df
+        # All the other rows returned below are rows of the input
+        return drop_duplicate_rows(pd.concat([df, inverted_df]))
+    if subject_prefix:
+        return drop_duplicate_rows(pd.concat([df[prefixed_subjects], inverted_df]))
+    return drop_duplicate_rows(
+        pd.concat([inverted_df, df[~unmodified], df[unmodified & ~invertible]])
+    )
 
 
-def _invert_column_names(column_names: list, columns_invert_map: dict) -> dict:
-    """Return a dictionary for column renames in pandas DataFrame."""
-    return {x: columns_invert_map[x] for x in column_names}
+def _swap_subject_and_object(df: pd.DataFrame) -> pd.DataFrame:
+    """Swap the subject and object columns of a data frame.
+
+    :param df: A mapping data frame
+    :return: A data frame with the same columns, in which each subject column holds the
+        values of the matching object column and conversely. Columns whose counterpart is
+        missing are left empty.
+    """
+    plan = _get_column_swap_plan(tuple(df.columns))
+    return pd.DataFrame(
+        {
+            column: df[source] if source in df.columns else pd.Series(np.nan, index=df.index)
+            for column, source in plan.items()
+        },
+        index=df.index,
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_column_swap_plan(columns: Tuple[str, ...]) -> Dict[str, str]:
+    """Get the column from which each column takes its values when swapping subject and object.
+
+    :param columns: The columns of a mapping data frame
+    :return: A dictionary from each column to its counterpart, or to itself if it is neither
+        a subject nor an object column
+    """
+    plan = {}
+    for column in columns:
+        if column in COLUMN_INVERT_DICTIONARY:
+            plan[column] = COLUMN_INVERT_DICTIONARY[column]
+        elif column.startswith("subject_"):
+            plan[column] = "object_" + column[len("subject_") :]
+        elif column.startswith("object_"):
+            plan[column] = "subject_" + column[len("object_") :]
+        else:
+            plan[column] = column
+    return plan
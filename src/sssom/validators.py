@@ -1,31 +1,47 @@
 """Validators."""
 
 import logging
-from typing import List
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Tuple
 
+import pandas as pd
 from jsonschema import ValidationError
 
 # from linkml.validators.jsonschemavalidator import JsonSchemaDataValidator
 # from linkml.validators.sparqlvalidator import SparqlDataValidator  # noqa: F401
-from linkml_runtime.processing.referencevalidator import ReferenceValidator
-from linkml_runtime.utils.schemaview import SchemaView
-from sssom_schema import MappingSet
-
 from sssom.context import add_built_in_prefixes_to_prefix_map
-from sssom.parsers import to_mapping_set_document
-from sssom.util import MappingSetDataFrame, get_all_prefixes
-
-from .constants import SCHEMA_YAML, SchemaValidationType
-
-
-def validate(msdf: MappingSetDataFrame, validation_types: List[SchemaValidationType]) -> None:
+from sssom.util import (
+    MappingSetDataFrame,
+    _get_sssom_schema_object,
+    get_all_prefixes,
+    get_rows_with_missing_prefixes,
+)
+
+from .constants import ENTITY_REFERENCE, SchemaValidationType
+
+#: The syntax of a CURIE, checked on entity reference slots
+CURIE_PATTERN = r"^[A-Za-z_][A-Za-z0-9_.-]*:\S*$"
+#: Bounds of numeric slots documented by the specification but not declared in the schema
+SLOT_BOUNDS: Dict[str, Tuple[float, float]] = {"confidence": (0.0, 1.0)}
+#: Separator of the values of multivalued slots
+MULTIVALUED_SEPARATOR = "|"
+#: Columns of the table of violations returned by :func:`get_validation_errors`
+VALIDATION_ERROR_COLUMNS = ["row", "slot", "value", "message"]
+
+
+def validate(
+    msdf: MappingSetDataFrame, validation_types: List[SchemaValidationType], jobs: int = 1
+) -> None:
     """Validate SSSOM files against `sssom-schema` using linkML's validator function.
 
     :param msdf: MappingSetDataFrame.
     :param validation_types: SchemaValidationType
+    :param jobs: The number of processes validating the mappings against the JSON schema
     """
     validation_methods = {
-        SchemaValidationType.JsonSchema: validate_json_schema,
+        SchemaValidationType.JsonSchema: partial(validate_json_schema, jobs=jobs),
         SchemaValidationType.Shacl: validate_shacl,
         SchemaValidationType.PrefixMapCompleteness: check_all_prefixes_in_curie_map,
     }
@@ -33,14 +49,140 @@ def validate(msdf: MappingSetDataFrame, validation_types: List[SchemaValidationT
         validation_methods[vt](msdf)
 
 
-def validate_json_schema(msdf: MappingSetDataFrame) -> None:
-    """Validate JSON Schema using linkml's JsonSchemaDataValidator.
+def validate_json_schema(msdf: MappingSetDataFrame, jobs: int = 1) -> None:
+    """Validate the mapping set against the constraints of the JSON schema.
 
     :param msdf: MappingSetDataFrame to eb validated.
+    :param jobs: The number of processes validating chunks of the mappings
+    :raises ValidationError: If any value violates the schema, listing all violations
+    """
+    errors = get_validation_errors(msdf, jobs=jobs)
+    if len(errors):
+        lines = [
+            f"{'metadata' if pd.isna(row) else f'row {row}'}, {slot}: {value!r} {message}"
+            for row, slot, value, message in errors.itertuples(index=False, name=None)
+        ]
+        raise ValidationError(f"{len(errors)} schema violation(s):\n" + "\n".join(lines))
+
+
+def get_validation_errors(msdf: MappingSetDataFrame, jobs: int = 1) -> pd.DataFrame:
+    """Check the mapping set against the constraints of the schema, column by column.
+
+    Required slots, enum values, patterns, numeric values and their bounds, CURIE syntax
+    and multivalued separators are checked.
+
+    :param msdf: MappingSetDataFrame
+    :param jobs: The number of processes validating chunks of the mappings
+    :return: A data frame of the violations ordered by row, with the position of the mapping
+        in the data frame (missing for the metadata and missing columns), the slot, the
+        offending value and a message
+    """
+    schema = _get_sssom_schema_object()
+    metadata = pd.DataFrame(
+        [
+            {
+                k: MULTIVALUED_SEPARATOR.join(map(str, v)) if isinstance(v, list) else v
+                for k, v in (msdf.metadata or {}).items()
+            }
+        ]
+    )
+    errors = [_check_columns(metadata, schema.mapping_set_slot_rules)]
+    errors[0]["row"] = None
+
+    df = msdf.df if msdf.df is not None else pd.DataFrame()
+    df = df.set_axis(pd.RangeIndex(len(df)))
+    rules = schema.mapping_slot_rules
+    errors.extend(_check_missing_columns(df, rules))
+    size = max(-(-len(df) // jobs), 1)
+    chunks = [df.iloc[start : start + size] for start in range(0, len(df), size)]
+    if len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            errors.extend(executor.map(partial(_check_columns, rules=rules), chunks))
+    else:
+        errors.extend(_check_columns(chunk, rules) for chunk in chunks)
+    errors = pd.concat(errors, ignore_index=True)[VALIDATION_ERROR_COLUMNS]
+    errors["row"] = errors["row"].astype("Int64")
+    return errors.sort_values("row", kind="stable", na_position="first", ignore_index=True)
+
+
+def _check_missing_columns(
+    df: pd.DataFrame, rules: Dict[str, Dict[str, Any]]
+) -> List[pd.DataFrame]:
+    """Report the required slots that have no column."""
+    missing = [slot for slot, rule in rules.items() if rule["required"] and slot not in df]
+    if not missing or df.empty:
+        return []
+    return [pd.DataFrame({"row": None, "slot": missing, "value": None, "message": "is missing"})]
+
+
+def _check_columns(df: pd.DataFrame, rules: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    """Check the columns of a data frame against the rules of their slots.
+
+    :param df: A data frame
+    :param rules: The rules of the slots, as given by the schema snapshot
+    :return: A data frame of the violations, in the layout of :func:`get_validation_errors`
     """
-    validator = ReferenceValidator(SchemaView(SCHEMA_YAML))
-    mapping_set = to_mapping_set_document(msdf).mapping_set
-    validator.validate(mapping_set, MappingSet)
+    errors = [pd.DataFrame(columns=VALIDATION_ERROR_COLUMNS)]
+
+    def report(values: pd.Series, slot: str, message: str) -> None:
+        """Report each of the values as a violation."""
+        if len(values):
+            values = values.where(values.isna(), values.astype(str))
+            errors.append(
+                pd.DataFrame(
+                    {"row": values.index, "slot": slot, "value": values.values, "message": message}
+                )
+            )
+
+    for slot, rule in rules.items():
+        if slot not in df:
+            continue
+        column = df[slot]
+        present = column.notna() & (column.astype(str) != "")
+        if rule["required"]:
+            report(pd.Series(None, index=column.index[~present], dtype=object), slot, "is required")
+        values = column[present]
+        if values.empty:
+            continue
+        if rule["multivalued"]:
+            values = values.astype(str)
+            elements = values.str.split(MULTIVALUED_SEPARATOR, regex=False).explode().str.strip()
+            empty = elements == ""
+            report(values[empty[empty].index.unique()], slot, "has an empty multivalued element")
+            values = elements[~empty]
+        _check_range(values, slot, rule, report)
+    return pd.concat(errors, ignore_index=True)
+
+
+def _check_range(
+    values: pd.Series,
+    slot: str,
+    rule: Dict[str, Any],
+    report: Callable[[pd.Series, str, str], None],
+) -> None:
+    """Check the values of a slot against its range, pattern and bounds."""
+    if rule["permissible_values"] is not None:
+        report(values[~values.isin(rule["permissible_values"])], slot, "is not a permissible value")
+    elif rule["range"] in {"double", "float", "integer"}:
+        numbers = pd.to_numeric(values, errors="coerce")
+        report(values[numbers.isna()], slot, f"is not a {rule['range']}")
+        minimum, maximum = SLOT_BOUNDS.get(slot, (None, None))
+        minimum = rule["minimum_value"] if rule["minimum_value"] is not None else minimum
+        maximum = rule["maximum_value"] if rule["maximum_value"] is not None else maximum
+        if minimum is not None:
+            report(values[numbers < minimum], slot, f"is less than {minimum}")
+        if maximum is not None:
+            report(values[numbers > maximum], slot, f"is greater than {maximum}")
+    elif rule["range"] == ENTITY_REFERENCE:
+        strings = values.astype(str)
+        report(values[~strings.str.match(CURIE_PATTERN)], slot, "is not a CURIE")
+    if rule["pattern"] is not None:
+        matches = values.astype(str).map(re.compile(rule["pattern"]).search)
+        report(
+            values[matches.isna()],
+            slot,
+            f"does not match {rule['pattern']}",
+        )
 
 
 def validate_shacl(msdf: MappingSetDataFrame) -> None:
@@ -69,7 +211,8 @@ def check_all_prefixes_in_curie_map(msdf: MappingSetDataFrame) -> None:
     """Check all `EntityReference` slots are mentioned in 'curie_map'.
 
     :param msdf: MappingSetDataFrame
-    :raises ValidationError: If all prefixes not in curie_map.
+    :raises ValidationError: If all prefixes not in curie_map. The mappings using the missing
+        prefixes are given as the ``instance`` of the error.
     """
     prefixes = get_all_prefixes(msdf)
     prefixes_including_builtins = add_built_in_prefixes_to_prefix_map(msdf.prefix_map)
@@ -80,9 +223,13 @@ def check_all_prefixes_in_curie_map(msdf: MappingSetDataFrame) -> None:
         logging.info(f"Adding prefixes: {added_built_in} to the MapingSetDataFrame.")
     msdf.prefix_map = prefixes_including_builtins
 
-    missing_prefixes = []
-    for pref in prefixes:
-        if pref != "" and pref not in list(msdf.prefix_map.keys()):
-            missing_prefixes.append(pref)
+    missing_prefixes = sorted(
+        pref for pref in prefixes if pref != "" and pref not in msdf.prefix_map
+    )
     if missing_prefixes:
-        raise ValidationError(f"The prefixes in {missing_prefixes} are missing from 'curie_map'.")
+        rows = get_rows_with_missing_prefixes(msdf.df, msdf.prefix_map)
+        raise ValidationError(
+            f"The prefixes in {missing_prefixes} are missing from 'curie_map'"
+            f" and used in {len(rows)} mapping(s).",
+            instance=rows,
+        )
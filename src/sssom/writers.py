@@ -1,16 +1,20 @@
 """Serialization functions for SSSOM."""
 
+import copy
 import json
 import logging
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple, Union
+from typing import Any, Callable, Deque, Dict, List, Optional, TextIO, Tuple, Union
 
 import pandas as pd
 import yaml
 from deprecation import deprecated
 from jsonasobj2 import JsonObj
 from linkml_runtime.dumpers import JSONDumper, rdflib_dumper
-from linkml_runtime.utils.schemaview import SchemaView
 from rdflib import Graph, URIRef
 from rdflib.namespace import OWL, RDF
 
@@ -19,7 +23,6 @@ from sssom_schema import slots
 
 from sssom.validators import check_all_prefixes_in_curie_map
 
-from .constants import SCHEMA_YAML
 from .parsers import to_mapping_set_document
 from .typehints import PrefixMap
 from .util import (
@@ -29,9 +32,9 @@ from .util import (
     SSSOM_URI_PREFIX,
     URI_SSSOM_MAPPINGS,
     MappingSetDataFrame,
+    _get_sssom_schema_object,
     get_file_extension,
     prepare_context_str,
-    sort_df_rows_columns,
 )
 
 # from sssom.validators import check_all_prefixes_in_curie_map
@@ -72,9 +75,8 @@ def write_table(
     if msdf.prefix_map is not None:
         meta[PREFIX_MAP_KEY] = msdf.prefix_map
     if sort:
-        msdf.df = sort_df_rows_columns(msdf.df)
-    lines = yaml.safe_dump(meta).split("\n")
-    lines = [f"# {line}" for line in lines if line != ""]
+        msdf.sort()
+    lines = get_metadata_header_lines(meta)
     s = msdf.df.to_csv(sep=sep, index=False)
 
     if embedded_mode:
@@ -90,6 +92,16 @@ def write_table(
             yaml.safe_dump(meta, y)
 
 
+def get_metadata_header_lines(meta: Dict[str, Any]) -> List[str]:
+    """Get the commented YAML lines that make up the header of an SSSOM TSV.
+
+    :param meta: Metadata, including the prefix map under the ``curie_map`` key
+    :return: A list of lines, each starting with ``#``, without line terminators
+    """
+    lines = yaml.safe_dump(meta).split("\n")
+    return [f"# {line}" for line in lines if line != ""]
+
+
 def write_rdf(
     msdf: MappingSetDataFrame,
     file: TextIO,
@@ -301,7 +313,7 @@ def to_rdf_graph(msdf: MappingSetDataFrame) -> Graph:
     # os.remove("sssom.ttl")  # remove the intermediate file.
     graph = rdflib_dumper.as_rdf_graph(
         element=doc.mapping_set,
-        schemaview=SchemaView(SCHEMA_YAML),
+        schemaview=_get_sssom_schema_object().view,
         prefix_map=msdf.prefix_map,
     )
     return graph
@@ -557,22 +569,94 @@ def get_writer_function(
         raise ValueError(f"Unknown output format: {output_format}")
 
 
-def write_tables(sssom_dict: Dict[str, MappingSetDataFrame], output_dir: Union[str, Path]) -> None:
+def write_tables(
+    sssom_dict: Dict[str, MappingSetDataFrame], output_dir: Union[str, Path], jobs: int = 1
+) -> None:
     """Write table from MappingSetDataFrame object.
 
+    Each table is formatted in memory and written with a single call. The YAML header is
+    only dumped again when the metadata or prefix map differs from that of the previous
+    table, which is rarely the case for the splits of a single mapping set.
+
+    With several jobs, each table is formatted and written by a worker thread, and only a
+    few tables per thread are submitted ahead, so that memory does not grow with the
+    number of tables.
+
     :param sssom_dict: Dictionary of MappingSetDataframes
     :param output_dir: The directory in which the derived SSSOM files are written
+    :param jobs: The number of threads writing files concurrently
     """
-    # FIXME documentation does not actually describe what this is doing
     # FIXME explanation of sssom_dict does not make sense
     # FIXME sssom_dict is a bad variable name
     output_dir = Path(output_dir).resolve()
-    for split_id, msdf in sssom_dict.items():
+    # each thread reuses the last header it formatted
+    local = threading.local()
+
+    def _write(split_id: str, msdf: MappingSetDataFrame) -> None:
+        if not hasattr(local, "formatter"):
+            local.formatter = _TableFormatter()
         path = output_dir.joinpath(f"{split_id}.sssom.tsv")
-        with path.open("w") as file:
-            write_table(msdf, file)
+        path.write_text(local.formatter.format(msdf))
         logging.info(f"Writing {path} complete!")
 
+    if jobs <= 1:
+        for split_id, msdf in sssom_dict.items():
+            _write(split_id, msdf)
+        return
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        pending: Deque[Future] = deque()
+        for split_id, msdf in sssom_dict.items():
+            if len(pending) >= 2 * jobs:
+                # wait for the oldest table, raising its error if any
+                pending.popleft().result()
+            pending.append(executor.submit(_write, split_id, msdf))
+        for future in pending:
+            future.result()
+
+
+def write_table_archive(sssom_dict: Dict[str, MappingSetDataFrame], path: Union[str, Path]) -> None:
+    """Write MappingSetDataFrames as the members of a single ZIP archive.
+
+    The archive ends with an index of the offset of each member, so a single table can
+    be read back without scanning the others, see
+    :func:`sssom.parsers.parse_sssom_table_archive`. This avoids creating a file for each
+    of many small tables.
+
+    :param sssom_dict: Dictionary of MappingSetDataframes
+    :param path: The path of the archive
+    """
+    formatter = _TableFormatter()
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for split_id, msdf in sssom_dict.items():
+            archive.writestr(f"{split_id}.sssom.tsv", formatter.format(msdf))
+
+
+class _TableFormatter:
+    """Format MappingSetDataFrames as SSSOM TSV, reusing the last header."""
+
+    def __init__(self) -> None:
+        self._meta: Optional[Dict[str, Any]] = None
+        self._header = ""
+
+    def format(self, msdf: MappingSetDataFrame) -> str:
+        """Format a MappingSetDataFrame as it is written by :func:`write_table`.
+
+        :param msdf: MappingSetDataFrame
+        :raises TypeError: If the dataframe is missing
+        :return: The SSSOM TSV
+        """
+        if msdf.df is None:
+            raise TypeError
+        meta: Dict[str, Any] = {}
+        if msdf.metadata is not None:
+            meta.update(msdf.metadata)
+        if msdf.prefix_map is not None:
+            meta[PREFIX_MAP_KEY] = msdf.prefix_map
+        if meta != self._meta:
+            self._meta = copy.deepcopy(meta)
+            self._header = "".join(f"{line}\n" for line in get_metadata_header_lines(meta))
+        return self._header + msdf.df.to_csv(sep="\t", index=False) + "\n"
+
 
 def _inject_annotation_properties(graph: Graph, elements) -> None:
     for var in [
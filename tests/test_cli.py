@@ -1,6 +1,7 @@
 """Tests for the command line interface."""
 
 import os
+import shutil
 import subprocess  # noqa
 import unittest
 from typing import Mapping
@@ -133,7 +134,8 @@ class SSSOMCLITestSuite(unittest.TestCase):
     def run_split(self, runner: CliRunner, test_case: SSSOMTestCase) -> Result:
         """Run the split test."""
         result = runner.invoke(
-            split, [test_case.filepath, "--output-directory", test_out_dir.as_posix()]
+            split,
+            [test_case.filepath, "--output-directory", test_out_dir.as_posix(), "--jobs", "2"],
         )
         self.run_successful(result, test_case)
         return result
@@ -191,6 +193,24 @@ class SSSOMCLITestSuite(unittest.TestCase):
         params.extend(["--output-directory", test_out_dir.as_posix()])
         result = runner.invoke(partition, params)
         self.run_successful(result, primary_test_case)
+
+        index_params = [
+            "--output-directory",
+            (test_out_dir / "partition").as_posix(),
+            "--index",
+            (test_out_dir / "partition_index").as_posix(),
+            "--summary",
+            (test_out_dir / "partition_summary.tsv").as_posix(),
+        ]
+        shutil.rmtree(test_out_dir / "partition_index", ignore_errors=True)
+        (test_out_dir / "partition").mkdir(exist_ok=True)
+        for filepath in params[:2]:
+            result = runner.invoke(partition, [filepath, *index_params])
+            self.run_successful(result, primary_test_case)
+
+        archive = (test_out_dir / "partition.zip").as_posix()
+        result = runner.invoke(partition, [*params, "--jobs", "2", "--archive", archive])
+        self.run_successful(result, primary_test_case)
         return result
 
     def run_cliquesummary(self, runner: CliRunner, test_case: SSSOMTestCase) -> Result:
@@ -234,7 +254,7 @@ class SSSOMCLITestSuite(unittest.TestCase):
             params.append(t.filepath)
             out_file = t
         if out_file:
-            params.extend(["--output", out_file.get_out_file("tsv")])
+            params.extend(["--output", out_file.get_out_file("tsv"), "--jobs", "2"])
 
         result = runner.invoke(merge, params)
         self.run_successful(result, test_cases)
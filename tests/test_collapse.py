@@ -2,6 +2,8 @@
 
 import unittest
 
+import numpy as np
+import pandas as pd
 import yaml
 from pansql import sqldf
 
@@ -11,9 +13,11 @@ from sssom.util import (
     compare_dataframes,
     dataframe_to_ptable,
     filter_redundant_rows,
+    get_ptable_dataframe,
     group_mappings,
     parse,
     reconcile_prefix_and_data,
+    replace_prefixes,
 )
 from tests.constants import data_dir, prefix_recon_yaml
 
@@ -49,6 +53,44 @@ class TestCollapse(unittest.TestCase):
         rows = dataframe_to_ptable(self.df)
         self.assertEqual(91, len(rows))
 
+    def test_ptable_probabilities(self):
+        """Test the probabilities of the ptable export for each kind of predicate."""
+        df = pd.DataFrame(
+            {
+                "subject_id": ["a:1", "a:2", "a:3", "a:4"],
+                "predicate_id": [
+                    "skos:broadMatch",
+                    "skos:narrowMatch",
+                    "skos:exactMatch",
+                    "owl:differentFrom",
+                ],
+                "object_id": ["b:1", "b:2", "b:3", "b:4"],
+                "confidence": [0.8, 0.8, 0.8, 0.8],
+            }
+        )
+        ptable = get_ptable_dataframe(df)
+        self.assertEqual(["a:1", "a:2", "a:3", "a:4"], ptable["subject_id"].tolist())
+        expected = [
+            [0.8, 0.1, 0.05, 0.05],
+            [0.1, 0.8, 0.05, 0.05],
+            [0.05, 0.05, 0.8, 0.1],
+            [0.05, 0.05, 0.1, 0.8],
+        ]
+        np.testing.assert_allclose(expected, ptable.iloc[:, 2:].to_numpy())
+
+    def test_ptable_unhandled_predicates(self):
+        """Test that all unhandled predicates are reported at once."""
+        df = pd.DataFrame(
+            {
+                "subject_id": ["a:1", "a:2", "a:3"],
+                "predicate_id": ["rdfs:seeAlso", "rdfs:seeAlso", "skos:exactMatch"],
+                "object_id": ["b:1", "b:2", "b:3"],
+                "confidence": [0.8, 0.8, 0.8],
+            }
+        )
+        with self.assertRaisesRegex(ValueError, "'rdfs:seeAlso': 2"):
+            get_ptable_dataframe(df)
+
     def test_groupings(self):
         """Test the row count after grouping mappings."""
         mappings = group_mappings(self.df)
@@ -98,3 +140,26 @@ class TestCollapse(unittest.TestCase):
         for pfx, exp in prefix_expansion.items():
             if pfx in recon_msdf.prefix_map.keys():
                 self.assertEqual(recon_msdf.prefix_map[pfx], exp)
+
+    def test_replace_prefixes(self):
+        """Test only the prefix at the start of a CURIE is replaced."""
+        df = pd.DataFrame(
+            {
+                "subject_id": ["a:1", "xa:2", "a:b:3", None],
+                "predicate_id": ["a:related", "a:related", "a:related", "a:related"],
+                "object_id": ["b:1", "b:2", "ba:3", "b:4"],
+            }
+        )
+        replaced = replace_prefixes(df, {"a": "c", "b": "a"})
+        self.assertEqual(["c:1", "xa:2", "c:b:3", None], list(replaced["subject_id"]))
+        self.assertEqual(["c:related"] * 4, list(replaced["predicate_id"]))
+        self.assertEqual(["a:1", "a:2", "ba:3", "a:4"], list(replaced["object_id"]))
+        self.assertEqual("a:1", df["subject_id"][0])
+
+    def test_replace_prefixes_multivalued(self):
+        """Test the prefix of every CURIE of a multivalued value is replaced."""
+        df = pd.DataFrame({"author_id": ["orcid:1|ORCID:2", "ORCID:3", "x:4|y:5", None]})
+        replaced = replace_prefixes(df, {"ORCID": "orcid"})
+        self.assertEqual(
+            ["orcid:1|orcid:2", "orcid:3", "x:4|y:5", None], list(replaced["author_id"])
+        )
@@ -2,7 +2,14 @@
 
 import unittest
 
-from sssom.context import get_external_jsonld_context
+from sssom.context import (
+    DEFAULT_LICENSE,
+    get_built_in_prefix_map,
+    get_default_metadata,
+    get_external_jsonld_context,
+    get_jsonld_context,
+)
+from sssom.util import prepare_context
 
 
 class TestContext(unittest.TestCase):
@@ -19,3 +26,28 @@ class TestContext(unittest.TestCase):
             "NCBIProtein",
         }
         self.assertLessEqual(expected_prefixes, prefixes)
+
+    def test_cached_context_is_copy_on_write(self):
+        """Test that mutating a returned context does not leak into later calls."""
+        context = get_jsonld_context()
+        context["@context"]["FOO"] = "http://example.org/foo/"
+        del context["@context"]["owl"]
+        fresh_context = get_jsonld_context()
+        self.assertNotIn("FOO", fresh_context["@context"])
+        self.assertIn("owl", fresh_context["@context"])
+
+        prefix_map = prepare_context({"FOO": "http://example.org/foo/"})["@context"]
+        self.assertEqual("http://example.org/foo/", prefix_map["FOO"])
+        self.assertNotIn("FOO", get_jsonld_context()["@context"])
+
+    def test_cached_default_metadata(self):
+        """Test that the default prefix map is cached but handed out as a copy."""
+        metadata = get_default_metadata()
+        metadata.prefix_map["FOO"] = "http://example.org/foo/"
+        metadata.metadata["license"] = "http://example.org/license"
+        fresh_metadata = get_default_metadata()
+        self.assertNotIn("FOO", fresh_metadata.prefix_map)
+        self.assertEqual(DEFAULT_LICENSE, fresh_metadata.metadata["license"])
+        self.assertLessEqual(
+            set(get_built_in_prefix_map().items()), set(fresh_metadata.prefix_map.items())
+        )
@@ -6,12 +6,14 @@ import logging
 import unittest
 from typing import Dict
 
+import numpy as np
 import yaml
 from rdflib import Graph
+from sssom_schema import Mapping
 
 from sssom.parsers import get_parsing_function, parse_sssom_table, to_mapping_set_document
 from sssom.sssom_document import MappingSetDocument
-from sssom.util import to_mapping_set_dataframe
+from sssom.util import get_dataframe_from_mappings, get_dict_from_mapping, to_mapping_set_dataframe
 from sssom.writers import (
     to_json,
     to_ontoportal_json,
@@ -127,6 +129,40 @@ class SSSOMReadWriteTestSuite(unittest.TestCase):
         g.parse(file, format=graph_serialisation)
         self._test_graph_size(g, queries, file)
 
+    def test_get_dataframe_from_mappings(self):
+        """Test mappings are converted column by column like one by one."""
+        mappings = [
+            Mapping(
+                subject_id="x:1",
+                predicate_id="skos:exactMatch",
+                object_id="y:1",
+                mapping_justification="semapv:ManualMappingCuration",
+                author_id=["orcid:1", "orcid:2"],
+                predicate_modifier="Not",
+                confidence=0.5,
+            ),
+            Mapping(
+                subject_id="x:2",
+                predicate_id="skos:exactMatch",
+                object_id="y:2",
+                mapping_justification="semapv:LexicalMatching",
+                subject_type="owl class",
+            ),
+        ]
+        df = get_dataframe_from_mappings(mappings)
+        self.assertEqual(["orcid:1|orcid:2", ""], list(df["author_id"]))
+        self.assertEqual(["Not", ""], list(df["predicate_modifier"]))
+        self.assertEqual(["", "owl class"], list(df["subject_type"]))
+        self.assertEqual(0.5, df["confidence"][0])
+        self.assertTrue(np.isnan(df["confidence"][1]))
+        self.assertNotIn("reviewer_id", df.columns)
+        for mapping, row in zip(mappings, df.to_dict("records")):
+            expected = get_dict_from_mapping(mapping)
+            self.assertEqual(
+                {k: expected[k] for k in row if k != "confidence"},
+                {k: v for k, v in row.items() if k != "confidence"},
+            )
+
     def _test_graph_size(self, graph: Graph, queries: list, file: str):
         for query, size in queries:
             self.assertEqual(
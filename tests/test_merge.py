@@ -1,10 +1,14 @@
 """Test for merging MappingSetDataFrames."""
 
+import io
 import unittest
 
+from sssom.constants import SUBJECT_ID
+from sssom.io import merge_sorted_files
 from sssom.parsers import parse_sssom_table
 from sssom.util import merge_msdf
-from tests.constants import data_dir
+from sssom.writers import write_table
+from tests.constants import data_dir, test_out_dir
 
 
 class TestMerge(unittest.TestCase):
@@ -26,3 +30,30 @@ class TestMerge(unittest.TestCase):
     def test_merge_single_input(self):
         """Test merging when a single msdf is provided."""
         self.assertEqual(141, len(merge_msdf(self.msdf).df))
+
+    def test_merge_drops_duplicate_rows(self):
+        """Test that merging a mapping set with itself does not duplicate rows."""
+        merged_msdf = merge_msdf(self.msdf, self.msdf)
+        self.assertEqual(141, len(merged_msdf.df))
+        self.assertFalse(merged_msdf.df.duplicated().any())
+
+    def test_merge_sorted_files(self):
+        """Test that the streaming merge of sorted files agrees with merge_msdf."""
+        paths = []
+        for i, msdf in enumerate(self.msdfs):
+            path = test_out_dir / f"merge_sorted_{i}.sssom.tsv"
+            with open(path, "w") as file:
+                write_table(msdf, file)
+            paths.append(str(path))
+        output = test_out_dir / "merge_sorted.sssom.tsv"
+        with open(output, "w") as file:
+            merge_sorted_files(paths, file)
+        merged_msdf = parse_sssom_table(output)
+        self.assertEqual(len(merge_msdf(*self.msdfs).df), len(merged_msdf.df))
+        subjects = merged_msdf.df[SUBJECT_ID].tolist()
+        self.assertEqual(sorted(subjects), subjects)
+
+    def test_merge_sorted_files_unsorted(self):
+        """Test that the streaming merge rejects an input that is not sorted."""
+        with self.assertRaises(ValueError):
+            merge_sorted_files([f"{data_dir}/basic.tsv"], io.StringIO())
@@ -1,10 +1,15 @@
 """Tests for parsers."""
 
+import bz2
+import gc
+import gzip
 import io
 import json
+import lzma
 import math
 import os
 import unittest
+import warnings
 from xml.dom import minidom
 
 import numpy as np
@@ -19,10 +24,16 @@ from sssom.parsers import (
     from_sssom_dataframe,
     from_sssom_json,
     from_sssom_rdf,
+    parse_alignment_xml,
+    parse_sssom_json,
+    parse_sssom_rdf,
     parse_sssom_table,
+    parse_sssom_tables,
+    split_dataframe,
+    split_dataframe_by_prefix,
 )
 from sssom.util import PREFIX_MAP_KEY, sort_df_rows_columns
-from sssom.writers import write_table
+from sssom.writers import write_rdf, write_table
 from tests.test_data import data_dir as test_data_dir
 from tests.test_data import test_out_dir
 
@@ -233,3 +244,126 @@ class TestParse(unittest.TestCase):
                         self.assertEqual(imported_df.iloc[idx][k], v)
                     else:
                         self.assertEqual(imported_df.iloc[idx][k], v)
+
+
+class TestParseCompressed(unittest.TestCase):
+    """A test case for parsing compressed inputs."""
+
+    def _compress(self, path: str, suffix: str, opener) -> str:
+        """Write a compressed copy of a test file to the test output directory."""
+        compressed_path = os.path.join(test_out_dir, os.path.basename(path) + suffix)
+        with open(path, "rb") as source, opener(compressed_path, "wb") as target:
+            target.write(source.read())
+        return compressed_path
+
+    def test_parse_sssom_table_compressed(self):
+        """Test parsing gzip, bz2 and xz compressed TSVs."""
+        input_path = f"{test_data_dir}/basic.tsv"
+        expected = parse_sssom_table(input_path)
+        for suffix, opener in [(".gz", gzip.open), (".bz2", bz2.open), (".xz", lzma.open)]:
+            with self.subTest(suffix=suffix), warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always", ResourceWarning)
+                msdf = parse_sssom_table(self._compress(input_path, suffix, opener))
+                gc.collect()
+                # the compressed file is closed after parsing
+                self.assertFalse([w for w in caught if w.category is ResourceWarning])
+                self.assertEqual(expected.metadata, msdf.metadata)
+                self.assertEqual(expected.prefix_map, msdf.prefix_map)
+                pd.testing.assert_frame_equal(expected.df, msdf.df)
+
+    def test_parse_sssom_table_compressed_without_extension(self):
+        """Test that compression is detected from magic bytes rather than the file name."""
+        input_path = f"{test_data_dir}/basic.tsv"
+        compressed_path = os.path.join(test_out_dir, "basic-gzipped.tsv")
+        with open(input_path, "rb") as source, gzip.open(compressed_path, "wb") as target:
+            target.write(source.read())
+        self.assertEqual(141, len(parse_sssom_table(compressed_path).df))
+
+    def test_parse_caller_streams_left_open(self):
+        """Test that text and binary streams given by the caller are left open."""
+        input_path = f"{test_data_dir}/basic.tsv"
+        with open(input_path, "rb") as file:
+            data = file.read()
+        with open(input_path, "rb") as binary_file, open(input_path) as text_file:
+            streams = [
+                binary_file,
+                text_file,
+                io.BytesIO(data),
+                io.BytesIO(gzip.compress(data)),
+                io.StringIO(data.decode()),
+            ]
+            for stream in streams:
+                with self.subTest(stream=stream):
+                    self.assertEqual(141, len(parse_sssom_table(stream).df))
+                    self.assertFalse(stream.closed)
+        stream = io.BytesIO(gzip.compress(open(f"{test_data_dir}/basic.json", "rb").read()))
+        self.assertEqual(141, len(parse_sssom_json(stream).df))
+        self.assertFalse(stream.closed)
+
+    def test_parse_sssom_rdf_compressed(self):
+        """Test parsing a gzipped SSSOM RDF file."""
+        expected = parse_sssom_table(f"{test_data_dir}/basic.tsv")
+        rdf_path = os.path.join(test_out_dir, "test_parse_compressed.sssom.ttl")
+        with open(rdf_path, "w") as file:
+            write_rdf(expected, file)
+        path = self._compress(rdf_path, ".gz", gzip.open)
+        msdf = parse_sssom_rdf(path, prefix_map=expected.prefix_map)
+        self.assertEqual(len(expected.df), len(msdf.df))
+
+    def test_parse_sssom_json_compressed(self):
+        """Test parsing a gzipped SSSOM JSON file."""
+        path = self._compress(f"{test_data_dir}/basic.json", ".gz", gzip.open)
+        msdf = parse_sssom_json(path)
+        self.assertEqual(141, len(msdf.df))
+
+    def test_parse_alignment_xml_compressed(self):
+        """Test parsing a bz2-compressed alignment API XML file."""
+        path = self._compress(f"{test_data_dir}/oaei-ordo-hp.rdf", ".bz2", bz2.open)
+        metadata = get_default_metadata()
+        msdf = parse_alignment_xml(path, prefix_map=metadata.prefix_map, meta=metadata.metadata)
+        self.assertEqual(646, len(msdf.df))
+
+
+class TestParseMultiple(unittest.TestCase):
+    """A test case for parsing several SSSOM TSVs at once."""
+
+    def test_parse_sssom_tables_parallel(self):
+        """Test that parsing in worker processes returns the inputs in order."""
+        paths = [f"{test_data_dir}/{name}" for name in ("basic.tsv", "basic2.tsv", "basic3.tsv")]
+        expected = [parse_sssom_table(path) for path in paths]
+        msdfs = parse_sssom_tables(paths, jobs=2)
+        self.assertEqual(len(expected), len(msdfs))
+        for expected_msdf, msdf in zip(expected, msdfs):
+            self.assertEqual(expected_msdf.prefix_map, msdf.prefix_map)
+            self.assertEqual(expected_msdf.metadata, msdf.metadata)
+            pd.testing.assert_frame_equal(expected_msdf.df, msdf.df)
+
+
+class TestSplit(unittest.TestCase):
+    """A test case for splitting a mapping set by prefixes and relations."""
+
+    def setUp(self) -> None:
+        """Set up the test case with the cob-to-external example."""
+        self.msdf = parse_sssom_table(f"{test_data_dir}/cob-to-external.tsv")
+
+    def test_split_dataframe(self):
+        """Test each split holds the mappings of one subject prefix, relation and object prefix."""
+        splitted = split_dataframe(self.msdf)
+        self.assertEqual(33, len(splitted))
+        self.assertEqual(len(self.msdf.df), sum(len(msdf.df) for msdf in splitted.values()))
+        msdf = splitted["cob_equivalentclass_go"]
+        self.assertTrue(msdf.df["subject_id"].str.startswith("COB:").all())
+        self.assertTrue(msdf.df["object_id"].str.startswith("GO:").all())
+        self.assertEqual({"owl:equivalentClass"}, set(msdf.df["predicate_id"]))
+        self.assertLessEqual({"COB", "GO", "owl", "sssom"}, set(msdf.prefix_map))
+        self.assertEqual(self.msdf.metadata, msdf.metadata)
+
+    def test_split_dataframe_by_prefix(self):
+        """Test splitting only some prefixes and relations."""
+        splitted = split_dataframe_by_prefix(
+            self.msdf,
+            subject_prefixes=["COB"],
+            object_prefixes=["GO", "CL"],
+            relations=["owl:equivalentClass"],
+        )
+        self.assertEqual({"cob_equivalentclass_go", "cob_equivalentclass_cl"}, set(splitted))
@@ -4,8 +4,19 @@
 
 import os
 import unittest
+import unittest.mock
 
-from sssom.constants import SCHEMA_YAML
+from linkml_runtime.utils.schemaview import SchemaView
+
+from sssom.constants import (
+    SCHEMA_SNAPSHOT,
+    SCHEMA_YAML,
+    SSSOMSchemaView,
+    _build_schema_snapshot,
+    load_schema_snapshot,
+    write_schema_snapshot,
+)
+from tests.constants import test_out_dir
 
 
 class TestResources(unittest.TestCase):
@@ -14,3 +25,24 @@ class TestResources(unittest.TestCase):
     def test_exists(self):
         """Test the schema YAML file is available to the package."""
         self.assertTrue(os.path.exists(SCHEMA_YAML))
+
+    def test_schema_snapshot(self):
+        """Test the shipped schema snapshot is up to date with the installed sssom-schema."""
+        snapshot = load_schema_snapshot(SCHEMA_SNAPSHOT)
+        self.assertIsNotNone(snapshot)
+        self.assertEqual(_build_schema_snapshot(SchemaView(SCHEMA_YAML)), snapshot)
+
+    def test_stale_schema_snapshot(self):
+        """Test a snapshot built for another version of sssom-schema is ignored."""
+        path = test_out_dir / "stale.snapshot.json"
+        write_schema_snapshot(path)
+        self.assertIsNotNone(load_schema_snapshot(path))
+        with unittest.mock.patch("sssom.constants.SSSOM_SCHEMA_VERSION", "0.0.0"):
+            self.assertIsNone(load_schema_snapshot(path))
+        self.assertIsNone(load_schema_snapshot(test_out_dir / "missing.snapshot.json"))
+        path.write_text("{")
+        self.assertIsNone(load_schema_snapshot(path))
+
+    def test_schema_view_singleton(self):
+        """Test the schema view is a singleton."""
+        self.assertIs(SSSOMSchemaView(), SSSOMSchemaView())
@@ -1,12 +1,14 @@
 """Tests for rewiring utilities."""
 
+import io
 import os
 import unittest
 
-from rdflib import Graph
+from rdflib import Graph, URIRef
+from rdflib.compare import isomorphic
 
 from sssom.parsers import parse_sssom_table
-from sssom.rdf_util import rewire_graph
+from sssom.rdf_util import get_rewire_map, rewire_graph, rewire_ntriples
 from tests.constants import data_dir, test_out_dir
 
 
@@ -30,3 +32,26 @@ class TestRewire(unittest.TestCase):
         print(f"Num changed = {n}")
         with open(test_out_dir / "rewired-cob.ttl", "w") as stream:
             stream.write(self.graph.serialize(format="turtle"))
+
+    def test_rewire_map(self):
+        """Test that only the rewired entities are replaced in the graph."""
+        rewire_map = get_rewire_map(self.mset, precedence=["PR"])
+        self.assertTrue(rewire_map)
+        expected = {
+            tuple(URIRef(rewire_map.get(str(x), str(x))) if isinstance(x, URIRef) else x for x in t)
+            for t in self.graph
+        }
+        n = rewire_graph(self.graph, self.mset, precedence=["PR"])
+        self.assertLess(0, n)
+        self.assertLess(n, len(expected))
+        self.assertEqual(expected, set(self.graph))
+
+    def test_rewire_ntriples(self):
+        """Test rewiring an N-Triples document line by line."""
+        lines = io.StringIO(self.graph.serialize(format="nt"))
+        output = io.StringIO()
+        n = rewire_ntriples(lines, output, self.mset, precedence=["PR"])
+        self.assertEqual(n, rewire_graph(self.graph, self.mset, precedence=["PR"]))
+        rewired = Graph()
+        rewired.parse(data=output.getvalue(), format="nt")
+        self.assertTrue(isomorphic(self.graph, rewired))
@@ -2,9 +2,43 @@
 
 import unittest
 
-from sssom.cliques import split_into_cliques, summarize_cliques
+import networkx as nx
+import numpy as np
+
+from sssom.cliques import (
+    CLIQUE_ID,
+    CliqueIndex,
+    _get_components,
+    get_clique_ids,
+    split_into_clique_dataframes,
+    split_into_cliques,
+    summarize_cliques,
+    to_digraph,
+)
 from sssom.parsers import parse_sssom_table
-from tests.constants import data_dir
+from sssom.util import MappingSetDataFrame
+from tests.constants import data_dir, test_out_dir
+
+#: The slots of the Clique class in sssom.cliquesummary
+CLIQUE_SLOTS = [
+    "id",
+    "members",
+    "members_labels",
+    "num_members",
+    "max_confidence",
+    "min_confidence",
+    "avg_confidence",
+    "is_conflated",
+    "is_all_conflated",
+    "total_conflated",
+    "proportion_conflated",
+    "conflation_score",
+    "members_count",
+    "min_count_by_source",
+    "max_count_by_source",
+    "avg_count_by_source",
+    "harmonic_mean_count_by_source",
+]
 
 
 class TestSCC(unittest.TestCase):
@@ -20,8 +54,97 @@ class TestSCC(unittest.TestCase):
         for d in cliquedocs:
             print(f"D: {len(d.mapping_set.mappings)}")
 
+    def test_clique_ids(self):
+        """Test clique ids agree with the strongly connected components of the graph."""
+        graph = to_digraph(self.mset)
+        self.assertEqual(95, graph.number_of_edges())
+        node_to_component = {
+            node: i
+            for i, component in enumerate(nx.strongly_connected_components(graph))
+            for node in component
+        }
+        clique_ids = get_clique_ids(self.mset)
+        self.assertEqual(CLIQUE_ID, clique_ids.name)
+        self.assertTrue(clique_ids.index.equals(self.mset.df.index))
+        pairs = {
+            (node_to_component[subject_id], clique_id)
+            for subject_id, clique_id in zip(self.mset.df["subject_id"], clique_ids)
+        }
+        self.assertEqual(len(pairs), len({component for component, _ in pairs}))
+        self.assertEqual(len(pairs), len({clique_id for _, clique_id in pairs}))
+
+    def test_split_into_clique_dataframes(self):
+        """Test splitting into one MappingSetDataFrame per clique."""
+        msdfs = split_into_clique_dataframes(self.mset)
+        self.assertEqual(11, len(msdfs))
+        self.assertEqual(len(self.mset.df), sum(len(msdf.df) for msdf in msdfs))
+        self.assertEqual(
+            [len(d.mapping_set.mappings) for d in split_into_cliques(self.mset)],
+            [len(msdf.df) for msdf in msdfs],
+        )
+
+    def test_union_find(self):
+        """Test the union-find engine finds the connected components of an undirected graph."""
+        sources = np.array([0, 2, 5, 6, 3])
+        targets = np.array([1, 1, 6, 7, 3])
+        components = _get_components(sources, targets, 9, symmetric=True)
+        self.assertEqual([0, 0, 0, 2, 3, 1, 1, 1, 4], list(components))
+
+    def test_symmetric_cliques(self):
+        """Test cliques over symmetric predicates agree with the strongly connected components."""
+        df = self.mset.df
+        msdf = MappingSetDataFrame(
+            df=df[df["predicate_id"].isin(["skos:exactMatch", "owl:equivalentClass"])],
+            prefix_map=self.mset.prefix_map,
+        )
+        clique_ids = get_clique_ids(msdf)
+        graph = to_digraph(msdf)
+        components = list(nx.strongly_connected_components(graph))
+        self.assertEqual(len(components), clique_ids.nunique())
+        for component in components:
+            rows = msdf.df["subject_id"].isin(component)
+            self.assertEqual(1, clique_ids[rows].nunique())
+
+    def test_clique_index(self):
+        """Test adding mappings to a clique index gives the cliques of the whole set."""
+        df = self.mset.df
+        first = MappingSetDataFrame(df=df.iloc[:70], prefix_map=self.mset.prefix_map)
+        second = MappingSetDataFrame(df=df.iloc[60:], prefix_map=self.mset.prefix_map)
+        index = CliqueIndex.from_msdf(first)
+        index.save(test_out_dir / "clique_index")
+        index = CliqueIndex.load(test_out_dir / "clique_index")
+        before = index.get_clique_ids()
+        update = index.add(second)
+        self.assertEqual(len(df), len(index.msdf.df))
+        self.assertFalse(set(update.changed) & set(update.removed))
+
+        # The cliques of the index are the same as those computed from scratch
+        expected = get_clique_ids(self.mset)
+        actual = index.get_clique_ids()
+        pairs = set(zip(expected, actual))
+        self.assertEqual(expected.nunique(), len(pairs))
+        self.assertEqual(actual.nunique(), len(pairs))
+
+        # Cliques untouched by the update keep their id and are not reported
+        unchanged = ~before.isin(update.changed + update.removed)
+        self.assertTrue(unchanged.any())
+        self.assertTrue(before[unchanged].equals(actual[before.index][unchanged]))
+        self.assertEqual(set(update.changed), set(index.get_cliques(update.changed)))
+        self.assertEqual(len(update.changed), len(index.summarize(update.changed)))
+
     def test_cliquesummary(self):
         """Test summarizing cliques."""
         df = summarize_cliques(self.mset)
         df.to_csv(data_dir / "basic-cliquesummary.tsv", sep="\t")
         df.describe().transpose().to_csv(data_dir / "basic-cliquesummary-stats.tsv", sep="\t")
+        self.assertEqual(11, len(df))
+        self.assertLessEqual(set(CLIQUE_SLOTS), set(df.columns))
+        largest = df.iloc[0]
+        self.assertEqual(38, largest["num_mappings"])
+        self.assertEqual(12, largest["num_members"])
+        self.assertEqual("x:example|y:example|z:example", largest["sources"])
+        self.assertEqual("x:heart|x:liver|x:lung|x:organ", largest["x:example"])
+        self.assertEqual(4, largest["x:example_count"])
+        self.assertTrue(largest["is_all_conflated"])
+        self.assertAlmostEqual(12.0, largest["conflation_score"])
+        self.assertAlmostEqual(0.738796125, largest["min_confidence"])
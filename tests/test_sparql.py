@@ -0,0 +1,202 @@
+"""Tests for querying mappings with SPARQL."""
+
+import json
+import random
+import re
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+from click.testing import CliRunner
+from SPARQLWrapper.SPARQLExceptions import SPARQLWrapperException
+
+from sssom.cli import sparql
+from sssom.sparql_util import EndpointConfig, contract_uri, iter_mapping_pages, query_mappings
+from tests.constants import test_out_dir
+
+PREFIX_MAP = {
+    "X": "http://example.org/x/",
+    "Y": "http://example.org/y/",
+    "YY": "http://example.org/y/y/",
+    "skos": "http://www.w3.org/2004/02/skos/core#",
+}
+NUM_MAPPINGS = 25
+
+
+def _get_binding(i: int, label: str):
+    """Get a result binding of the i-th mapping of the stub endpoint."""
+    object_prefix = "http://example.org/y/y/" if i % 2 else "http://example.org/y/"
+    return {
+        "subject_id": {"type": "uri", "value": f"http://example.org/x/{i:03}"},
+        "subject_label": {"type": "literal", "value": label},
+        "predicate_id": {"type": "uri", "value": "http://www.w3.org/2004/02/skos/core#exactMatch"},
+        "object_id": {"type": "uri", "value": f"{object_prefix}{i:03}"},
+        "mapping_provider": {"type": "uri", "value": "http://example.org/graph"},
+    }
+
+
+def _get_bindings(labels, order):
+    """Get the result bindings of the stub endpoint, in the order of the given variables.
+
+    Results tied on the order variables come in a different order on each query, like
+    they may on a real endpoint.
+    """
+    bindings = [
+        _get_binding(i, label) for i in range(NUM_MAPPINGS) for label in labels.get(i, [f"x {i}"])
+    ]
+    if order:
+        random.shuffle(bindings)
+        bindings.sort(key=lambda binding: [binding[v]["value"] for v in order])
+    return bindings
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """A SPARQL endpoint serving a fixed list of mappings, failing once on demand."""
+
+    def do_GET(self):  # noqa: N802
+        """Answer a query with the window of mappings given by its LIMIT and OFFSET."""
+        query = parse_qs(urlparse(self.path).query)["query"][0]
+        self.server.queries.append(query)
+        offset = re.search(r"OFFSET (\d+)", query)
+        offset = int(offset.group(1)) if offset else 0
+        if offset in self.server.failures:
+            self.server.failures.remove(offset)
+            self.send_response(500)
+            self.end_headers()
+            return
+        limit = re.search(r"LIMIT (\d+)", query)
+        order = re.search(r"ORDER BY ((?:\?\w+ ?)+)", query)
+        order = order.group(1).replace("?", "").split() if order else []
+        bindings = _get_bindings(self.server.labels, order)
+        end = offset + int(limit.group(1)) if limit else len(bindings)
+        bindings = bindings[offset:end]
+        body = json.dumps(
+            {
+                "head": {
+                    "vars": [
+                        "subject_id",
+                        "subject_label",
+                        "predicate_id",
+                        "object_id",
+                        "mapping_provider",
+                    ]
+                },
+                "results": {"bindings": bindings},
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/sparql-results+json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        """Keep the test output quiet."""
+
+
+class TestSparql(unittest.TestCase):
+    """Test querying mappings from a stub SPARQL endpoint."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Start the stub endpoint."""
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Stop the stub endpoint."""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        """Reset the queries, failures and extra labels of the stub endpoint."""
+        self.server.queries = []
+        self.server.failures = set()
+        self.server.labels = {}
+
+    def get_config(self, **kwargs) -> EndpointConfig:
+        """Get a configuration for the stub endpoint."""
+        host, port = self.server.server_address
+        return EndpointConfig(
+            url=f"http://{host}:{port}/sparql",
+            graph="http://example.org/graph",
+            predmap={},
+            predicates=None,
+            prefix_map=dict(PREFIX_MAP),
+            retry_delay=0,
+            **kwargs,
+        )
+
+    def test_query(self):
+        """Test querying all mappings at once."""
+        msdf = query_mappings(self.get_config(limit=None))
+        self.assertEqual(1, len(self.server.queries))
+        self.assertEqual(NUM_MAPPINGS, len(msdf.df))
+        row = msdf.df.iloc[1]
+        self.assertEqual("X:001", row["subject_id"])
+        self.assertEqual("skos:exactMatch", row["predicate_id"])
+        # the longest URI prefix wins
+        self.assertEqual("YY:001", row["object_id"])
+        self.assertEqual("Y:002", msdf.df.iloc[2]["object_id"])
+        self.assertEqual("x 1", row["subject_label"])
+
+    def test_paginated_query(self):
+        """Test querying mappings page by page, concurrently and with retries."""
+        expected = query_mappings(self.get_config(limit=None)).df
+        self.server.queries = []
+        self.server.failures = {10}
+        msdf = query_mappings(self.get_config(limit=None, page_size=5, jobs=2))
+        self.assertTrue(expected.equals(msdf.df))
+        # six pages, the last one empty, plus the retry of the failed page
+        self.assertEqual(7, len(self.server.queries))
+        self.assertTrue(all("ORDER BY" in query for query in self.server.queries))
+
+    def test_paginated_query_limit(self):
+        """Test that the limit caps the number of mappings fetched page by page."""
+        pages = list(iter_mapping_pages(self.get_config(limit=12, page_size=5, jobs=3)))
+        self.assertEqual([5, 5, 2], [len(page) for page in pages])
+        self.assertEqual("X:011", pages[-1].iloc[-1]["subject_id"])
+
+    def test_paginated_query_several_labels(self):
+        """Test that a mapping with several labels across a page boundary is fetched once."""
+        self.server.labels = {4: ["four", "vier", "x 4"]}
+        expected = query_mappings(self.get_config(limit=None)).df
+        for _ in range(5):
+            msdf = query_mappings(self.get_config(limit=None, page_size=5, jobs=2))
+            self.assertEqual(NUM_MAPPINGS + 2, len(msdf.df))
+            self.assertEqual(
+                sorted(zip(expected["subject_id"], expected["subject_label"])),
+                sorted(zip(msdf.df["subject_id"], msdf.df["subject_label"])),
+            )
+
+    def test_sparql_command_paginated(self):
+        """Test fetching mappings page by page from the command line."""
+        host, port = self.server.server_address
+        path = test_out_dir / "test_sparql_command_paginated.sssom.tsv"
+        args = [f"--url=http://{host}:{port}/sparql", "--page-size=10", f"--output={path}"]
+        for prefix, uri_prefix in PREFIX_MAP.items():
+            args.extend(["--prefix", prefix, uri_prefix])
+        result = CliRunner().invoke(sparql, args)
+        self.assertEqual(0, result.exit_code, result.output)
+        # three pages, the last one partial
+        self.assertEqual(3, len(self.server.queries))
+        self.assertTrue(all("ORDER BY" in query for query in self.server.queries))
+        df = pd.read_csv(path, sep="\t", comment="#")
+        self.assertEqual([f"X:{i:03}" for i in range(NUM_MAPPINGS)], list(df["subject_id"]))
+
+    def test_retries_exhausted(self):
+        """Test that a query failing more than the retries raises an error."""
+        self.server.failures = {0}
+        with self.assertRaises(SPARQLWrapperException):
+            query_mappings(self.get_config(limit=None, retries=0))
+
+    def test_contract_uri(self):
+        """Test contracting URIs with the prefix map of a configuration."""
+        config = self.get_config(limit=None)
+        self.assertEqual("YY:1", contract_uri("http://example.org/y/y/1", config))
+        self.assertEqual("Y:z/1", contract_uri("http://example.org/y/z/1", config))
+        self.assertEqual("http://example.org/z/1", contract_uri("http://example.org/z/1", config))
@@ -1,17 +1,27 @@
 """Test for merging MappingSetDataFrames."""
+import io
 import unittest
+import unittest.mock
+
+import numpy as np
+import pandas as pd
 
 from sssom.constants import OBJECT_ID, SUBJECT_ID
-from sssom.io import extract_iri
+from sssom.io import extract_iri, invert_file, remove_file
 from sssom.parsers import parse_sssom_table
 from sssom.util import (
     MappingSetDataFrame,
     filter_out_prefixes,
     filter_prefixes,
+    filter_redundant_rows,
+    get_prefix_column,
     inject_metadata_into_df,
     invert_mappings,
+    merge_msdf,
+    sort_df_rows_columns,
 )
-from tests.constants import data_dir
+from sssom.writers import write_table
+from tests.constants import data_dir, test_out_dir
 
 
 class TestIO(unittest.TestCase):
@@ -82,6 +92,26 @@ class TestIO(unittest.TestCase):
         )
         self.assertEqual(len(filtered_df), 101)
 
+    def test_filter_prefixes_keeps_columns(self):
+        """Test filtering by prefix keeps the columns, dtypes and index of the rows kept."""
+        df = pd.DataFrame(
+            {
+                "confidence": [0.1, 0.2, 0.3, 0.4],
+                SUBJECT_ID: ["x:1", "x:2", "y:3", None],
+                OBJECT_ID: ["y:1", "z:2", "y:3", "x:4"],
+            },
+            index=[10, 20, 30, 40],
+        )
+        kept = filter_prefixes(df, ["x", "y"], self.features)
+        self.assertEqual([10, 30, 40], list(kept.index))
+        self.assertEqual(list(df.columns), list(kept.columns))
+        self.assertEqual(list(df.dtypes), list(kept.dtypes))
+        self.assertEqual([10, 20, 40], list(filter_prefixes(df, ["x"], self.features, False).index))
+        self.assertEqual([30], list(filter_out_prefixes(df, ["x"], self.features).index))
+        self.assertEqual(
+            [20, 30, 40], list(filter_out_prefixes(df, ["x", "y"], self.features, True).index)
+        )
+
     def test_remove_mappings(self):
         """Test remove mappings."""
         prefix_filter_list = ["x", "y"]
@@ -97,6 +127,28 @@ class TestIO(unittest.TestCase):
         # len(self.msdf.df) = 141 and len(new_msdf.df) = 5
         self.assertEqual(len(original_msdf.df), original_length - len(new_msdf.df))
 
+    def test_remove_file_streaming(self):
+        """Test removing mappings chunk by chunk gives the rows of the in-memory removal."""
+        remove_msdf = MappingSetDataFrame(
+            df=filter_out_prefixes(self.msdf.df, ["x", "y"], self.features),
+            prefix_map=self.msdf.prefix_map,
+            metadata=self.msdf.metadata,
+        )
+        remove_path = test_out_dir / "basic-remove.tsv"
+        with open(remove_path, "w") as file:
+            write_table(remove_msdf, file)
+        output = io.StringIO()
+        remove_file(f"{data_dir}/basic.tsv", str(remove_path), output, chunk_size=10)
+        output.seek(0)
+        df = pd.read_csv(output, sep="\t", comment="#", dtype=str, keep_default_na=False)
+        self.msdf.remove_mappings(remove_msdf)
+        expected = self.msdf.df.fillna("").astype(str)
+        self.assertLess(0, len(expected))
+        self.assertEqual(
+            sorted(expected.values.tolist()),
+            sorted(df[expected.columns].values.tolist()),
+        )
+
     def test_clean_prefix_map(self):
         """Test clean prefix map."""
         prefix_filter_list = ["x", "y"]
@@ -148,6 +200,148 @@ class TestIO(unittest.TestCase):
         inverted_df = invert_mappings(df=self.msdf2.df, merge_inverted=False)
         self.assertEqual(len(inverted_df), len(self.msdf2.df.drop_duplicates()))
 
+    def test_invert_swaps_columns(self):
+        """Test that inverting swaps every subject column with its object counterpart."""
+        df = self.msdf2.df.assign(subject_type="owl class", object_type="skos concept")
+        inverted_df = invert_mappings(df, merge_inverted=False)
+        inverted = inverted_df[inverted_df["mapping_justification"] == "semapv:MappingInversion"]
+        self.assertLess(0, len(inverted))
+        self.assertEqual({"skos concept"}, set(inverted["subject_type"]))
+        self.assertEqual({"owl class"}, set(inverted["object_type"]))
+        self.assertEqual(list(df.columns), list(inverted_df.columns))
+
+    def test_invert_file_streaming(self):
+        """Test inverting a file chunk by chunk gives the rows of the in-memory inversion."""
+        for subject_prefix, merge_inverted in [(None, True), ("a", True), ("a", False)]:
+            with self.subTest(subject_prefix=subject_prefix, merge_inverted=merge_inverted):
+                expected = invert_mappings(self.msdf2.df, subject_prefix, merge_inverted)
+                output = io.StringIO()
+                invert_file(
+                    f"{data_dir}/basic7.tsv",
+                    output,
+                    subject_prefix,
+                    merge_inverted,
+                    chunk_size=5,
+                )
+                output.seek(0)
+                df = pd.read_csv(output, sep="\t", comment="#", dtype=str, keep_default_na=False)
+                self.assertEqual(
+                    sorted(expected.fillna("").astype(str).values.tolist()),
+                    sorted(df[expected.columns].values.tolist()),
+                )
+
+    def test_invert_file_streaming_hash_collisions(self):
+        """Test rows with the hash of an earlier row are only skipped if they equal it."""
+        expected = invert_mappings(self.msdf2.df, None, True)
+        output = io.StringIO()
+        # every row has the same hash
+        with unittest.mock.patch(
+            "sssom.io._hash_rows", lambda df: np.zeros(len(df), dtype=np.uint64)
+        ):
+            invert_file(f"{data_dir}/basic7.tsv", output, chunk_size=3)
+        output.seek(0)
+        df = pd.read_csv(output, sep="\t", comment="#", dtype=str, keep_default_na=False)
+        self.assertEqual(
+            sorted(expected.fillna("").astype(str).values.tolist()),
+            sorted(df[expected.columns].values.tolist()),
+        )
+
+    def test_categorical_columns(self):
+        """Test mappings parsed as categoricals give the same results as object columns."""
+        msdf = parse_sssom_table(f"{data_dir}/basic.tsv", categorical=True)
+        self.assertIsInstance(msdf.df[SUBJECT_ID].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(msdf.df["mapping_justification"].dtype, pd.CategoricalDtype)
+        self.assertEqual(object, msdf.df["subject_label"].dtype)
+        results = [
+            (filter_redundant_rows, lambda m: filter_redundant_rows(m.df.copy())),
+            (invert_mappings, lambda m: invert_mappings(m.df, "x")),
+            (
+                sort_df_rows_columns,
+                lambda m: sort_df_rows_columns(m.df.sample(frac=1, random_state=0)),
+            ),
+            (merge_msdf, lambda m: merge_msdf(m, self.msdf2).df),
+        ]
+        for function, result in results:
+            with self.subTest(function=function.__name__):
+                expected = result(self.msdf).astype(object)
+                actual = result(msdf).astype(object)
+                self.assertEqual(
+                    expected.where(expected.notna(), None).values.tolist(),
+                    actual.where(actual.notna(), None).values.tolist(),
+                )
+
+    def test_get_prefix_column(self):
+        """Test the prefix columns are derived once and follow the edits of the data frame."""
+        column = pd.Series(["x:1", "y:2", None, "z", "x:3:4"], name=SUBJECT_ID)
+        prefixes = get_prefix_column(column)
+        self.assertIsInstance(prefixes.dtype, pd.CategoricalDtype)
+        self.assertEqual(
+            ["x", "y", None, None, "x"], list(prefixes.astype(object).where(prefixes.notna(), None))
+        )
+
+        msdf = MappingSetDataFrame(df=self.msdf.df.copy())
+        prefixes = msdf.get_prefix_column(SUBJECT_ID)
+        self.assertIs(prefixes, msdf.get_prefix_column(SUBJECT_ID))
+        self.assertEqual(
+            list(msdf.df[SUBJECT_ID].str.split(":").str[0]), list(prefixes.astype(object))
+        )
+        msdf.df = msdf.df.assign(**{SUBJECT_ID: "w:1"})
+        self.assertEqual({"w"}, set(msdf.get_prefix_column(SUBJECT_ID)))
+        msdf.df = msdf.df.iloc[:3]
+        self.assertEqual(3, len(msdf.get_prefix_column(SUBJECT_ID)))
+
+        # edits in place are picked up as well
+        msdf.df.loc[0, SUBJECT_ID] = "v:1"
+        self.assertEqual(["v", "w", "w"], list(msdf.get_prefix_column(SUBJECT_ID)))
+        msdf.df[SUBJECT_ID] = ["u:1", "u:2", "u:3"]
+        self.assertEqual({"u"}, set(msdf.get_prefix_column(SUBJECT_ID)))
+
+        # the cached prefix columns give the same inversion as the data frame itself
+        msdf = MappingSetDataFrame(df=self.msdf.df.copy())
+        for subject_prefix in [None, "x", "y"]:
+            pd.testing.assert_frame_equal(
+                invert_mappings(msdf.df, subject_prefix), invert_mappings(msdf, subject_prefix)
+            )
+
+    def test_sort_df_rows_columns(self):
+        """Test the canonical order does not depend on the order of the input rows."""
+        expected = sort_df_rows_columns(self.msdf.df)
+        self.assertEqual(
+            list(expected[[SUBJECT_ID, "predicate_id", OBJECT_ID]].itertuples(index=False)),
+            sorted(expected[[SUBJECT_ID, "predicate_id", OBJECT_ID]].itertuples(index=False)),
+        )
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                shuffled = self.msdf.df.sample(frac=1, random_state=seed)
+                self.assertTrue(expected.equals(sort_df_rows_columns(shuffled)))
+
+    def test_sort_is_recorded(self):
+        """Test sorting a mapping set again is a no-op until its data frame is replaced."""
+        msdf = parse_sssom_table(f"{data_dir}/basic.tsv", sort=False)
+        msdf.sort()
+        df = msdf.df
+        msdf.sort()
+        self.assertIs(df, msdf.df)
+        msdf.df = df.iloc[::-1]
+        msdf.sort()
+        self.assertIsNot(df, msdf.df)
+        self.assertTrue(df.equals(msdf.df))
+
+    def test_sort_after_edit_in_place(self):
+        """Test a mapping set edited in place is sorted again."""
+        msdf = parse_sssom_table(f"{data_dir}/basic.tsv", sort=False)
+        msdf.sort()
+        expected = msdf.df.copy()
+        first, last = msdf.df.iloc[0].copy(), msdf.df.iloc[-1].copy()
+        msdf.df.loc[0], msdf.df.loc[len(msdf.df) - 1] = last, first
+        msdf.sort()
+        self.assertTrue(expected.equals(msdf.df))
+
+        msdf.df.drop(0, inplace=True)
+        msdf.df.loc[len(expected)] = expected.iloc[0]
+        msdf.sort()
+        self.assertTrue(expected.equals(msdf.df))
+
     def test_inject_metadata_into_df(self):
         """Test injecting metadata into DataFrame is as expected."""
         expected_creators = "orcid:0000-0001-5839-2535|orcid:0000-0001-5839-2532"
@@ -155,3 +349,25 @@ class TestIO(unittest.TestCase):
         msdf_with_meta = inject_metadata_into_df(msdf)
         creator_ids = msdf_with_meta.df["creator_id"].drop_duplicates().values.item()
         self.assertEqual(creator_ids, expected_creators)
+
+    def test_inject_metadata_into_df_categorical(self):
+        """Test metadata is injected as constant categoricals."""
+        msdf = parse_sssom_table(f"{data_dir}/test_inject_metadata_msdf.tsv")
+        inject_metadata_into_df(msdf, categorical=True)
+        creator_ids = msdf.df["creator_id"]
+        self.assertIsInstance(creator_ids.dtype, pd.CategoricalDtype)
+        self.assertEqual(1, len(creator_ids.cat.categories))
+        self.assertEqual({"orcid:0000-0001-5839-2535|orcid:0000-0001-5839-2532"}, set(creator_ids))
+
+    def test_merge_msdf_metadata_columns(self):
+        """Test merging gives plain metadata columns and leaves the inputs untouched."""
+        msdf1 = parse_sssom_table(f"{data_dir}/basic.tsv")
+        msdf2 = parse_sssom_table(f"{data_dir}/cob-to-external.tsv")
+        columns1, columns2 = list(msdf1.df.columns), list(msdf2.df.columns)
+        merged = merge_msdf(msdf1, msdf2)
+        for column in ["creator_id", "license", "mapping_date"]:
+            self.assertEqual(object, merged.df[column].dtype)
+        self.assertTrue(merged.df["creator_id"].isna().any())
+        merged.df.fillna("")
+        self.assertEqual(columns1, list(msdf1.df.columns))
+        self.assertEqual(columns2, list(msdf2.df.columns))
@@ -2,11 +2,19 @@
 
 import unittest
 
+import numpy as np
+import pandas as pd
 from jsonschema import ValidationError
 
 from sssom.constants import DEFAULT_VALIDATION_TYPES, SchemaValidationType
 from sssom.parsers import parse_sssom_table
-from sssom.validators import validate
+from sssom.util import get_all_prefixes
+from sssom.validators import (
+    check_all_prefixes_in_curie_map,
+    get_validation_errors,
+    validate,
+    validate_json_schema,
+)
 from tests.constants import data_dir
 
 
@@ -38,6 +46,62 @@ class TestValidate(unittest.TestCase):
         """
         self.assertRaises(ValidationError, validate, self.bad_msdf1, self.validation_types)
 
+    def test_validation_errors(self):
+        """Test that all violations of the schema are reported with their row."""
+        msdf = parse_sssom_table(f"{data_dir}/basic.tsv")
+        df = msdf.df
+        df.loc[1, "mapping_justification"] = "semapv:Guesswork"
+        df.loc[2, "confidence"] = 1.5
+        df.loc[3, "confidence"] = "high"
+        df.loc[4, "subject_id"] = "not a curie"
+        df.loc[5, "predicate_modifier"] = "Maybe"
+        df.loc[6, "object_id"] = np.nan
+        df.loc[7, "author_id"] = "orcid:1||orcid:2"
+        df.loc[8, "author_id"] = "orcid:1|orcid 2"
+        msdf.metadata["license"] = ""
+        errors = get_validation_errors(msdf)
+        self.assertEqual(
+            [
+                (-1, "license", None, "is required"),
+                (1, "mapping_justification", "semapv:Guesswork", "does not match"),
+                (2, "confidence", "1.5", "is greater than 1.0"),
+                (3, "confidence", "high", "is not a double"),
+                (4, "subject_id", "not a curie", "is not a CURIE"),
+                (5, "predicate_modifier", "Maybe", "is not a permissible value"),
+                (6, "object_id", None, "is required"),
+                (7, "author_id", "orcid:1||orcid:2", "has an empty multivalued element"),
+                (8, "author_id", "orcid 2", "is not a CURIE"),
+            ],
+            sorted(
+                (
+                    -1 if row is pd.NA else row,
+                    slot,
+                    None if pd.isna(value) else value,
+                    message.split(" ^")[0],
+                )
+                for row, slot, value, message in errors.itertuples(index=False, name=None)
+            ),
+        )
+        self.assertTrue(errors.equals(get_validation_errors(msdf, jobs=3)))
+        with self.assertRaises(ValidationError) as context:
+            validate_json_schema(msdf)
+        self.assertIn("row 8, author_id: 'orcid 2' is not a CURIE", str(context.exception))
+
+    def test_missing_prefixes(self):
+        """Test that the mappings using prefixes missing from the prefix map are reported."""
+        msdf = parse_sssom_table(f"{data_dir}/basic.tsv")
+        self.assertIn("x", get_all_prefixes(msdf))
+        self.assertNotIn("", get_all_prefixes(msdf))
+        del msdf.prefix_map["x"]
+        with self.assertRaises(ValidationError) as context:
+            check_all_prefixes_in_curie_map(msdf)
+        rows = context.exception.instance
+        expected = msdf.df[
+            msdf.df["subject_id"].str.startswith("x:") | msdf.df["object_id"].str.startswith("x:")
+        ]
+        self.assertLess(0, len(rows))
+        self.assertTrue(expected.equals(rows))
+
     def test_validate_shacl(self):
         """
         Test Shacl validation (Not implemented).
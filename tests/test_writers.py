@@ -1,11 +1,18 @@
 """Tests for SSSOM writers."""
+import io
 import json
 import os
 import unittest
 
 from jsonasobj2 import JsonObj
 
-from sssom.parsers import parse_sssom_json, parse_sssom_rdf, parse_sssom_table
+from sssom.parsers import (
+    parse_sssom_json,
+    parse_sssom_rdf,
+    parse_sssom_table,
+    parse_sssom_table_archive,
+    split_dataframe,
+)
 from sssom.writers import (
     write_fhir_json,
     write_json,
@@ -13,6 +20,8 @@ from sssom.writers import (
     write_owl,
     write_rdf,
     write_table,
+    write_table_archive,
+    write_tables,
 )
 from tests.constants import data_dir as test_data_dir
 from tests.constants import test_out_dir
@@ -106,3 +115,28 @@ class TestWrite(unittest.TestCase):
             self.mapping_count,
             f"{path} has the wrong number of mappings.",
         )
+
+    def test_write_tables(self):
+        """Test writing several tables concurrently matches writing them one by one."""
+        msdfs = split_dataframe(self.msdf)
+        output_dir = test_out_dir / "test_write_tables"
+        output_dir.mkdir(exist_ok=True)
+        write_tables(msdfs, output_dir, jobs=4)
+        for split_id, msdf in msdfs.items():
+            buffer = io.StringIO()
+            write_table(msdf, buffer)
+            path = output_dir / f"{split_id}.sssom.tsv"
+            self.assertEqual(buffer.getvalue(), path.read_text())
+
+    def test_write_table_archive(self):
+        """Test packing tables into a single archive and reading them back."""
+        msdfs = split_dataframe(self.msdf)
+        path = test_out_dir / "test_write_table_archive.zip"
+        write_table_archive(msdfs, path)
+        parsed = parse_sssom_table_archive(path)
+        self.assertEqual(set(msdfs), set(parsed))
+        for split_id, msdf in msdfs.items():
+            self.assertEqual(len(msdf.df), len(parsed[split_id].df))
+            self.assertEqual(msdf.prefix_map, parsed[split_id].prefix_map)
+        split_id = next(iter(msdfs))
+        self.assertEqual([split_id], list(parse_sssom_table_archive(path, names=[split_id])))